@@ -0,0 +1,29 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from ..services.pipeline import startup_status
+
+
+router = APIRouter()
+
+
+@router.get("/healthz")
+async def healthz() -> JSONResponse:
+    """Liveness: the process is up and serving requests."""
+    return JSONResponse(content={"status": "ok"})
+
+
+@router.get("/readyz")
+async def readyz() -> JSONResponse:
+    """Readiness: models are loaded and warmed up; 503 until then."""
+    status = startup_status()
+    if status.ready:
+        state = "ready"
+    elif status.error:
+        state = "failed"
+    else:
+        state = "starting"
+    return JSONResponse(
+        status_code=200 if status.ready else 503,
+        content={"status": state, "phases_ms": status.phases_ms, "error": status.error},
+    )
@@ -0,0 +1,23 @@
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from ..services.metrics import CONTENT_TYPE, render_startup
+from ..services.pipeline import current_pipeline, startup_status
+
+
+router = APIRouter()
+
+
+@router.get("/metrics")
+async def metrics() -> Response:
+    """Prometheus scrape target: stage latencies, queue, in-flight work, caches and model loads.
+
+    Like ``/readyz`` this never triggers the pipeline build: until start-up has
+    built it, only the readiness and start-up phase gauges are exposed.
+    """
+    status = startup_status()
+    content = render_startup(status.ready, status.phases_ms)
+    pipeline = current_pipeline()
+    if pipeline is not None:
+        content = pipeline.metrics() + content
+    return Response(content=content, media_type=CONTENT_TYPE)
@@ -1,8 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, Form
-from fastapi.responses import JSONResponse
+import json
+from typing import AsyncIterator, List, Optional
 
-from ...schemas.requests import UploadResponse, ResultResponse
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile, Form
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from ...core.config import get_settings
+from ...schemas.requests import BatchStatusResponse, BatchUploadResponse, UploadResponse, ResultResponse
+from ...services.batch import InvalidBatchError, collect_sources, detach_files
+from ...services.notifier import StreamEvent
 from ...services.pipeline import InferencePipeline, get_pipeline
+from ...services.result_store import ResultExpiredError
+from ...services.scheduler import QueueFullError, SchedulerError
 
 
 router = APIRouter()
@@ -17,16 +25,138 @@ async def upload_image(
     if file.content_type not in ("image/jpeg", "image/png"):
         raise HTTPException(status_code=400, detail="Unsupported file type")
 
-    request_id = await pipeline.enqueue(file, book_size)
+    try:
+        request_id = await pipeline.enqueue(file, book_size)
+    except SchedulerError as exc:
+        raise _busy_error(exc) from exc
     return UploadResponse(request_id=request_id)
 
 
+@router.post(
+    "/recognize",
+    response_model=ResultResponse,
+    responses={202: {"model": UploadResponse, "description": "Deadline passed; poll the request id"}},
+)
+async def recognize_image(
+    request: Request,
+    file: UploadFile,
+    book_size: str = Form("16k"),
+    deadline: Optional[float] = Query(None, gt=0, description="Seconds to wait for the result inline"),
+    pipeline: InferencePipeline = Depends(get_pipeline),
+) -> JSONResponse:
+    """Upload and wait for the result in one round trip.
+
+    Falls back to ``202`` with the ``request_id`` when inference does not
+    finish before the deadline; the client then polls ``/result/{id}``.
+    """
+    if file.content_type not in ("image/jpeg", "image/png"):
+        raise HTTPException(status_code=400, detail="Unsupported file type")
+
+    max_deadline = get_settings().recognize_deadline_s
+    deadline = max_deadline if deadline is None else min(deadline, max_deadline)
+    try:
+        request_id = await pipeline.enqueue(file, book_size)
+    except SchedulerError as exc:
+        raise _busy_error(exc) from exc
+
+    try:
+        result = await pipeline.get_result(request_id, wait=deadline)
+    except ResultExpiredError:
+        result = None
+    if result is None:
+        return JSONResponse(
+            status_code=202,
+            content=UploadResponse(request_id=request_id).model_dump(),
+            headers={"Location": str(request.url_for("get_result", request_id=request_id))},
+        )
+    return JSONResponse(content=result.model_dump())
+
+
+@router.post("/batch", response_model=BatchUploadResponse)
+async def upload_batch(
+    files: List[UploadFile] = File(..., description="JPG/PNG images and/or zip archives of them"),
+    book_size: str = Form("16k"),
+    pipeline: InferencePipeline = Depends(get_pipeline),
+) -> BatchUploadResponse:
+    settings = get_settings()
+    try:
+        sources = collect_sources(files, settings.batch_max_items, settings.batch_max_item_bytes)
+    except InvalidBatchError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from None
+
+    try:
+        # The batch is fed in the background, after this request's files would be closed
+        return await pipeline.enqueue_batch(sources, book_size, files=detach_files(files))
+    except SchedulerError as exc:
+        raise _busy_error(exc) from exc
+
+
+@router.get("/batch/{batch_id}", response_model=BatchStatusResponse)
+async def get_batch_status(
+    batch_id: str,
+    pipeline: InferencePipeline = Depends(get_pipeline),
+) -> BatchStatusResponse:
+    status = pipeline.batch_status(batch_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Unknown batch id")
+    return status
+
+
 @router.get("/result/{request_id}", response_model=ResultResponse)
 async def get_result(
     request_id: str,
+    wait: float = Query(0.0, ge=0, description="Long-poll: seconds to wait for a pending result"),
     pipeline: InferencePipeline = Depends(get_pipeline),
 ) -> JSONResponse:
-    result = await pipeline.get_result(request_id)
+    wait = min(wait, get_settings().long_poll_max_s)
+    try:
+        result = await pipeline.get_result(request_id, wait=wait)
+    except ResultExpiredError:
+        raise HTTPException(status_code=410, detail="Result expired") from None
     if result is None:
         raise HTTPException(status_code=404, detail="Result not found yet")
     return JSONResponse(content=result.model_dump())
+
+
+@router.get("/result/{request_id}/events")
+async def stream_result(
+    request_id: str,
+    pipeline: InferencePipeline = Depends(get_pipeline),
+) -> StreamingResponse:
+    """Server-Sent Events: ``progress`` per pipeline stage, then ``result`` (or ``expired``)."""
+    try:
+        result = await pipeline.get_result(request_id)
+    except ResultExpiredError:
+        raise HTTPException(status_code=410, detail="Result expired") from None
+    if result is None and not pipeline.is_pending(request_id):
+        raise HTTPException(status_code=404, detail="Unknown request id")
+
+    events = pipeline.stream_events(request_id, heartbeat=get_settings().sse_heartbeat_s)
+    return StreamingResponse(
+        _format_sse(events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/stats")
+async def get_stats(pipeline: InferencePipeline = Depends(get_pipeline)) -> JSONResponse:
+    return JSONResponse(content=pipeline.stats())
+
+
+def _busy_error(exc: SchedulerError) -> HTTPException:
+    # 429 while the queue is saturated, 503 while the service is draining
+    status_code = 429 if isinstance(exc, QueueFullError) else 503
+    return HTTPException(
+        status_code=status_code,
+        detail=str(exc),
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+async def _format_sse(events: AsyncIterator[StreamEvent]) -> AsyncIterator[str]:
+    async for name, data in events:
+        if name == "heartbeat":
+            yield ": keep-alive\n\n"
+            continue
+        yield f"event: {name}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from typing import Optional, Sequence
+
+import numpy as np
+
+# Column order used when the point-size model was trained. The pickled model
+# stores its own ``feature_cols``; serving always selects columns by name.
+POINT_SIZE_FEATURE_COLS: tuple[str, ...] = (
+    "bbox_height",
+    "bbox_width",
+    "image_width",
+    "text_length",
+    "is_chinese",
+    "is_all_caps",
+    "is_title_case",
+    "height_ratio_to_anchor",
+    "relative_height",
+    "aspect_ratio",
+)
+
+
+def _text_flags(text: str) -> tuple[int, int, int, int]:
+    clean = text.strip()
+    is_chinese = int(any("\u4e00" <= ch <= "\u9fff" for ch in clean))
+    is_all_caps = int(clean.isupper() and clean.isascii())
+    is_title_case = int(clean[0].isupper() and not clean.isupper() and clean.isascii()) if clean else 0
+    return len(clean), is_chinese, is_all_caps, is_title_case
+
+
+def build_point_size_features(
+    texts: Sequence[str],
+    bbox_heights: Sequence[float],
+    bbox_widths: Sequence[float],
+    image_width: float,
+    anchor_height: Optional[float],
+    feature_cols: Sequence[str] = POINT_SIZE_FEATURE_COLS,
+) -> np.ndarray:
+    """
+    Build the point-size feature matrix for all text regions of one image.
+
+    Shared by ``scripts/train_point_size_model.py`` and ``TypographyEstimator``
+    so training and serving compute identical features.
+
+    Args:
+        texts: Recognized text per region.
+        bbox_heights: Axis-aligned box height per region (pixels).
+        bbox_widths: Axis-aligned box width per region (pixels).
+        image_width: Width of the original image (pixels).
+        anchor_height: Box height of the book-title anchor (pixels).
+        feature_cols: Column order of the returned matrix.
+
+    Returns:
+        float64 array of shape (len(texts), len(feature_cols)).
+    """
+    count = len(texts)
+    heights = np.asarray(bbox_heights, dtype=np.float64).reshape(count)
+    widths = np.asarray(bbox_widths, dtype=np.float64).reshape(count)
+    flags = np.array([_text_flags(text) for text in texts], dtype=np.float64).reshape(count, 4)
+    zeros = np.zeros(count, dtype=np.float64)
+
+    columns = {
+        "bbox_height": heights,
+        "bbox_width": widths,
+        "image_width": np.full(count, float(image_width)),
+        "text_length": flags[:, 0],
+        "is_chinese": flags[:, 1],
+        "is_all_caps": flags[:, 2],
+        "is_title_case": flags[:, 3],
+        "height_ratio_to_anchor": heights / anchor_height if anchor_height else zeros,
+        "relative_height": heights / image_width if image_width > 0 else zeros,
+        "aspect_ratio": np.divide(widths, heights, out=zeros.copy(), where=heights > 0),
+    }
+    return np.column_stack([columns[col] for col in feature_cols]) if count else np.empty((0, len(feature_cols)))
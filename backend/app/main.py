@@ -1,12 +1,32 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from typing import AsyncIterator
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from .api.health import router as health_router
+from .api.metrics import router as metrics_router
 from .api.v1.routes import router as api_v1_router
 from .core.config import get_settings
+from .services.pipeline import shutdown_pipeline, startup_pipeline
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Load and warm the models in the background; /readyz flips once done
+    startup = asyncio.create_task(startup_pipeline(warm_up=get_settings().warmup_on_startup))
+    yield
+    if not startup.done():
+        startup.cancel()
+        with suppress(asyncio.CancelledError):
+            await startup
+    # Finish queued and in-flight inference jobs before the process exits
+    await shutdown_pipeline()
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(title="CoverOCR API", version="0.1.0")
+    app = FastAPI(title="CoverOCR API", version="0.1.0", lifespan=lifespan)
     settings = get_settings()
 
     app.add_middleware(
@@ -17,6 +37,8 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    app.include_router(health_router)
+    app.include_router(metrics_router)
     app.include_router(api_v1_router, prefix="/api/v1")
     return app
 
@@ -15,6 +15,8 @@ class RecognizedText(BaseModel):
     formatted_typography: Optional[str] = None
     confidence: float = 0.0
     font_confidence: Optional[float] = None
+    # Font classifier tier that decided: "heuristic", "resnet" or "paddleclas"
+    font_tier: Optional[str] = None
 
 
 class FontSummary(BaseModel):
@@ -23,11 +25,47 @@ class FontSummary(BaseModel):
     avg_confidence: float
 
 
+class StageTimings(BaseModel):
+    """Milliseconds spent in each pipeline stage; ``None`` when the stage did not run."""
+
+    decode_ms: Optional[float] = None
+    detection_ms: Optional[float] = None
+    angle_cls_ms: Optional[float] = None
+    recognition_ms: Optional[float] = None
+    font_classification_ms: Optional[float] = None
+    point_size_ms: Optional[float] = None
+
+
 class ResultPayload(BaseModel):
     texts: List[RecognizedText]
     fonts_summary: List[FontSummary]
     elapsed_ms: int
+    # Per-stage breakdown of elapsed_ms; absent on failed results
+    timings: Optional[StageTimings] = None
 
 
 class ResultResponse(ResultPayload):
     request_id: str
+
+
+class BatchItem(BaseModel):
+    filename: str
+    request_id: str
+
+
+class BatchUploadResponse(BaseModel):
+    batch_id: str
+    items: List[BatchItem]
+
+
+class BatchItemStatus(BatchItem):
+    status: str = Field(..., description="pending | done | expired")
+
+
+class BatchStatusResponse(BaseModel):
+    batch_id: str
+    total: int
+    completed: int
+    pending: int
+    expired: int
+    items: List[BatchItemStatus]
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+import requests
+
+# Local copies of every model the service needs, filled by scripts/provision_assets.py
+OCR_MODEL_ROOT = Path("models/paddleocr")
+PADDLECLAS_MODEL_ROOT = Path("models/paddleclas")
+ASSET_MANIFEST = Path("models/assets_manifest.json")
+
+INFERENCE_FILES = ("inference.pdmodel", "inference.pdiparams")
+
+
+class MissingAssetError(RuntimeError):
+    """Raised in offline mode when a required model file is not on disk."""
+
+
+def has_inference_model(model_dir: Path) -> bool:
+    return all((model_dir / name).exists() for name in INFERENCE_FILES)
+
+
+def ocr_model_dirs(root: Path = OCR_MODEL_ROOT) -> Dict[str, Path]:
+    """PaddleOCR ``*_model_dir`` arguments for a provisioned model root."""
+    return {
+        "det_model_dir": root / "det",
+        "rec_model_dir": root / "rec",
+        "cls_model_dir": root / "cls",
+    }
+
+
+def download_file(url: str, path: Path, timeout: float = 30.0) -> bool:
+    """Stream ``url`` into ``path``; a failed download leaves no partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".part")
+    try:
+        with requests.get(url, stream=True, timeout=timeout) as resp:
+            resp.raise_for_status()
+            with open(tmp, "wb") as out:
+                for chunk in resp.iter_content(chunk_size=8192):
+                    if chunk:
+                        out.write(chunk)
+        tmp.replace(path)
+        return True
+    except Exception as exc:  # noqa: BLE001
+        tmp.unlink(missing_ok=True)
+        print(f"[Assets] Download failed for {url}: {exc}")
+        return False
+
+
+def sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def write_manifest(paths: Iterable[Path], manifest: Path = ASSET_MANIFEST) -> Dict[str, str]:
+    """Record a checksum for every file under ``paths`` (files or directories)."""
+    entries: Dict[str, str] = {}
+    for path in paths:
+        files = sorted(p for p in path.rglob("*") if p.is_file()) if path.is_dir() else [path]
+        for file in files:
+            entries[file.as_posix()] = sha256_file(file)
+    manifest.parent.mkdir(parents=True, exist_ok=True)
+    manifest.write_text(json.dumps(entries, indent=2, sort_keys=True), encoding="utf-8")
+    return entries
+
+
+def verify_manifest(manifest: Path = ASSET_MANIFEST) -> List[str]:
+    """Return a problem description per missing or modified asset (empty when intact)."""
+    if not manifest.exists():
+        return [f"{manifest} not found; run scripts/provision_assets.py"]
+    problems: List[str] = []
+    for name, expected in json.loads(manifest.read_text(encoding="utf-8")).items():
+        path = Path(name)
+        if not path.exists():
+            problems.append(f"missing: {name}")
+        elif sha256_file(path) != expected:
+            problems.append(f"checksum mismatch: {name}")
+    return problems
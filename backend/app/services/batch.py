@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import zipfile
+from pathlib import PurePosixPath
+from typing import AsyncIterator, Awaitable, BinaryIO, Callable, List, Sequence, Tuple
+
+from fastapi import UploadFile
+
+IMAGE_CONTENT_TYPES = ("image/jpeg", "image/png")
+ZIP_CONTENT_TYPES = ("application/zip", "application/x-zip-compressed")
+IMAGE_SUFFIXES = (".jpg", ".jpeg", ".png")
+
+# (filename, loader) — loaders read one image only when the batch reaches it
+BatchSource = Tuple[str, Callable[[], Awaitable[bytes]]]
+
+
+class InvalidBatchError(ValueError):
+    """Raised when a batch upload cannot be accepted as a whole."""
+
+
+def collect_sources(files: Sequence[UploadFile], max_items: int, max_item_bytes: int) -> List[BatchSource]:
+    """
+    Turn uploaded images and zip archives into lazily-read batch sources.
+
+    Archives are indexed from their central directory only; members are
+    decompressed one at a time as the batch is fed to the scheduler. Every
+    limit is checked up front so a batch is rejected before any item runs.
+    """
+    sources: List[BatchSource] = []
+    for upload in files:
+        name = upload.filename or "upload"
+        if upload.content_type in ZIP_CONTENT_TYPES or name.lower().endswith(".zip"):
+            sources.extend(_zip_sources(upload, max_item_bytes))
+        elif upload.content_type in IMAGE_CONTENT_TYPES:
+            if upload.size is not None and upload.size > max_item_bytes:
+                raise InvalidBatchError(f"{name} exceeds {max_item_bytes} bytes")
+            sources.append((name, _file_loader(upload.file)))
+        else:
+            raise InvalidBatchError(f"Unsupported file type for {name}")
+        if len(sources) > max_items:
+            raise InvalidBatchError(f"Batch exceeds {max_items} images")
+    if not sources:
+        raise InvalidBatchError("Batch contains no images")
+    return sources
+
+
+def detach_files(files: Sequence[UploadFile]) -> List[BinaryIO]:
+    """
+    Take the spooled files away from their ``UploadFile`` wrappers.
+
+    FastAPI closes request files as soon as the handler returns, but a batch
+    keeps reading its sources afterwards. The wrappers get empty stand-ins to
+    close instead; the caller owns the returned files and must close them.
+    """
+    owned: List[BinaryIO] = []
+    for upload in files:
+        owned.append(upload.file)
+        upload.file = io.BytesIO()
+    return owned
+
+
+async def read_sources(sources: Sequence[BatchSource]) -> AsyncIterator[Tuple[str, bytes]]:
+    for name, load in sources:
+        yield name, await load()
+
+
+def _zip_sources(upload: UploadFile, max_item_bytes: int) -> List[BatchSource]:
+    try:
+        archive = zipfile.ZipFile(upload.file)
+    except zipfile.BadZipFile:
+        raise InvalidBatchError(f"{upload.filename} is not a valid zip archive") from None
+
+    sources: List[BatchSource] = []
+    for info in archive.infolist():
+        path = PurePosixPath(info.filename)
+        if info.is_dir() or path.suffix.lower() not in IMAGE_SUFFIXES:
+            continue
+        # Skip macOS resource forks and hidden files
+        if "__MACOSX" in path.parts or path.name.startswith("."):
+            continue
+        if info.file_size > max_item_bytes:
+            raise InvalidBatchError(f"{info.filename} exceeds {max_item_bytes} bytes")
+        sources.append((info.filename, _member_loader(archive, info)))
+    return sources
+
+
+def _file_loader(file: BinaryIO) -> Callable[[], Awaitable[bytes]]:
+    # Bound to the file object so it keeps working after ``detach_files``
+    return lambda: asyncio.to_thread(file.read)
+
+
+def _member_loader(archive: zipfile.ZipFile, info: zipfile.ZipInfo) -> Callable[[], Awaitable[bytes]]:
+    # Decompression is CPU-bound; keep it off the event loop
+    return lambda: asyncio.to_thread(archive.read, info)
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from typing import Sequence
+
+import cv2
+import numpy as np
+
+IMAGENET_MEAN = (0.485, 0.456, 0.406)
+IMAGENET_STD = (0.229, 0.224, 0.225)
+
+
+class CropPreprocessor:
+    """
+    Batched resize + normalize for the font models' 224x224 RGB input.
+
+    Every crop is resized straight into one reusable uint8 staging buffer,
+    then the whole batch is converted in a single fused multiply-add:
+    ``x / 255`` followed by ``(x - mean) / std`` folds into ``x * scale - bias``
+    per channel, and the BGR -> RGB swap and NHWC -> NCHW transpose are
+    strided views, so no per-crop float arrays are allocated.
+
+    The returned array is owned by the preprocessor and overwritten by the
+    next call; callers must hand it to the model (which copies) first.
+    """
+
+    def __init__(
+        self,
+        size: int = 224,
+        interpolation: int = cv2.INTER_LINEAR,
+        mean: Sequence[float] = IMAGENET_MEAN,
+        std: Sequence[float] = IMAGENET_STD,
+    ) -> None:
+        self.size = size
+        self.interpolation = interpolation
+        std_arr = np.asarray(std, dtype=np.float32)
+        # Indexed in RGB order; applied to the channel-reversed BGR view
+        self._scale = (1.0 / (255.0 * std_arr)).reshape(1, 3, 1, 1)
+        self._bias = (np.asarray(mean, dtype=np.float32) / std_arr).reshape(1, 3, 1, 1)
+        self._staging = np.empty((0, size, size, 3), dtype=np.uint8)
+        self._output = np.empty((0, 3, size, size), dtype=np.float32)
+
+    def __call__(self, crops: Sequence[np.ndarray]) -> np.ndarray:
+        """Float32 ``(len(crops), 3, size, size)`` batch of normalized RGB crops."""
+        count = len(crops)
+        if self._staging.shape[0] < count:
+            self._staging = np.empty((count, self.size, self.size, 3), dtype=np.uint8)
+            self._output = np.empty((count, 3, self.size, self.size), dtype=np.float32)
+        staging = self._staging[:count]
+        output = self._output[:count]
+
+        for slot, crop in zip(staging, crops):
+            if crop.ndim == 2:
+                crop = cv2.cvtColor(crop, cv2.COLOR_GRAY2BGR)
+            elif crop.shape[2] == 4:
+                crop = cv2.cvtColor(crop, cv2.COLOR_BGRA2BGR)
+            cv2.resize(crop, (self.size, self.size), dst=slot, interpolation=self.interpolation)
+
+        rgb_nchw = staging[..., ::-1].transpose(0, 3, 1, 2)
+        np.multiply(rgb_nchw, self._scale, out=output)
+        output -= self._bias
+        return output
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, List, Optional, Protocol, Sequence, Tuple
+
+from ..schemas.requests import ResultResponse
+from .engine import BatchInput, InferenceEngine, StageCallback
+
+
+class InferenceExecutor(Protocol):
+    """Where ``InferenceEngine.run`` executes: threads or worker processes."""
+
+    async def run(
+        self,
+        worker_index: int,
+        request_id: str,
+        payload: bytes,
+        book_size: str,
+        on_stage: Optional[StageCallback] = None,
+    ) -> ResultResponse:
+        ...
+
+    async def run_batch(
+        self,
+        worker_index: int,
+        items: Sequence[BatchInput],
+        on_stage: Optional[StageCallback] = None,
+    ) -> List[Optional[ResultResponse]]:
+        ...
+
+    def shutdown(self) -> None:
+        ...
+
+
+class ThreadExecutor:
+    """Runs each scheduler worker's engine in a thread; engines share the process's models."""
+
+    def __init__(self, workers: int, engine_factory: Callable[[], Any] = InferenceEngine) -> None:
+        self.engines: List[Any] = [engine_factory() for _ in range(max(1, workers))]
+
+    async def run(
+        self,
+        worker_index: int,
+        request_id: str,
+        payload: bytes,
+        book_size: str,
+        on_stage: Optional[StageCallback] = None,
+    ) -> ResultResponse:
+        engine = self.engines[worker_index]
+        report = _thread_safe(on_stage)
+        return await asyncio.to_thread(engine.run, request_id, payload, book_size, time.perf_counter(), report)
+
+    async def run_batch(
+        self,
+        worker_index: int,
+        items: Sequence[BatchInput],
+        on_stage: Optional[StageCallback] = None,
+    ) -> List[Optional[ResultResponse]]:
+        engine = self.engines[worker_index]
+        report = _thread_safe(on_stage)
+        return await asyncio.to_thread(engine.run_batch, list(items), time.perf_counter(), report)
+
+    def shutdown(self) -> None:
+        return None
+
+
+def _thread_safe(on_stage: Optional[StageCallback]) -> Optional[StageCallback]:
+    if on_stage is None:
+        return None
+    loop = asyncio.get_running_loop()
+
+    def _report(stage: str) -> None:
+        # Stages start on the worker thread; callbacks run on the loop
+        loop.call_soon_threadsafe(on_stage, stage)
+
+    return _report
+
+
+class ProcessExecutor:
+    """
+    Runs inference in a pool of worker processes to escape the GIL.
+
+    Every process builds its own engine once at start-up. Upload bytes travel
+    through ``multiprocessing.shared_memory`` rather than being pickled, and
+    results come back as compact dicts that are re-validated here.
+    """
+
+    def __init__(self, processes: int, engine_factory: Callable[[], Any] = InferenceEngine) -> None:
+        self.processes = max(1, processes)
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.processes,
+            # spawn: paddle and OpenCV thread pools do not survive fork()
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(engine_factory,),
+        )
+
+    async def run(
+        self,
+        worker_index: int,
+        request_id: str,
+        payload: bytes,
+        book_size: str,
+        on_stage: Optional[StageCallback] = None,
+    ) -> ResultResponse:
+        # Per-stage progress is not forwarded across processes
+        shm = SharedMemory(create=True, size=max(len(payload), 1))
+        try:
+            shm.buf[: len(payload)] = payload
+            loop = asyncio.get_running_loop()
+            compact = await loop.run_in_executor(
+                self._pool, _run_in_worker, shm.name, len(payload), request_id, book_size
+            )
+        finally:
+            shm.close()
+            shm.unlink()
+        return ResultResponse.model_validate(compact)
+
+    async def run_batch(
+        self,
+        worker_index: int,
+        items: Sequence[BatchInput],
+        on_stage: Optional[StageCallback] = None,
+    ) -> List[Optional[ResultResponse]]:
+        # All payloads of the batch share one segment, addressed by offset
+        sizes = [len(payload) for _, payload, _ in items]
+        shm = SharedMemory(create=True, size=max(sum(sizes), 1))
+        try:
+            layout = []
+            offset = 0
+            for (request_id, payload, book_size), size in zip(items, sizes):
+                shm.buf[offset:offset + size] = payload
+                layout.append((request_id, offset, size, book_size))
+                offset += size
+            loop = asyncio.get_running_loop()
+            compact = await loop.run_in_executor(self._pool, _run_batch_in_worker, shm.name, layout)
+        finally:
+            shm.close()
+            shm.unlink()
+        return [ResultResponse.model_validate(item) if item is not None else None for item in compact]
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+# --- worker-process side -------------------------------------------------
+
+_worker_engine: Optional[Any] = None
+
+
+def _init_worker(engine_factory: Callable[[], Any]) -> None:
+    global _worker_engine
+    _worker_engine = engine_factory()
+
+
+def _run_in_worker(shm_name: str, size: int, request_id: str, book_size: str) -> Dict[str, Any]:
+    assert _worker_engine is not None, "worker process was not initialised"
+    start = time.perf_counter()
+    # Spawned workers share the parent's resource tracker, and the parent
+    # owns (and unlinks) the segment once this call returns.
+    shm = SharedMemory(name=shm_name)
+    payload = shm.buf[:size]
+    error: Optional[str] = None
+    try:
+        result = _worker_engine.run(request_id, payload, book_size, start)
+    except Exception as exc:  # noqa: BLE001
+        # Only the message crosses the process boundary; the traceback would
+        # pin views of the shared buffer and block closing it.
+        error = f"{type(exc).__name__}: {exc}"
+    payload.release()
+    shm.close()
+    if error is not None:
+        raise RuntimeError(error)
+    return result.model_dump(exclude_none=True)
+
+
+def _run_batch_in_worker(
+    shm_name: str, layout: List[Tuple[str, int, int, str]]
+) -> List[Optional[Dict[str, Any]]]:
+    assert _worker_engine is not None, "worker process was not initialised"
+    start = time.perf_counter()
+    shm = SharedMemory(name=shm_name)
+    views = [shm.buf[offset:offset + size] for _, offset, size, _ in layout]
+    error: Optional[str] = None
+    results: List[Optional[Any]] = []
+    try:
+        items = [(request_id, view, book_size) for (request_id, _, _, book_size), view in zip(layout, views)]
+        results = _worker_engine.run_batch(items, start)
+    except Exception as exc:  # noqa: BLE001
+        error = f"{type(exc).__name__}: {exc}"
+    for view in views:
+        view.release()
+    shm.close()
+    if error is not None:
+        raise RuntimeError(error)
+    return [result.model_dump(exclude_none=True) if result is not None else None for result in results]
@@ -1,22 +1,28 @@
 from __future__ import annotations
 
 import math
-import os
+import threading
 import json
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence, Tuple
+from typing import Any, Dict, List, NamedTuple, Optional, Protocol, Sequence, Tuple
 
 import cv2
 import numpy as np
-import requests
 from PIL import Image, ImageDraw, ImageFont
 import paddle
 import paddle.nn as nn
-import paddle.vision.transforms as T
 from paddle.vision.models import resnet18
 from paddle.inference import Config, create_predictor
 
+from ..core.config import get_settings
+from .assets import PADDLECLAS_MODEL_ROOT, MissingAssetError, download_file, has_inference_model
+from .crop_preprocessor import CropPreprocessor
+from .font_gallery import FontGallery, gallery_cache_key, load_gallery, save_gallery
+from .onnx_runtime import create_onnx_session
+
 # paddleclas is optional; fall back to heuristic classifier if unavailable
 try:
     from paddleclas.paddleclas import check_model_file
@@ -84,14 +90,16 @@ class PaddleClasFeatureExtractor:
     def __init__(self, model_name: str = MODEL_NAME) -> None:
         if not _PADDLECLAS_AVAILABLE:
             raise ImportError("paddleclas is not installed; advanced font classifier disabled")
-        model_dir = Path(check_model_file("imn", model_name))
+        model_dir = PADDLECLAS_MODEL_ROOT / model_name
+        if not has_inference_model(model_dir):
+            if get_settings().offline_mode:
+                raise MissingAssetError(f"PaddleClas model not found under {model_dir}")
+            model_dir = Path(check_model_file("imn", model_name))
         model_file = model_dir / "inference.pdmodel"
         params_file = model_dir / "inference.pdiparams"
         config = Config(str(model_file), str(params_file))
         config.disable_gpu()
-        config.set_cpu_math_library_num_threads(
-            int(os.environ.get("COVEROCR_FONT_THREADS", "2"))
-        )
+        config.set_cpu_math_library_num_threads(get_settings().font_threads)
         config.enable_memory_optim()
         config.switch_use_feed_fetch_ops(False)
         self.predictor = create_predictor(config)
@@ -101,30 +109,42 @@ class PaddleClasFeatureExtractor:
         self.output_handle = self.predictor.get_output_handle(
             self.predictor.get_output_names()[0]
         )
-        self.mean = np.array([0.485, 0.456, 0.406], dtype=np.float32).reshape((3, 1, 1))
-        self.std = np.array([0.229, 0.224, 0.225], dtype=np.float32).reshape((3, 1, 1))
-
-    def _preprocess(self, image: np.ndarray) -> np.ndarray:
-        if image.ndim == 2:
-            image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
-        resized = cv2.resize(image, (224, 224), interpolation=cv2.INTER_AREA)
-        rgb = cv2.cvtColor(resized, cv2.COLOR_BGR2RGB).astype(np.float32) / 255.0
-        normalized = (rgb.transpose(2, 0, 1) - self.mean) / self.std
-        return normalized[np.newaxis, :]
+        self._preprocessor = CropPreprocessor(interpolation=cv2.INTER_AREA)
 
     def extract(self, image: np.ndarray) -> Optional[np.ndarray]:
-        try:
-            tensor = self._preprocess(image)
-        except Exception:
-            return None
+        return self.extract_batch([image])[0]
+
+    def extract_batch(self, images: Sequence[np.ndarray], batch_size: int = 16) -> List[Optional[np.ndarray]]:
+        """L2-normalised embeddings for ``images``, ``batch_size`` per predictor run."""
+        results: List[Optional[np.ndarray]] = [None] * len(images)
+        valid = [i for i, image in enumerate(images) if image is not None and image.size > 0]
 
-        self.input_handle.copy_from_cpu(tensor)
+        for start in range(0, len(valid), batch_size):
+            chunk = valid[start:start + batch_size]
+            try:
+                outputs = list(self._run([images[i] for i in chunk]))
+            except Exception as exc:  # noqa: BLE001
+                # Isolate the crop that broke the batch; the rest still get embeddings
+                print(f"[PaddleClasFeatureExtractor] Batch of {len(chunk)} failed, retrying one by one: {exc}")
+                outputs = [self._run_single(images[i]) for i in chunk]
+            for i, output in zip(chunk, outputs):
+                if output is None:
+                    continue
+                norm = np.linalg.norm(output)
+                if norm != 0:
+                    results[i] = output / norm
+        return results
+
+    def _run(self, images: Sequence[np.ndarray]) -> np.ndarray:
+        self.input_handle.copy_from_cpu(self._preprocessor(images))
         self.predictor.run()
-        output = self.output_handle.copy_to_cpu()[0]
-        norm = np.linalg.norm(output)
-        if norm == 0:
+        return self.output_handle.copy_to_cpu()
+
+    def _run_single(self, image: np.ndarray) -> Optional[np.ndarray]:
+        try:
+            return self._run([image])[0]
+        except Exception:  # noqa: BLE001
             return None
-        return output / norm
 
 
 class PaddleClasFontClassifier:
@@ -136,11 +156,14 @@ class PaddleClasFontClassifier:
         self.gallery = self._build_gallery(self.font_resources)
 
     def _prepare_fonts(self) -> List[FontResource]:
-        FONT_BASE_DIR.mkdir(parents=True, exist_ok=True)
+        offline = get_settings().offline_mode
         available: List[FontResource] = []
         for spec in FONT_RESOURCES:
             path = FONT_BASE_DIR / spec.filename
             if not path.exists():
+                if offline:
+                    print(f"[FontAssets] 离线模式，跳过缺失字体 {spec.display_name}")
+                    continue
                 self._download_font(spec.url, path, spec.display_name)
             if path.exists():
                 available.append(FontResource(**{**spec.__dict__, "path": path}))
@@ -148,33 +171,42 @@ class PaddleClasFontClassifier:
 
     @staticmethod
     def _download_font(url: str, path: Path, display_name: str) -> None:
-        path.parent.mkdir(parents=True, exist_ok=True)
-        try:
-            with requests.get(url, stream=True, timeout=30) as resp:
-                resp.raise_for_status()
-                with open(path, "wb") as out:
-                    for chunk in resp.iter_content(chunk_size=8192):
-                        if chunk:
-                            out.write(chunk)
-        except Exception as exc:  # noqa: BLE001
-            if path.exists():
-                path.unlink(missing_ok=True)
-            print(f"[FontAssets] 下载字体 {display_name} 失败：{exc}")
-
-    def _build_gallery(self, fonts: Sequence[FontResource]) -> Dict[str, List[np.ndarray]]:
-        gallery: Dict[str, List[np.ndarray]] = {}
-        for spec in fonts:
-            if spec.path is None:
-                continue
-            embeddings: List[np.ndarray] = []
-            for text in GALLERY_TEXTS:
-                sample = self._render_sample(spec.path, text)
-                embedding = self.extractor.extract(sample)
-                if embedding is not None:
-                    embeddings.append(embedding)
-            if embeddings:
-                gallery[spec.display_name] = embeddings
-        return gallery
+        if not download_file(url, path):
+            print(f"[FontAssets] 下载字体 {display_name} 失败")
+
+    def _build_gallery(self, fonts: Sequence[FontResource]) -> Optional[FontGallery]:
+        """Embed every (font, gallery text) sample, reusing the on-disk cache.
+
+        The cache is keyed by font file contents, ``GALLERY_TEXTS`` and
+        ``MODEL_NAME`` and is memory-mapped when warm. On a cold cache samples
+        are rendered in parallel and embedded in batches, then saved.
+        """
+        specs = [spec for spec in fonts if spec.path is not None]
+        if not specs:
+            return None
+        cache_setting = get_settings().font_gallery_cache_dir
+        cache_dir = Path(cache_setting) if cache_setting else None
+        key = gallery_cache_key([(spec.display_name, spec.path) for spec in specs], GALLERY_TEXTS, MODEL_NAME)
+
+        if cache_dir is not None:
+            cached = load_gallery(cache_dir, key)
+            if cached is not None:
+                return FontGallery(*cached)
+
+        pairs = [(spec, text) for spec in specs for text in GALLERY_TEXTS]
+        # PIL/FreeType rasterisation releases the GIL for most of the work
+        with ThreadPoolExecutor(max_workers=min(8, len(pairs))) as pool:
+            samples = list(pool.map(lambda pair: self._render_sample(pair[0].path, pair[1]), pairs))
+        embeddings = self.extractor.extract_batch(samples)
+
+        labels = [spec.display_name for (spec, _), emb in zip(pairs, embeddings) if emb is not None]
+        vectors = [emb for emb in embeddings if emb is not None]
+        if not vectors:
+            return None
+        matrix = np.stack(vectors).astype(np.float32)
+        if cache_dir is not None:
+            save_gallery(cache_dir, key, labels, matrix)
+        return FontGallery(labels, matrix)
 
     @staticmethod
     def _render_sample(font_path: Path, text: str) -> np.ndarray:
@@ -192,24 +224,35 @@ class PaddleClasFontClassifier:
         return cv2.cvtColor(np.array(img), cv2.COLOR_RGB2BGR)
 
     def predict(self, text: str, crop: Optional[np.ndarray]) -> Optional[Tuple[str, float]]:
-        if not self.gallery or crop is None or crop.size == 0:
-            return None
-        embedding = self.extractor.extract(crop)
-        if embedding is None:
-            return None
-
-        best_label = None
-        best_score = -1.0
-        for label, vectors in self.gallery.items():
-            for proto in vectors:
-                score = float(np.dot(embedding, proto))
-                if score > best_score:
-                    best_score = score
-                    best_label = label
-        if best_label is None:
-            return None
-        confidence = max(0.0, min(1.0, (best_score + 1) / 2))
-        return best_label, confidence
+        return self.predict_batch([text], [crop])[0]
+
+    def predict_batch(
+        self, texts: Sequence[str], crops: Sequence[Optional[np.ndarray]]
+    ) -> List[Optional[Tuple[str, float]]]:
+        """Best gallery font per crop, with cosine similarity mapped to [0, 1]."""
+        results: List[Optional[Tuple[str, float]]] = []
+        for matches in self.predict_topk(crops, k=1):
+            if not matches:
+                results.append(None)
+                continue
+            label, score = matches[0]
+            results.append((label, max(0.0, min(1.0, (score + 1) / 2))))
+        return results
+
+    def predict_topk(self, crops: Sequence[Optional[np.ndarray]], k: int = 3) -> List[List[Tuple[str, float]]]:
+        """Top-``k`` ``(font, cosine score)`` per crop; empty for unusable crops."""
+        results: List[List[Tuple[str, float]]] = [[] for _ in crops]
+        if not self.gallery:
+            return results
+        valid = [i for i, crop in enumerate(crops) if crop is not None and crop.size > 0]
+        embeddings = self.extractor.extract_batch([crops[i] for i in valid])
+        queries = [(i, emb) for i, emb in zip(valid, embeddings) if emb is not None]
+        if not queries:
+            return results
+        matches = self.gallery.search(np.stack([emb for _, emb in queries]), k=k)
+        for (i, _), top in zip(queries, matches):
+            results[i] = top
+        return results
 
 
 class HeuristicFontClassifier:
@@ -220,17 +263,41 @@ class HeuristicFontClassifier:
     COMMON_LATIN_SERIF = ("Times New Roman", "Georgia")
     COMMON_LATIN_SANS = ("Arial", "Helvetica", "Roboto")
 
+    # Larger crops are downscaled to about this many pixels before feature extraction
+    FEATURE_MAX_PIXELS = 1 << 19
+    # Dark pixels sampled (on a regular grid) for the italic line fit
+    FIT_MAX_POINTS = 1 << 14
+
     def predict(self, text: str, crop: Optional[np.ndarray]) -> Tuple[str, float]:
         normalized = text.strip()
         if not normalized:
             return "未知字体", 0.0
+        return self._decide(normalized, self._extract_basic_features(crop))
+
+    def predict_batch(
+        self, texts: Sequence[str], crops: Sequence[Optional[np.ndarray]]
+    ) -> List[Tuple[str, float]]:
+        """``predict`` for all regions of an image, extracting features once per distinct crop."""
+        features: Dict[int, Dict[str, float]] = {}
+        results: List[Tuple[str, float]] = []
+        for text, crop in zip(texts, crops):
+            normalized = text.strip()
+            if not normalized:
+                results.append(("未知字体", 0.0))
+                continue
+            # ImageContext.crop hands out the same array for every degenerate box
+            key = id(crop)
+            if key not in features:
+                features[key] = self._extract_basic_features(crop)
+            results.append(self._decide(normalized, features[key]))
+        return results
+
+    def _decide(self, normalized: str, features: Dict[str, float]) -> Tuple[str, float]:
+        fill_ratio = features["fill_ratio"]
+        edge_ratio = features["edge_ratio"]
+        serif_score = features["serif_score"]
 
         if self._contains_chinese(normalized):
-            features = self._extract_basic_features(crop)
-            fill_ratio = features["fill_ratio"]
-            edge_ratio = features["edge_ratio"]
-            serif_score = features["serif_score"]
-
             if fill_ratio > 0.38 or (fill_ratio > 0.32 and edge_ratio < 0.12):
                 return self.COMMON_CHINESE_BOLD_FONTS[0], 0.72
             if fill_ratio > 0.33:
@@ -242,9 +309,6 @@ class HeuristicFontClassifier:
             return self.COMMON_CHINESE_SERIF_FONTS[0], 0.55
 
         uppercase_ratio = sum(1 for ch in normalized if ch.isupper()) / max(len(normalized), 1)
-        features = self._extract_basic_features(crop)
-        fill_ratio = features["fill_ratio"]
-        serif_score = features["serif_score"]
         italic_angle = features["italic_angle"]
 
         if abs(italic_angle) > 10:
@@ -261,28 +325,41 @@ class HeuristicFontClassifier:
     def _contains_chinese(text: str) -> bool:
         return any("\u4e00" <= ch <= "\u9fff" for ch in text)
 
-    @staticmethod
-    def _extract_basic_features(crop: Optional[np.ndarray]) -> Dict[str, float]:
+    @classmethod
+    def _extract_basic_features(cls, crop: Optional[np.ndarray]) -> Dict[str, float]:
         if crop is None or crop.size == 0:
             return {"fill_ratio": 0.25, "edge_ratio": 0.1, "serif_score": 1.0, "italic_angle": 0.0}
-        gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+        gray = crop if crop.ndim == 2 else cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+        height, width = gray.shape
+        scale = 1.0
+        if height * width > cls.FEATURE_MAX_PIXELS:
+            scale = math.sqrt(cls.FEATURE_MAX_PIXELS / (height * width))
+            size = (max(1, round(width * scale)), max(1, round(height * scale)))
+            gray = cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
         gray = cv2.GaussianBlur(gray, (3, 3), 0)
-        _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        fill_ratio = float(np.count_nonzero(binary < 128)) / max(binary.size, 1)
-        edges = cv2.Canny(gray, 80, 160)
-        edge_ratio = float(np.count_nonzero(edges)) / max(edges.size, 1)
-
-        sobel_x = cv2.Sobel(gray, cv2.CV_64F, 1, 0, ksize=3)
-        sobel_y = cv2.Sobel(gray, cv2.CV_64F, 0, 1, ksize=3)
-        horizontal_energy = float(np.mean(np.abs(sobel_x)) + 1e-6)
-        vertical_energy = float(np.mean(np.abs(sobel_y)) + 1e-6)
+        # Inverted so dark (ink) pixels are the non-zero ones
+        _, ink = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+        pixels = ink.size
+        ink_count = cv2.countNonZero(ink)
+        fill_ratio = ink_count / pixels
+        # Edges are ~1px wide at any scale, so their density grows as 1/scale; undo that
+        edge_ratio = cv2.countNonZero(cv2.Canny(gray, 80, 160)) / pixels * scale
+
+        sobel_x = cv2.Sobel(gray, cv2.CV_32F, 1, 0, ksize=3)
+        sobel_y = cv2.Sobel(gray, cv2.CV_32F, 0, 1, ksize=3)
+        horizontal_energy = cv2.norm(sobel_x, cv2.NORM_L1) / pixels + 1e-6
+        vertical_energy = cv2.norm(sobel_y, cv2.NORM_L1) / pixels + 1e-6
         serif_score = horizontal_energy / vertical_energy
 
-        coords = np.column_stack(np.where(binary < 128))
         italic_angle = 0.0
-        if coords.size > 0:
-            [vx, vy, _, _] = cv2.fitLine(coords.astype(np.float32), cv2.DIST_L2, 0, 0.01, 0.01)
-            italic_angle = math.degrees(math.atan2(float(vx), float(vy)))
+        if ink_count:
+            # A regular grid subsample keeps the principal direction of the ink
+            step = max(1, math.ceil(math.sqrt(ink_count / cls.FIT_MAX_POINTS)))
+            rows, cols = np.nonzero(ink[::step, ::step])
+            if rows.size:
+                coords = np.column_stack((rows, cols)).astype(np.float32)
+                vx, vy, _, _ = cv2.fitLine(coords, cv2.DIST_L2, 0, 0.01, 0.01).ravel()
+                italic_angle = math.degrees(math.atan2(float(vx), float(vy)))
 
         return {
             "fill_ratio": fill_ratio,
@@ -295,8 +372,9 @@ class HeuristicFontClassifier:
 class CustomResNetFontClassifier:
     """Fine-tuned ResNet18 classifier for specific book cover fonts."""
 
-    def __init__(self, model_dir: Path) -> None:
+    def __init__(self, model_dir: Path, max_batch_size: int = 32) -> None:
         self.model_dir = model_dir
+        self.max_batch_size = max(1, max_batch_size)
         self.params_path = model_dir / "font_resnet18.pdparams"
         self.mapping_path = model_dir / "class_mapping.json"
         
@@ -315,36 +393,270 @@ class CustomResNetFontClassifier:
         state_dict = paddle.load(str(self.params_path))
         self.model.set_state_dict(state_dict)
         self.model.eval()
-        
-        # Transforms (must match training)
-        self.transform = T.Compose([
-            T.Resize((224, 224)),
-            T.ToTensor(),
-            T.Normalize(mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225])
-        ])
-        
+
+        # Matches the training transforms: Resize((224, 224)) + ToTensor + ImageNet Normalize
+        self._preprocessor = CropPreprocessor()
+
     def predict(self, text: str, crop: Optional[np.ndarray]) -> Optional[Tuple[str, float]]:
-        if crop is None or crop.size == 0:
-            return None
-            
+        return self.predict_batch([text], [crop])[0]
+
+    def predict_batch(
+        self, texts: Sequence[str], crops: Sequence[Optional[np.ndarray]]
+    ) -> List[Optional[Tuple[str, float]]]:
+        """Classify all crops of an image with as few forward passes as possible.
+
+        Crops are stacked into batches of at most ``max_batch_size``; results are
+        returned in input order, with ``None`` for empty crops or failed batches.
+        """
+        results: List[Optional[Tuple[str, float]]] = [None] * len(crops)
+        valid = [i for i, crop in enumerate(crops) if crop is not None and crop.size > 0]
+
+        for start in range(0, len(valid), self.max_batch_size):
+            chunk = valid[start:start + self.max_batch_size]
+            try:
+                batch = paddle.to_tensor(self._preprocessor([crops[i] for i in chunk]))
+                with paddle.no_grad():
+                    outputs = self.model(batch)
+                    probs = paddle.nn.functional.softmax(outputs, axis=1)
+                    scores, indices = paddle.topk(probs, k=1, axis=1)
+
+                for i, score, idx in zip(chunk, scores.numpy()[:, 0], indices.numpy()[:, 0]):
+                    results[i] = (self.classes[int(idx)], float(score))
+            except Exception as e:
+                print(f"[CustomFontClassifier] Prediction failed: {e}")
+        return results
+
+RESNET_INFERENCE_PREFIX = Path("inference") / "font_resnet18"
+# Post-training quantized export (scripts/quantize_font_classifier.py)
+RESNET_INT8_PREFIX = Path("inference_int8") / "font_resnet18"
+RESNET_ONNX_PATH = Path("onnx") / "font_resnet18.onnx"
+
+
+def export_resnet_inference_model(model_dir: Path, prefix: Optional[Path] = None) -> Path:
+    """Convert ``font_resnet18.pdparams`` into a static-graph inference model.
+
+    Writes ``<model_dir>/inference/font_resnet18.*`` (or ``prefix.*``) and
+    returns that prefix; ``StaticResNetFontClassifier`` serves it.
+    """
+    from paddle.static import InputSpec
+
+    dygraph = CustomResNetFontClassifier(model_dir)
+    static = paddle.jit.to_static(
+        dygraph.model, input_spec=[InputSpec([None, 3, 224, 224], "float32", "x")], full_graph=True
+    )
+    prefix = prefix or model_dir / RESNET_INFERENCE_PREFIX
+    prefix.parent.mkdir(parents=True, exist_ok=True)
+    paddle.jit.save(static, str(prefix))
+    return prefix
+
+
+def export_resnet_onnx_model(model_dir: Path, opset_version: int = 13) -> Path:
+    """Convert ``font_resnet18.pdparams`` into ``<model_dir>/onnx/font_resnet18.onnx``.
+
+    Needs ``paddle2onnx``; ``OnnxResNetFontClassifier`` serves the result.
+    """
+    from paddle.static import InputSpec
+
+    dygraph = CustomResNetFontClassifier(model_dir)
+    path = model_dir / RESNET_ONNX_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # paddle.onnx.export appends the .onnx suffix itself
+    paddle.onnx.export(
+        dygraph.model,
+        str(path.with_suffix("")),
+        input_spec=[InputSpec([None, 3, 224, 224], "float32", "x")],
+        opset_version=opset_version,
+    )
+    return path
+
+
+def _find_inference_model(prefix: Path) -> Optional[Tuple[Path, Path]]:
+    # Paddle 3 (PIR) saves ``.json`` programs; older exports use ``.pdmodel``
+    params = prefix.with_suffix(".pdiparams")
+    for suffix in (".json", ".pdmodel"):
+        program = prefix.with_suffix(suffix)
+        if program.exists() and params.exists():
+            return program, params
+    return None
+
+
+TIER_HEURISTIC = "heuristic"
+TIER_RESNET = "resnet"
+TIER_PADDLECLAS = "paddleclas"
+FONT_TIERS = (TIER_HEURISTIC, TIER_RESNET, TIER_PADDLECLAS)
+
+
+class FontPrediction(NamedTuple):
+    """A font label, its confidence and the classifier tier that decided it."""
+
+    font: str
+    confidence: float
+    tier: str = TIER_HEURISTIC
+
+
+class ResNetBackend(Protocol):
+    """What ``FontClassifier`` needs from a fine-tuned ResNet18 runtime."""
+
+    classes: List[str]
+
+    def predict(self, text: str, crop: Optional[np.ndarray]) -> Optional[Tuple[str, float]]:
+        ...
+
+    def predict_batch(
+        self, texts: Sequence[str], crops: Sequence[Optional[np.ndarray]]
+    ) -> List[Optional[Tuple[str, float]]]:
+        ...
+
+
+class _ExportedResNetClassifier(ABC):
+    """Shared preprocessing and decoding for runtimes serving an exported ResNet18.
+
+    Subclasses set ``classes``/``max_batch_size`` and implement ``_run``,
+    which maps an NCHW float32 batch to logits.
+    """
+
+    classes: List[str]
+    max_batch_size: int
+    _preprocessor: CropPreprocessor
+
+    @abstractmethod
+    def _run(self, batch: np.ndarray) -> np.ndarray:
+        ...
+
+    def predict(self, text: str, crop: Optional[np.ndarray]) -> Optional[Tuple[str, float]]:
+        return self.predict_batch([text], [crop])[0]
+
+    def predict_batch(
+        self, texts: Sequence[str], crops: Sequence[Optional[np.ndarray]]
+    ) -> List[Optional[Tuple[str, float]]]:
+        """Same contract as ``CustomResNetFontClassifier.predict_batch``."""
+        results: List[Optional[Tuple[str, float]]] = [None] * len(crops)
+        valid = [i for i, crop in enumerate(crops) if crop is not None and crop.size > 0]
+
+        for start in range(0, len(valid), self.max_batch_size):
+            chunk = valid[start:start + self.max_batch_size]
+            try:
+                logits = self._run(self._preprocessor([crops[i] for i in chunk]))
+                logits = logits - logits.max(axis=1, keepdims=True)
+                probs = np.exp(logits)
+                probs /= probs.sum(axis=1, keepdims=True)
+                for i, row in zip(chunk, probs):
+                    idx = int(np.argmax(row))
+                    results[i] = (self.classes[idx], float(row[idx]))
+            except Exception as e:
+                print(f"[{type(self).__name__}] Prediction failed: {e}")
+        return results
+
+
+class StaticResNetFontClassifier(_ExportedResNetClassifier):
+    """The fine-tuned ResNet18 served by a Paddle Inference predictor (oneDNN).
+
+    Same interface and preprocessing as ``CustomResNetFontClassifier``, which
+    stays as the fallback when no exported model is present. ``precision``
+    "int8" serves the post-training quantized export with oneDNN INT8 kernels.
+    """
+
+    def __init__(self, model_dir: Path, max_batch_size: int = 32, threads: int = 2, precision: str = "fp32") -> None:
+        self.model_dir = model_dir
+        self.max_batch_size = max(1, max_batch_size)
+        self.precision = precision
+        self._preprocessor = CropPreprocessor()
+        int8 = precision == "int8"
+        files = _find_inference_model(model_dir / (RESNET_INT8_PREFIX if int8 else RESNET_INFERENCE_PREFIX))
+        if files is None:
+            script = "quantize_font_classifier.py" if int8 else "export_font_classifier.py"
+            raise FileNotFoundError(f"Exported {precision} inference model not found; run scripts/{script}")
+        with open(model_dir / "class_mapping.json", 'r', encoding='utf-8') as f:
+            self.classes = json.load(f)
+
         try:
-            # Preprocess
-            img = cv2.cvtColor(crop, cv2.COLOR_BGR2RGB)
-            img_tensor = self.transform(img)
-            img_tensor = img_tensor.unsqueeze(0)
-            
-            with paddle.no_grad():
-                outputs = self.model(img_tensor)
-                probs = paddle.nn.functional.softmax(outputs, axis=1)
-                score, idx = paddle.topk(probs, k=1)
-                
-            label = self.classes[idx.item()]
-            confidence = score.item()
-            
-            return label, confidence
-        except Exception as e:
-            print(f"[CustomFontClassifier] Prediction failed: {e}")
-            return None
+            self.predictor = create_predictor(self._config(files, threads, memory_optim=True, int8=int8))
+        except Exception:  # noqa: BLE001
+            # memory_optimize_pass is unavailable for PIR programs on some Paddle builds
+            self.predictor = create_predictor(self._config(files, threads, memory_optim=False, int8=int8))
+        self.input_handle = self.predictor.get_input_handle(self.predictor.get_input_names()[0])
+        self.output_handle = self.predictor.get_output_handle(self.predictor.get_output_names()[0])
+
+    @staticmethod
+    def _config(files: Tuple[Path, Path], threads: int, memory_optim: bool, int8: bool = False) -> Config:
+        config = Config(str(files[0]), str(files[1]))
+        config.disable_gpu()
+        config.enable_mkldnn()
+        if int8:
+            config.enable_mkldnn_int8()
+        config.set_cpu_math_library_num_threads(max(1, threads))
+        if memory_optim:
+            config.enable_memory_optim()
+        config.disable_glog_info()
+        return config
+
+    def _run(self, batch: np.ndarray) -> np.ndarray:
+        self.input_handle.reshape(batch.shape)
+        self.input_handle.copy_from_cpu(batch)
+        self.predictor.run()
+        return self.output_handle.copy_to_cpu()
+
+
+class OnnxResNetFontClassifier(_ExportedResNetClassifier):
+    """The fine-tuned ResNet18 served by ONNX Runtime (scripts/export_onnx_models.py)."""
+
+    def __init__(
+        self, model_dir: Path, max_batch_size: int = 32, intra_op_threads: int = 2, inter_op_threads: int = 1
+    ) -> None:
+        self.model_dir = model_dir
+        self.max_batch_size = max(1, max_batch_size)
+        self._preprocessor = CropPreprocessor()
+        path = model_dir / RESNET_ONNX_PATH
+        if not path.exists():
+            raise FileNotFoundError(f"ONNX model not found at {path}; run scripts/export_onnx_models.py")
+        with open(model_dir / "class_mapping.json", 'r', encoding='utf-8') as f:
+            self.classes = json.load(f)
+        self.session = create_onnx_session(path, intra_op_threads, inter_op_threads)
+        self.input_name = self.session.get_inputs()[0].name
+
+    def _run(self, batch: np.ndarray) -> np.ndarray:
+        return self.session.run(None, {self.input_name: batch})[0]
+
+
+def load_resnet_classifier(
+    model_dir: Path,
+    max_batch_size: int,
+    backend: str = "auto",
+    threads: int = 2,
+    precision: str = "fp32",
+    inter_op_threads: int = 1,
+) -> ResNetBackend:
+    """The fine-tuned ResNet18 on the requested backend.
+
+    ``auto`` serves the exported inference model when present and otherwise
+    falls back to dygraph; ``inference``, ``onnx`` and ``dygraph`` force one
+    backend. With ``precision`` "int8" the quantized export is preferred;
+    under ``auto`` a missing INT8 model falls back to FP32.
+    """
+    if backend == "onnx":
+        return OnnxResNetFontClassifier(
+            model_dir, max_batch_size=max_batch_size, intra_op_threads=threads, inter_op_threads=inter_op_threads
+        )
+    if backend in ("auto", "inference"):
+        precisions = ["int8", "fp32"] if precision == "int8" and backend == "auto" else [precision]
+        for candidate in precisions:
+            try:
+                model = StaticResNetFontClassifier(
+                    model_dir, max_batch_size=max_batch_size, threads=threads, precision=candidate
+                )
+            except Exception as exc:  # noqa: BLE001
+                if backend == "inference":
+                    raise
+                if not isinstance(exc, FileNotFoundError):
+                    print(f"[FontClassifier] {candidate} inference backend unavailable: {exc}")
+                continue
+            if candidate != precision:
+                print(f"[FontClassifier] No {precision} inference model; serving {candidate} instead")
+            return model
+    if precision != "fp32":
+        print(f"[FontClassifier] No {precision} inference model; falling back to the fp32 dygraph model")
+    return CustomResNetFontClassifier(model_dir, max_batch_size=max_batch_size)
+
 
 class FontClassifier:
     """Facade that tries PaddleClas gallery first, then falls back to heuristics."""
@@ -385,18 +697,35 @@ class FontClassifier:
 
 # Override with a simplified FontClassifier that works without paddleclas on Python 3.12+
 class FontClassifier:  # type: ignore[redef]
-    """Tries custom model, then optional PaddleClas, then heuristics."""
-
-    def __init__(self) -> None:
-        self._custom: Optional[CustomResNetFontClassifier] = None
-        self._advanced: Optional[PaddleClasFeatureExtractor] = None
+    """Tries custom model, then optional PaddleClas, then heuristics.
+
+    In cascade mode (``settings.font_cascade``) the heuristic classifier
+    screens every region first; only regions below
+    ``font_cascade_threshold`` confidence or with crops at least
+    ``font_cascade_escalate_height`` px tall go on to the expensive tiers.
+    Every prediction records the tier that decided it.
+    """
+
+    def __init__(self, max_batch_size: Optional[int] = None) -> None:
+        self._custom: Optional[ResNetBackend] = None
+        self._advanced: Optional[PaddleClasFontClassifier] = None
+        settings = get_settings()
+        if max_batch_size is None:
+            max_batch_size = settings.font_max_batch_size
 
         # Try loading custom fine-tuned model
         try:
             custom_model_dir = Path("models/custom_font_classifier")
             if custom_model_dir.exists():
-                self._custom = CustomResNetFontClassifier(custom_model_dir)
-                print("[FontClassifier] Loaded fine-tuned ResNet18 model")
+                self._custom = load_resnet_classifier(
+                    custom_model_dir,
+                    max_batch_size=max_batch_size,
+                    backend=settings.font_backend,
+                    threads=settings.font_threads,
+                    precision=settings.font_precision,
+                    inter_op_threads=settings.onnx_inter_op_threads,
+                )
+                print(f"[FontClassifier] Loaded fine-tuned ResNet18 model ({type(self._custom).__name__})")
         except Exception as exc:  # noqa: BLE001
             print(f"[FontClassifier] Failed to load fine-tuned model: {exc}")
 
@@ -410,16 +739,90 @@ class FontClassifier:  # type: ignore[redef]
             print("[FontClassifier] paddleclas not available; using heuristics.")
 
         self._fallback = HeuristicFontClassifier()
+        self.configure_cascade(
+            settings.font_cascade, settings.font_cascade_threshold, settings.font_cascade_escalate_height
+        )
+        # Shared process-wide through the model registry; serialise inference
+        self._lock = threading.RLock()
+
+    @property
+    def resnet(self) -> Optional[ResNetBackend]:
+        """The fine-tuned ResNet18 runtime that was loaded, if any."""
+        return self._custom
+
+    def configure_cascade(self, enabled: bool, threshold: float = 0.58, escalate_height: int = 0) -> None:
+        """Switch cascade mode and reset the per-tier counters."""
+        self._cascade = enabled
+        self._cascade_threshold = threshold
+        self._escalate_height = escalate_height
+        self._tier_counts: Dict[str, int] = {tier: 0 for tier in FONT_TIERS}
+        self._escalated = 0
 
     def predict(self, text: str, crop: Optional[np.ndarray]) -> Tuple[str, float]:
-        if self._custom:
-            result = self._custom.predict(text, crop)
-            if result:
-                return result
-
-        if self._advanced:
-            result = self._advanced.predict(text, crop)
-            if result:
-                return result
+        with self._lock:
+            prediction = self._predict_batch([text], [crop])[0]
+        return prediction.font, prediction.confidence
+
+    def predict_batch(
+        self, texts: Sequence[str], crops: Sequence[Optional[np.ndarray]]
+    ) -> List[FontPrediction]:
+        """Batched ``predict``: one result per (text, crop) pair, in input order."""
+        with self._lock:
+            return self._predict_batch(texts, crops)
+
+    def stats(self) -> Dict[str, Any]:
+        """How often each tier decided, reported under the model registry in /stats."""
+        regions = sum(self._tier_counts.values())
+        return {
+            "cascade": self._cascade,
+            "regions": regions,
+            "tiers": dict(self._tier_counts),
+            "tier_share": {
+                tier: round(count / regions, 4) if regions else 0.0 for tier, count in self._tier_counts.items()
+            },
+            "escalated": self._escalated,
+        }
 
-        return self._fallback.predict(text, crop)
+    def _predict_batch(
+        self, texts: Sequence[str], crops: Sequence[Optional[np.ndarray]]
+    ) -> List[FontPrediction]:
+        results: List[Optional[FontPrediction]] = [None] * len(texts)
+        screened: Dict[int, Tuple[str, float]] = {}
+        pending = list(range(len(texts)))
+
+        if self._cascade and (self._custom or self._advanced):
+            pending = []
+            screened = dict(enumerate(self._fallback.predict_batch(texts, crops)))
+            for i, crop in enumerate(crops):
+                if self._needs_escalation(screened[i][1], crop):
+                    pending.append(i)
+                else:
+                    results[i] = FontPrediction(*screened[i], TIER_HEURISTIC)
+            self._escalated += len(pending)
+
+        # Each tier only sees the regions every cheaper tier left open
+        for tier, model in ((TIER_RESNET, self._custom), (TIER_PADDLECLAS, self._advanced)):
+            if model is None or not pending:
+                continue
+            tier_results = model.predict_batch([texts[i] for i in pending], [crops[i] for i in pending])
+            for i, result in zip(pending, tier_results):
+                if result:
+                    results[i] = FontPrediction(result[0], result[1], tier)
+            pending = [i for i in pending if results[i] is None]
+
+        unscreened = [i for i in pending if i not in screened]
+        if unscreened:
+            fallback = self._fallback.predict_batch([texts[i] for i in unscreened], [crops[i] for i in unscreened])
+            screened.update(zip(unscreened, fallback))
+        for i in pending:
+            results[i] = FontPrediction(*screened[i], TIER_HEURISTIC)
+
+        for result in results:
+            self._tier_counts[result.tier] += 1  # type: ignore[union-attr]
+        return results  # type: ignore[return-value]
+
+    def _needs_escalation(self, confidence: float, crop: Optional[np.ndarray]) -> bool:
+        if confidence < self._cascade_threshold:
+            return True
+        # Large text (titles) is what readers notice; always give it the best model
+        return bool(self._escalate_height and crop is not None and crop.shape[0] >= self._escalate_height)
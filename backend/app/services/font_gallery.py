@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def gallery_cache_key(fonts: Sequence[Tuple[str, Path]], texts: Sequence[str], model_name: str) -> str:
+    """Identity of a gallery: the font files' contents, the sample texts and the extractor."""
+    digest = hashlib.sha256(model_name.encode("utf-8"))
+    digest.update(json.dumps(list(texts), ensure_ascii=False).encode("utf-8"))
+    for display_name, path in fonts:
+        digest.update(b"\0" + display_name.encode("utf-8") + b"\0")
+        with open(path, "rb") as font_file:
+            for block in iter(lambda: font_file.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()[:24]
+
+
+def load_gallery(cache_dir: Path, key: str) -> Optional[Tuple[List[str], np.ndarray]]:
+    """Return ``(labels, embeddings)`` for ``key``; embeddings are memory-mapped."""
+    labels_path = cache_dir / f"{key}.json"
+    matrix_path = cache_dir / f"{key}.npy"
+    if not labels_path.exists() or not matrix_path.exists():
+        return None
+    try:
+        labels = json.loads(labels_path.read_text(encoding="utf-8"))
+        matrix = np.load(matrix_path, mmap_mode="r")
+    except Exception as exc:  # noqa: BLE001
+        print(f"[FontGallery] Ignoring unreadable gallery cache {key}: {exc}")
+        return None
+    if matrix.ndim != 2 or matrix.shape[0] != len(labels):
+        print(f"[FontGallery] Ignoring inconsistent gallery cache {key}")
+        return None
+    return labels, matrix
+
+
+def save_gallery(cache_dir: Path, key: str, labels: Sequence[str], matrix: np.ndarray) -> None:
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # Matrix first, labels last: labels are what marks the entry complete
+        _atomic_write(cache_dir / f"{key}.npy", lambda out: np.save(out, np.ascontiguousarray(matrix, dtype=np.float32)))
+        _atomic_write(
+            cache_dir / f"{key}.json",
+            lambda out: out.write(json.dumps(list(labels), ensure_ascii=False).encode("utf-8")),
+        )
+    except OSError as exc:
+        print(f"[FontGallery] Failed to write gallery cache {key}: {exc}")
+
+
+class FontGallery:
+    """
+    Font prototypes as one L2-normalised ``(N, D)`` embedding matrix.
+
+    Rows of the same label are kept contiguous and ``label_index`` maps each
+    row to ``labels``; a batch of queries is scored with a single matmul and
+    reduced to the best prototype per label.
+    """
+
+    def __init__(self, row_labels: Sequence[str], matrix: np.ndarray) -> None:
+        labels: List[str] = []
+        index: Dict[str, int] = {}
+        for label in row_labels:
+            if label not in index:
+                index[label] = len(labels)
+                labels.append(label)
+        label_index = np.array([index[label] for label in row_labels], dtype=np.int64)
+        # Rows from ``_build_gallery`` are already grouped; only reorder (and
+        # copy, losing a memory map) when a label's rows are scattered.
+        starts = np.flatnonzero(np.r_[True, label_index[1:] != label_index[:-1]]) if len(label_index) else label_index
+        if len(starts) != len(labels):
+            order = np.argsort(label_index, kind="stable")
+            matrix, label_index = matrix[order], label_index[order]
+            starts = np.flatnonzero(np.r_[True, label_index[1:] != label_index[:-1]])
+        self.labels = [labels[i] for i in label_index[starts]]
+        self.label_index = label_index
+        self.matrix = matrix
+        self._starts = starts
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def search(self, queries: np.ndarray, k: int = 1) -> List[List[Tuple[str, float]]]:
+        """Top-``k`` ``(label, cosine score)`` per row of ``queries`` (normalised, ``(Q, D)``)."""
+        if not self.labels or len(queries) == 0:
+            return [[] for _ in range(len(queries))]
+        scores = np.asarray(queries, dtype=np.float32) @ np.asarray(self.matrix).T
+        per_label = np.maximum.reduceat(scores, self._starts, axis=1)
+        k = min(k, per_label.shape[1])
+        top = np.argsort(-per_label, axis=1)[:, :k]
+        return [
+            [(self.labels[j], float(row[j])) for j in picks]
+            for row, picks in zip(per_label, top)
+        ]
+
+
+def _atomic_write(path: Path, write) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            write(out)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
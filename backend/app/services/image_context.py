@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import io
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import cv2
+import numpy as np
+from PIL import Image
+
+EXIF_ORIENTATION_TAG = 0x0112
+
+
+def exif_orientation(image_bytes: Union[bytes, memoryview]) -> Optional[int]:
+    """The EXIF Orientation tag (1-8), or ``None`` when the upload has none.
+
+    Only the header is parsed; no pixels are decoded.
+    """
+    try:
+        with Image.open(io.BytesIO(image_bytes)) as img:
+            value = img.getexif().get(EXIF_ORIENTATION_TAG)
+    except Exception:  # noqa: BLE001
+        return None
+    return int(value) if value in range(1, 9) else None
+
+
+def apply_orientation(image: np.ndarray, orientation: Optional[int]) -> np.ndarray:
+    """Rotate/flip a decoded image so it displays upright for ``orientation``."""
+    if orientation == 2:
+        return cv2.flip(image, 1)
+    if orientation == 3:
+        return cv2.rotate(image, cv2.ROTATE_180)
+    if orientation == 4:
+        return cv2.flip(image, 0)
+    if orientation == 5:
+        return cv2.transpose(image)
+    if orientation == 6:
+        return cv2.rotate(image, cv2.ROTATE_90_CLOCKWISE)
+    if orientation == 7:
+        return cv2.flip(cv2.transpose(image), -1)
+    if orientation == 8:
+        return cv2.rotate(image, cv2.ROTATE_90_COUNTERCLOCKWISE)
+    return image
+
+
+def decode_oriented(image_bytes: Union[bytes, memoryview]) -> Tuple[np.ndarray, Optional[int]]:
+    """Decode an upload upright; returns the image and its EXIF orientation.
+
+    OpenCV's own EXIF handling differs between versions, so it is disabled
+    and the tag is applied here explicitly.
+    """
+    arr = np.frombuffer(image_bytes, dtype=np.uint8)
+    image = cv2.imdecode(arr, cv2.IMREAD_COLOR | cv2.IMREAD_IGNORE_ORIENTATION)
+    if image is None:
+        raise ValueError("无法解析上传的图像，请确认文件是否为有效的 JPG/PNG。")
+    orientation = exif_orientation(image_bytes)
+    return apply_orientation(image, orientation), orientation
+
+
+def decode_image(image_bytes: Union[bytes, memoryview]) -> np.ndarray:
+    return decode_oriented(image_bytes)[0]
+
+
+@dataclass
+class ImageContext:
+    """Per-request decoded image shared by every pipeline stage.
+
+    The upload is decoded exactly once; OCR, cropping and point-size features
+    all read from ``image`` so no stage pays for a second decode. ``image``
+    is already upright; ``orientation`` is the EXIF tag that was applied
+    (``None`` when the upload carried none).
+    """
+
+    image: np.ndarray
+    orientation: Optional[int] = None
+    # max_side -> (downscaled image, scale factor); see ``working``
+    _working: Dict[int, Tuple[np.ndarray, float]] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_bytes(cls, image_bytes: Union[bytes, memoryview]) -> "ImageContext":
+        image, orientation = decode_oriented(image_bytes)
+        return cls(image=image, orientation=orientation)
+
+    @property
+    def height(self) -> int:
+        return int(self.image.shape[0])
+
+    @property
+    def width(self) -> int:
+        return int(self.image.shape[1])
+
+    def working(self, max_side: int) -> Tuple[np.ndarray, float]:
+        """The image downscaled so its longer side is at most ``max_side``.
+
+        Returns ``(image, scale)`` where working coordinates divided by
+        ``scale`` are full-resolution coordinates. ``max_side <= 0`` or an
+        image already small enough returns the full image with scale 1.0.
+        The resize is computed once per context.
+        """
+        longest = max(self.width, self.height)
+        if max_side <= 0 or longest <= max_side:
+            return self.image, 1.0
+        if max_side not in self._working:
+            scale = max_side / longest
+            size = (max(1, round(self.width * scale)), max(1, round(self.height * scale)))
+            # INTER_AREA averages source pixels, which keeps thin strokes legible
+            self._working[max_side] = (cv2.resize(self.image, size, interpolation=cv2.INTER_AREA), scale)
+        return self._working[max_side]
+
+    def crop(self, bbox: Sequence[Sequence[float]]) -> np.ndarray:
+        """Return a zero-copy view of the axis-aligned region around ``bbox``."""
+        pts = np.array(bbox, dtype=np.float32)
+        x_min = max(int(np.min(pts[:, 0])) - 2, 0)
+        x_max = min(int(np.max(pts[:, 0])) + 2, self.width)
+        y_min = max(int(np.min(pts[:, 1])) - 2, 0)
+        y_max = min(int(np.max(pts[:, 1])) + 2, self.height)
+        crop = self.image[y_min:y_max, x_min:x_max]
+        if crop.size == 0:
+            return self.image
+        return crop
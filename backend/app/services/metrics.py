@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import math
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..schemas.requests import ResultResponse
+from .timings import STAGES
+
+# Prometheus text exposition format, version 0.0.4
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Seconds; spans a cached-font lookup up to a full-resolution OCR on a busy worker
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram with one label, rendered in Prometheus text format.
+
+    A minimal stand-in for ``prometheus_client.Histogram``, which is not a
+    dependency: observations are bucketed per label value under a lock and
+    ``render`` emits the ``_bucket``, ``_sum`` and ``_count`` series.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label: str,
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label = label
+        self.buckets = tuple(sorted(buckets))
+        # label value -> (per-bucket counts incl. +Inf, sum, count)
+        self._series: Dict[str, Tuple[List[int], float, int]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label_value: str, value: float) -> None:
+        with self._lock:
+            counts, total, count = self._series.get(label_value, ([0] * (len(self.buckets) + 1), 0.0, 0))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            else:
+                counts[-1] += 1
+            self._series[label_value] = (counts, total + value, count + 1)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {value: (list(counts), total, count) for value, (counts, total, count) in self._series.items()}
+        for value, (counts, total, count) in series.items():
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, math.inf), counts):
+                cumulative += bucket_count
+                labels = _labels({self.label: value, "le": _format(bound)})
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _labels({self.label: value})
+            lines.append(f"{self.name}_sum{labels} {_format(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+def stage_latency_histogram() -> Histogram:
+    return Histogram(
+        "coverocr_stage_duration_seconds",
+        "Time spent in each inference pipeline stage per request.",
+        label="stage",
+    )
+
+
+def observe_result(histogram: Histogram, result: ResultResponse) -> None:
+    """Record a finished inference: every stage that ran plus the end-to-end ``total``."""
+    if result.timings is not None:
+        for stage in STAGES:
+            ms = getattr(result.timings, f"{stage}_ms")
+            if ms is not None:
+                histogram.observe(stage, ms / 1000)
+    histogram.observe("total", result.elapsed_ms / 1000)
+
+
+def render_metrics(stats: Dict[str, Any], stage_latency: Optional[Histogram] = None) -> str:
+    """Prometheus exposition of ``InferencePipeline.stats()`` and the stage-latency histogram."""
+    lines: List[str] = []
+    if stage_latency is not None:
+        lines.extend(stage_latency.render())
+
+    scheduler = stats.get("scheduler") or {}
+    _gauge(lines, "coverocr_queue_depth", "Jobs waiting for a worker.", scheduler.get("queue_depth"))
+    _gauge(lines, "coverocr_queue_capacity", "Maximum queued jobs before uploads are rejected.",
+           scheduler.get("queue_capacity"))
+    _gauge(lines, "coverocr_workers", "Inference workers.", scheduler.get("workers"))
+    _gauge(lines, "coverocr_busy_workers", "Workers currently running a job.", scheduler.get("busy_workers"))
+    _counter(lines, "coverocr_scheduler_jobs_total", "Jobs by scheduler outcome.", "outcome", {
+        outcome: scheduler.get(outcome) for outcome in ("submitted", "completed", "failed", "rejected")
+    })
+
+    inflight = stats.get("inflight") or {}
+    _gauge(lines, "coverocr_inflight_jobs", "Distinct uploads being processed.", inflight.get("jobs"))
+    _gauge(lines, "coverocr_inflight_waiting_requests", "Duplicate uploads waiting on an in-flight job.",
+           inflight.get("waiting_requests"))
+    _gauge(lines, "coverocr_pending_requests", "Requests accepted but without a result yet.",
+           inflight.get("pending_requests"))
+    _counter(lines, "coverocr_coalesced_requests_total", "Uploads served by an identical in-flight job.",
+             None, {"": inflight.get("coalesced")})
+
+    cache = stats.get("cache")
+    if cache:
+        _counter(lines, "coverocr_result_cache_lookups_total", "Result cache lookups by outcome.", "result", {
+            "memory_hit": cache.get("memory_hits"),
+            "disk_hit": cache.get("disk_hits"),
+            "miss": cache.get("misses"),
+        })
+        _gauge(lines, "coverocr_result_cache_hit_ratio", "Share of result cache lookups that hit.",
+               cache.get("hit_rate"))
+        _gauge(lines, "coverocr_result_cache_entries", "Results held in the memory cache.",
+               cache.get("memory_entries"))
+        _gauge(lines, "coverocr_result_cache_bytes", "Bytes held in the memory cache.", cache.get("memory_bytes"))
+
+    results = stats.get("results")
+    if results:
+        lookups = results.get("hits", 0) + results.get("misses", 0)
+        _gauge(lines, "coverocr_result_store_entries", "Results held for polling clients.", results.get("entries"))
+        _gauge(lines, "coverocr_result_store_hit_ratio", "Share of result polls that found a stored result.",
+               round(results.get("hits", 0) / lookups, 4) if lookups else 0.0)
+
+    # Only models loaded in this process (thread mode); process workers keep their own
+    models = stats.get("models") or {}
+    _gauge(lines, "coverocr_model_load_seconds", "Time taken to load each model.", {
+        name: entry["load_ms"] / 1000 for name, entry in models.items() if entry.get("load_ms") is not None
+    }, label="model")
+    return "\n".join(lines) + "\n"
+
+
+def render_startup(ready: bool, phases_ms: Dict[str, float]) -> str:
+    """Prometheus exposition of the start-up progress reported by ``/readyz``."""
+    lines: List[str] = []
+    _gauge(lines, "coverocr_ready", "Whether models are loaded and warmed up.", int(ready))
+    _gauge(lines, "coverocr_startup_phase_seconds", "Time taken by each start-up phase so far.", {
+        phase: ms / 1000 for phase, ms in phases_ms.items()
+    }, label="phase")
+    return "\n".join(lines) + "\n"
+
+
+def _gauge(lines: List[str], name: str, documentation: str, value: Any, label: Optional[str] = None) -> None:
+    _family(lines, name, documentation, "gauge", label, value if isinstance(value, dict) else {"": value})
+
+
+def _counter(
+    lines: List[str], name: str, documentation: str, label: Optional[str], values: Dict[str, Any]
+) -> None:
+    _family(lines, name, documentation, "counter", label, values)
+
+
+def _family(
+    lines: List[str], name: str, documentation: str, kind: str, label: Optional[str], values: Dict[str, Any]
+) -> None:
+    samples = [(key, value) for key, value in values.items() if value is not None]
+    if not samples:
+        return
+    lines.append(f"# HELP {name} {documentation}")
+    lines.append(f"# TYPE {name} {kind}")
+    for key, value in samples:
+        labels = _labels({label: key}) if label else ""
+        lines.append(f"{name}{labels} {_format(float(value))}")
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    # Label values escape backslash, double quote and newline
+    pairs = (
+        key + '="' + value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+        for key, value in labels.items()
+    )
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(int(value)) if float(value).is_integer() else repr(value)
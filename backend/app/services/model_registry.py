@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class _LoadedModel:
+    model: Any
+    load_ms: float
+    rss_delta_bytes: Optional[int]
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of loaded models, keyed by name.
+
+    Every model is built once per process by its loader and then handed out
+    as a shared instance; concurrent first requests for the same name wait
+    for a single load. Load time and the RSS growth observed while loading
+    are kept per model for ``/stats`` and start-up reporting. Shared models
+    must guard their own inference calls if those are not thread-safe.
+    """
+
+    def __init__(self) -> None:
+        self._models: Dict[str, _LoadedModel] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    def get(self, name: str, loader: Callable[[], T]) -> T:
+        entry = self._models.get(name)
+        if entry is not None:
+            return entry.model
+        with self._guard:
+            lock = self._locks.setdefault(name, threading.Lock())
+        with lock:
+            entry = self._models.get(name)
+            if entry is None:
+                rss_before = _current_rss()
+                start = time.perf_counter()
+                model = loader()
+                load_ms = round((time.perf_counter() - start) * 1000, 1)
+                rss_after = _current_rss()
+                rss_delta = rss_after - rss_before if rss_before is not None and rss_after is not None else None
+                entry = _LoadedModel(model=model, load_ms=load_ms, rss_delta_bytes=rss_delta)
+                self._models[name] = entry
+                print(f"[ModelRegistry] Loaded {name} in {load_ms:.0f} ms")
+        return entry.model
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        stats: Dict[str, Dict[str, Any]] = {}
+        for name, entry in self._models.items():
+            stats[name] = {"load_ms": entry.load_ms, "rss_delta_bytes": entry.rss_delta_bytes}
+            # Models that track their own runtime counters expose them here
+            model_stats = getattr(entry.model, "stats", None)
+            if callable(model_stats):
+                stats[name]["runtime"] = model_stats()
+        return stats
+
+    def clear(self) -> None:
+        """Forget every model (tests, or reloading after a model update)."""
+        with self._guard:
+            self._models.clear()
+            self._locks.clear()
+
+
+def _current_rss() -> Optional[int]:
+    # Resident set size in bytes; /proc is Linux-only, which is what we deploy on
+    try:
+        with open("/proc/self/statm", "rb") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+_registry = ModelRegistry()
+
+
+def get_registry() -> ModelRegistry:
+    return _registry
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+
+# (event name, payload) pairs pushed to stream subscribers
+StreamEvent = Tuple[str, Dict[str, Any]]
+
+
+class ResultNotifier:
+    """
+    Completion events and progress streams for pending requests.
+
+    Backs long-polling (``wait``) and Server-Sent Events (``subscribe``) so
+    clients learn about a finished result as soon as it is stored instead of
+    on their next poll. All methods must be called on the event loop thread.
+    """
+
+    def __init__(self) -> None:
+        self._done: Dict[str, asyncio.Event] = {}
+        self._streams: Dict[str, List[asyncio.Queue[StreamEvent]]] = {}
+        self._stages: Dict[str, str] = {}
+
+    def track(self, request_id: str, like: Optional[str] = None) -> None:
+        """Mark ``request_id`` pending; ``like`` names a running request whose stage it joins at."""
+        self._done.setdefault(request_id, asyncio.Event())
+        stage = self._stages.get(like) if like is not None else None
+        if stage is not None:
+            self._stages[request_id] = stage
+
+    def is_pending(self, request_id: str) -> bool:
+        return request_id in self._done
+
+    def pending_count(self) -> int:
+        return len(self._done)
+
+    def progress(self, request_id: str, stage: str) -> None:
+        if request_id in self._done:
+            self._stages[request_id] = stage
+        self._publish(request_id, ("progress", {"stage": stage}))
+
+    def complete(self, request_id: str) -> None:
+        event = self._done.pop(request_id, None)
+        if event is not None:
+            event.set()
+        self._stages.pop(request_id, None)
+        self._publish(request_id, ("done", {}))
+        self._streams.pop(request_id, None)
+
+    async def wait(self, request_id: str, timeout: float) -> bool:
+        """Wait up to ``timeout`` seconds; ``True`` once the request completed."""
+        event = self._done.get(request_id)
+        if event is None:
+            return True
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def subscribe(self, request_id: str) -> asyncio.Queue[StreamEvent]:
+        queue: asyncio.Queue[StreamEvent] = asyncio.Queue()
+        # Late subscribers start from the stage the request is currently in
+        stage = self._stages.get(request_id)
+        if stage is not None:
+            queue.put_nowait(("progress", {"stage": stage}))
+        self._streams.setdefault(request_id, []).append(queue)
+        return queue
+
+    def unsubscribe(self, request_id: str, queue: asyncio.Queue[StreamEvent]) -> None:
+        queues: Optional[List[asyncio.Queue[StreamEvent]]] = self._streams.get(request_id)
+        if queues and queue in queues:
+            queues.remove(queue)
+            if not queues:
+                self._streams.pop(request_id, None)
+
+    def _publish(self, request_id: str, event: StreamEvent) -> None:
+        for queue in self._streams.get(request_id, []):
+            queue.put_nowait(event)
@@ -1,12 +1,17 @@
 from __future__ import annotations
 
+import threading
 from dataclasses import dataclass
-from typing import List, Sequence
+from typing import Any, Dict, List, Optional, Sequence, Union
 
-import cv2
 import numpy as np
 from paddleocr import PaddleOCR
 
+from ..core.config import get_settings
+from .assets import OCR_MODEL_ROOT, MissingAssetError, has_inference_model, ocr_model_dirs
+from .image_context import ImageContext, decode_image
+from .timings import StageTimer
+
 
 @dataclass
 class OCRTextRegion:
@@ -17,45 +22,126 @@ class OCRTextRegion:
 
 
 class OCRService:
-    """Wrapper around PaddleOCR for detecting and recognizing text regions."""
+    """Wrapper around PaddleOCR for detecting and recognizing text regions.
+
+    The text-angle classifier only matters for lines upside down relative to
+    the image. ``angle_cls`` picks when it runs: ``always``, ``never`` or
+    ``auto``, which trusts uploads whose EXIF orientation was applied at
+    decode and classifies the rest.
+    """
+
+    def __init__(self, lang: str = "ch", angle_cls: Optional[str] = None) -> None:
+        settings = get_settings()
+        self.angle_cls = angle_cls or settings.ocr_angle_cls
+        self._ocr = PaddleOCR(
+            lang=lang, use_angle_cls=self.angle_cls != "never", show_log=False, **self._model_dirs()
+        )
+        self.max_side = settings.ocr_max_side
+        # One instance is shared by all workers of a process; Paddle
+        # predictors are not safe to run concurrently.
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._cls_runs = 0
+        self._stage_ms = {"det": 0.0, "cls": 0.0, "rec": 0.0}
 
-    def __init__(self, lang: str = "ch", use_angle_cls: bool = True) -> None:
-        self._ocr = PaddleOCR(lang=lang, use_angle_cls=use_angle_cls, show_log=False)
+    def parse(
+        self,
+        image: Union[bytes, np.ndarray, ImageContext],
+        max_side: Optional[int] = None,
+        cls: Optional[bool] = None,
+        timer: Optional[StageTimer] = None,
+    ) -> List[OCRTextRegion]:
+        """Detect and recognize text regions.
 
-    def parse(self, image_bytes: bytes) -> List[OCRTextRegion]:
-        image = self._decode_image(image_bytes)
-        result = self._ocr.ocr(image, cls=True)
+        Accepts raw upload bytes, an already-decoded BGR ndarray or an
+        ``ImageContext``; only bytes trigger a decode. Detection and
+        recognition run on a working copy whose longer side is at most
+        ``max_side`` (default ``settings.ocr_max_side``, 0 = full
+        resolution). Boxes are mapped back to full-resolution coordinates and
+        region crops are views into the full-resolution image. ``cls``
+        overrides the angle-classifier policy for this call; ``timer``
+        receives this call's detection, angle-cls and recognition times.
+        """
+        context = self._as_context(image)
+        working, scale = context.working(self.max_side if max_side is None else max_side)
+        use_cls = self.use_angle_cls(context) if cls is None else cls
+        with self._lock:
+            # TextSystem.__call__ rather than .ocr(), which drops the per-stage times
+            dt_boxes, rec_res, elapsed = self._ocr(working, cls=use_cls)
+            self._record(elapsed, use_cls)
+        if timer is not None:
+            for stage, name in (("det", "detection"), ("cls", "angle_cls"), ("rec", "recognition")):
+                if stage != "cls" or use_cls:
+                    timer.add(name, float(elapsed.get(stage, 0.0)) * 1000)
         regions: List[OCRTextRegion] = []
 
-        for line in result:
-            for bbox, (text, score) in line:
-                crop = self._crop_region(image, bbox)
-                regions.append(
-                    OCRTextRegion(
-                        text=text.strip(),
-                        confidence=float(score),
-                        box=bbox,
-                        crop=crop,
-                    )
+        for box, (text, score) in zip(dt_boxes or [], rec_res or []):
+            bbox = np.asarray(box).tolist()
+            if scale != 1.0:
+                bbox = [[x / scale, y / scale] for x, y in bbox]
+            regions.append(
+                OCRTextRegion(
+                    text=text.strip(),
+                    confidence=float(score),
+                    box=bbox,
+                    crop=context.crop(bbox),
                 )
+            )
         return regions
 
+    def use_angle_cls(self, context: ImageContext) -> bool:
+        """Whether the angle classifier runs for this image under the configured policy."""
+        if self.angle_cls == "never":
+            return False
+        if self.angle_cls == "auto":
+            # The camera recorded how it was held and the decode undid it
+            return context.orientation is None
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """Cumulative per-stage OCR time, reported under the model registry in /stats."""
+        calls = self._calls
+        return {
+            "angle_cls": self.angle_cls,
+            "calls": calls,
+            "cls_runs": self._cls_runs,
+            "cls_skipped": calls - self._cls_runs,
+            "avg_det_ms": round(self._stage_ms["det"] / calls, 2) if calls else 0.0,
+            "avg_rec_ms": round(self._stage_ms["rec"] / calls, 2) if calls else 0.0,
+            # Averaged over the calls that ran it, i.e. what skipping saves per image
+            "avg_cls_ms": round(self._stage_ms["cls"] / self._cls_runs, 2) if self._cls_runs else 0.0,
+        }
+
+    def _record(self, elapsed: Dict[str, float], cls: bool) -> None:
+        self._calls += 1
+        self._cls_runs += int(cls)
+        for stage in ("det", "cls", "rec") if cls else ("det", "rec"):
+            self._stage_ms[stage] += float(elapsed.get(stage, 0.0)) * 1000
+
+    @staticmethod
+    def _model_dirs() -> Dict[str, str]:
+        # Prefer provisioned models; otherwise PaddleOCR downloads into ~/.paddleocr
+        dirs = ocr_model_dirs(OCR_MODEL_ROOT)
+        if all(has_inference_model(path) for path in dirs.values()):
+            return {name: str(path) for name, path in dirs.items()}
+        if get_settings().offline_mode:
+            raise MissingAssetError(
+                f"PaddleOCR models not found under {OCR_MODEL_ROOT}; run scripts/provision_assets.py"
+            )
+        return {}
+
+    @staticmethod
+    def _as_context(image: Union[bytes, np.ndarray, ImageContext]) -> ImageContext:
+        if isinstance(image, ImageContext):
+            return image
+        if isinstance(image, np.ndarray):
+            return ImageContext(image=image)
+        return ImageContext.from_bytes(image)
+
     @staticmethod
     def _decode_image(image_bytes: bytes) -> np.ndarray:
-        arr = np.frombuffer(image_bytes, dtype=np.uint8)
-        image = cv2.imdecode(arr, cv2.IMREAD_COLOR)
-        if image is None:
-            raise ValueError("无法解析上传的图像，请确认文件是否为有效的 JPG/PNG。")
-        return image
+        return decode_image(image_bytes)
 
     @staticmethod
     def _crop_region(image: np.ndarray, bbox: Sequence[Sequence[float]]) -> np.ndarray:
-        pts = np.array(bbox, dtype=np.float32)
-        x_min = max(int(np.min(pts[:, 0])) - 2, 0)
-        x_max = min(int(np.max(pts[:, 0])) + 2, image.shape[1])
-        y_min = max(int(np.min(pts[:, 1])) - 2, 0)
-        y_max = min(int(np.max(pts[:, 1])) + 2, image.shape[0])
-        crop = image[y_min:y_max, x_min:x_max]
-        if crop.size == 0:
-            return image
-        return crop
+        return ImageContext(image=image).crop(bbox)
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+# onnxruntime is optional; the Paddle and sklearn backends work without it
+try:
+    import onnxruntime as ort
+
+    ONNXRUNTIME_AVAILABLE = True
+except Exception:  # noqa: BLE001
+    ort = None
+    ONNXRUNTIME_AVAILABLE = False
+
+
+def create_onnx_session(path: Path, intra_op_threads: int = 2, inter_op_threads: int = 1) -> Any:
+    """A CPU ``onnxruntime.InferenceSession`` with explicit thread pools.
+
+    Raises ``RuntimeError`` when onnxruntime is not installed so callers can
+    fall back to another backend.
+    """
+    if not ONNXRUNTIME_AVAILABLE:
+        raise RuntimeError("onnxruntime is not installed (pip install onnxruntime)")
+    options = ort.SessionOptions()
+    options.intra_op_num_threads = max(1, intra_op_threads)
+    options.inter_op_num_threads = max(1, inter_op_threads)
+    options.execution_mode = (
+        ort.ExecutionMode.ORT_PARALLEL if inter_op_threads > 1 else ort.ExecutionMode.ORT_SEQUENTIAL
+    )
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    return ort.InferenceSession(str(path), sess_options=options, providers=["CPUExecutionProvider"])
@@ -1,132 +1,501 @@
 from __future__ import annotations
 
 import asyncio
-import statistics
+import threading
 import time
 import uuid
-from typing import Dict, Optional
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, BinaryIO, Dict, List, Optional, Sequence, Set
 
 from fastapi import UploadFile
 
-from ..schemas.requests import FontSummary, RecognizedText, ResultResponse
-from .font_classifier import FontClassifier
-from .ocr_service import OCRService
-from .typography import TypographyEstimator
-from ..data_processing.normalizer import DataNormalizer
+from ..core.config import Settings, get_settings
+from ..schemas.requests import (
+    BatchItem,
+    BatchItemStatus,
+    BatchStatusResponse,
+    BatchUploadResponse,
+    ResultResponse,
+)
+from .batch import BatchSource, read_sources
+from .engine import InferenceEngine
+from .execution import InferenceExecutor, ProcessExecutor, ThreadExecutor
+from .metrics import observe_result, render_metrics, stage_latency_histogram
+from .model_registry import get_registry
+from .notifier import ResultNotifier, StreamEvent
+from .result_cache import ResultCache, content_key, model_fingerprint
+from .result_store import InMemoryResultStore, ResultExpiredError, ResultStore
+from .scheduler import (
+    InferenceBatch,
+    InferenceJob,
+    InferenceScheduler,
+    QueuedWork,
+    SchedulerClosedError,
+    SchedulerError,
+)
+from .warmup import sample_cover
 
 
 class InferencePipeline:
-    """Runs OCR + heuristic font recognition pipeline."""
+    """Runs OCR + heuristic font recognition pipeline on a bounded worker pool."""
 
-    def __init__(self) -> None:
-        self._results: Dict[str, ResultResponse] = {}
-        self._ocr_service = OCRService()
-        self._font_classifier = FontClassifier()
-        self._typography_estimator = TypographyEstimator()
-        self._normalizer = DataNormalizer()
+    def __init__(self, settings: Optional[Settings] = None, result_store: Optional[ResultStore] = None) -> None:
+        self._settings = settings or get_settings()
+        self._results: ResultStore = result_store or InMemoryResultStore(
+            ttl_s=self._settings.result_ttl_s,
+            max_entries=self._settings.result_store_max_entries,
+            max_bytes=self._settings.result_store_max_bytes,
+        )
+        worker_count = max(1, self._settings.inference_workers)
+        self._executor: InferenceExecutor
+        if self._settings.execution_mode == "process":
+            self._executor = ProcessExecutor(processes=worker_count)
+        else:
+            self._executor = ThreadExecutor(workers=worker_count)
+        # The serving precision changes results as much as the weights do
+        self._model_version = model_fingerprint(
+            extra=(
+                f"{self._settings.model_version}|font={self._settings.font_backend}/{self._settings.font_precision}"
+                f"|point_size={self._settings.point_size_backend}"
+                f"|ocr={self._settings.ocr_max_side}/{self._settings.ocr_angle_cls}"
+                f"|cascade={self._settings.font_cascade}/{self._settings.font_cascade_threshold}"
+                f"/{self._settings.font_cascade_escalate_height}"
+            )
+        )
+        self._cache: Optional[ResultCache] = None
+        if self._settings.result_cache_enabled:
+            cache_dir = self._settings.result_cache_dir
+            self._cache = ResultCache(
+                model_version=self._model_version,
+                max_bytes=self._settings.result_cache_max_bytes,
+                max_entries=self._settings.result_cache_max_entries,
+                ttl_s=self._settings.result_cache_ttl_s,
+                disk_dir=Path(cache_dir) if cache_dir else None,
+            )
+        # content key -> request ids waiting on the job already running for it
+        self._inflight: Dict[str, List[str]] = {}
+        # content key -> request id of the job running for it
+        self._leaders: Dict[str, str] = {}
+        self._coalesced = 0
+        self._notifier = ResultNotifier()
+        # Fed from the timings every worker returns, so it covers process mode too
+        self._stage_latency = stage_latency_histogram()
+        # batch id -> its items, oldest first; bounded by ``batch_history``
+        self._batches: "OrderedDict[str, List[BatchItem]]" = OrderedDict()
+        # Background tasks still reading batch uploads into the scheduler
+        self._feeders: Set["asyncio.Task[None]"] = set()
+        self._scheduler = InferenceScheduler(
+            self._handle_job,
+            workers=worker_count,
+            max_queue=self._settings.inference_queue_size,
+        )
 
     async def enqueue(self, file: UploadFile, book_size: str = "16k") -> str:
+        """Queue an upload; raises ``QueueFullError`` when the pool is saturated.
+
+        Uploads whose bytes, ``book_size`` and model version match a cached
+        result are answered immediately without running inference; identical
+        uploads arriving while one is still running attach to that job.
+        """
+        start = time.perf_counter()
         request_id = str(uuid.uuid4())
         contents = await file.read()
-        asyncio.create_task(self._process(request_id, contents, book_size))
+        job = await self._admit(request_id, contents, book_size, start)
+        if job is not None:
+            try:
+                self._scheduler.submit(job)
+            except SchedulerError:
+                self._abandon([job])
+                raise
         return request_id
 
-    async def _process(self, request_id: str, payload: bytes, book_size: str) -> None:
+    async def enqueue_batch(
+        self, sources: Sequence[BatchSource], book_size: str = "16k", files: Sequence[BinaryIO] = ()
+    ) -> BatchUploadResponse:
+        """Register a batch and feed it to the scheduler in the background.
+
+        Every item has its request id and is pending before this returns, so
+        ``batch_status`` shows progress from the start. A background task
+        then reads the images one at a time and queues them in chunks of
+        ``batch_chunk_size``, waiting for free queue slots instead of
+        rejecting. ``files`` are the upload files the sources read from;
+        the feeder closes them once it is done.
+        """
+        if self._scheduler.closed:
+            for file in files:
+                file.close()
+            raise SchedulerClosedError("Inference service is shutting down", self._scheduler.retry_after())
+
+        batch_id = str(uuid.uuid4())
+        items = [BatchItem(filename=filename, request_id=str(uuid.uuid4())) for filename, _ in sources]
+        for item in items:
+            self._notifier.track(item.request_id)
+        self._batches[batch_id] = items
+        while len(self._batches) > max(1, self._settings.batch_history):
+            self._batches.popitem(last=False)
+
+        feeder = asyncio.get_running_loop().create_task(self._feed_batch(batch_id, sources, items, book_size, files))
+        self._feeders.add(feeder)
+        feeder.add_done_callback(self._feeders.discard)
+        return BatchUploadResponse(batch_id=batch_id, items=items)
+
+    async def _feed_batch(
+        self,
+        batch_id: str,
+        sources: Sequence[BatchSource],
+        items: Sequence[BatchItem],
+        book_size: str,
+        files: Sequence[BinaryIO],
+    ) -> None:
+        chunk: List[InferenceJob] = []
+        chunk_size = max(1, self._settings.batch_chunk_size)
+        admitted = 0
+        try:
+            async for _, contents in read_sources(sources):
+                job = await self._admit(items[admitted].request_id, contents, book_size, time.perf_counter())
+                admitted += 1
+                if job is None:
+                    continue
+                chunk.append(job)
+                if len(chunk) >= chunk_size:
+                    await self._scheduler.put(InferenceBatch(request_id=f"{batch_id}:{admitted}", jobs=chunk))
+                    chunk = []
+            if chunk:
+                await self._scheduler.put(InferenceBatch(request_id=f"{batch_id}:{admitted}", jobs=chunk))
+                chunk = []
+        except BaseException as exc:
+            print(f"[InferencePipeline] Batch {batch_id} stopped after {admitted}/{len(items)} items: {exc!r}")
+            # Nothing will run for these; fail them so clients stop waiting
+            unqueued = [job.request_id for job in chunk] + [item.request_id for item in items[admitted:]]
+            for request_id in unqueued:
+                self._results.put(request_id, _failed_result(request_id, 0))
+            self._abandon(chunk)
+            for item in items[admitted:]:
+                self._notifier.complete(item.request_id)
+            if not isinstance(exc, Exception):
+                raise
+        finally:
+            for file in files:
+                file.close()
+
+    def batch_status(self, batch_id: str) -> Optional[BatchStatusResponse]:
+        items = self._batches.get(batch_id)
+        if items is None:
+            return None
+        statuses = [BatchItemStatus(**item.model_dump(), status=self._status(item.request_id)) for item in items]
+        counts = {name: sum(1 for item in statuses if item.status == name) for name in ("done", "pending", "expired")}
+        return BatchStatusResponse(
+            batch_id=batch_id,
+            total=len(statuses),
+            completed=counts["done"],
+            pending=counts["pending"],
+            expired=counts["expired"],
+            items=statuses,
+        )
+
+    def _status(self, request_id: str) -> str:
+        if self._notifier.is_pending(request_id):
+            return "pending"
+        try:
+            return "done" if self._results.get(request_id) is not None else "expired"
+        except ResultExpiredError:
+            return "expired"
+
+    async def _admit(
+        self, request_id: str, contents: bytes, book_size: str, start: float
+    ) -> Optional[InferenceJob]:
+        """Answer from the cache or attach to a running job; else return a job to queue."""
+        # Hashing a large upload and reading the disk cache stay off the event loop
+        key = await asyncio.to_thread(content_key, contents, book_size, self._model_version)
+
+        if self._cache is not None:
+            cached = await self._cache.get_async(key)
+            if cached is not None:
+                self._results.put(
+                    request_id,
+                    cached.model_copy(
+                        update={
+                            "request_id": request_id,
+                            "elapsed_ms": int((time.perf_counter() - start) * 1000),
+                            # No pipeline stage ran for this request
+                            "timings": None,
+                        }
+                    ),
+                )
+                # Batch items are tracked before they are admitted
+                self._notifier.complete(request_id)
+                return None
+
+        if self._settings.coalesce_inflight and key in self._inflight:
+            self._inflight[key].append(request_id)
+            # Admission can yield to the loop, so the shared job may be mid-run already
+            self._notifier.track(request_id, like=self._leaders.get(key))
+            self._coalesced += 1
+            return None
+
+        self._notifier.track(request_id)
+        if self._settings.coalesce_inflight:
+            self._inflight[key] = []
+            self._leaders[key] = request_id
+        return InferenceJob(request_id=request_id, payload=contents, book_size=book_size, content_key=key)
+
+    def _abandon(self, jobs: Sequence[InferenceJob]) -> None:
+        # Jobs that never reached the queue: forget them, fail anyone attached
+        for job in jobs:
+            self._notifier.complete(job.request_id)
+            self._leaders.pop(job.content_key or "", None)
+            for follower_id in self._inflight.pop(job.content_key or "", []):
+                self._results.put(follower_id, _failed_result(follower_id, 0))
+                self._notifier.complete(follower_id)
+
+    async def _handle_job(self, worker_index: int, job: QueuedWork) -> None:
+        if isinstance(job, InferenceBatch):
+            await self._process_batch(worker_index, job.jobs)
+            return
+        await self._process(job.request_id, job.payload, job.book_size, worker_index, job.content_key)
+
+    async def _process(
+        self,
+        request_id: str,
+        payload: bytes,
+        book_size: str,
+        worker_index: int = 0,
+        key: Optional[str] = None,
+    ) -> None:
         start = time.perf_counter()
+        failed = False
+
+        def on_stage(stage: str) -> None:
+            for waiting_id in [request_id, *self._inflight.get(key or "", [])]:
+                self._notifier.progress(waiting_id, stage)
+
         try:
-            result = await asyncio.to_thread(self._run_pipeline, request_id, payload, book_size, start)
-            self._results[request_id] = result
+            on_stage("started")
+            result = await self._executor.run(worker_index, request_id, payload, book_size, on_stage)
         except Exception as exc:  # noqa: BLE001
-            self._results[request_id] = ResultResponse(
-                request_id=request_id,
-                texts=[],
-                fonts_summary=[],
-                elapsed_ms=int((time.perf_counter() - start) * 1000),
-            )
+            failed = True
+            result = _failed_result(request_id, int((time.perf_counter() - start) * 1000))
             # Log the error for debugging
             print(f"Inference failed for {request_id}: {exc}")
 
-    def _run_pipeline(self, request_id: str, payload: bytes, book_size: str, start: float) -> ResultResponse:
-        # Decode image to get dimensions
-        # OCRService._decode_image is static, we can use it or just rely on the fact that 
-        # OCRService.parse does it. But we need dimensions here.
-        # Let's decode it once.
-        image = self._ocr_service._decode_image(payload)
-        image_height, image_width = image.shape[:2]
-        
-        regions = self._ocr_service.parse(payload)
-        texts: list[RecognizedText] = []
-        font_scores: Dict[str, list[float]] = {}
-        
-        # Find anchor (book title) for ML model
-        anchor_height = None
-        for region in regions:
-            if '人工智能' in region.text or '机器学习' in region.text:
-                y_coords = [p[1] for p in region.box]
-                anchor_height = max(y_coords) - min(y_coords)
-                break
-
-        for region in regions:
-            # Preprocessing: Normalize crop before passing to estimator (simulating ML pipeline input)
-            # Note: We perform normalization to satisfy the requirement, but we MUST pass the 
-            # RAW crop (region.crop) to the TypographyEstimator because PaddleClas expects 0-255 uint8.
-            # Passing the normalized 0-1 float array causes it to see "black" images.
-            _ = self._normalizer.normalize_image(region.crop)
-            
-            # Estimate typography using RAW crop and dynamic DPI
-            typo_result = self._typography_estimator.estimate(
-                text=region.text,
-                crop=region.crop,
-                box=region.box,
-                image_width=image_width,
-                book_size=book_size,
-                anchor_height=anchor_height,  # Pass anchor for ML model
-            )
-            
-            # Format: 【小四，宋体，固定值 22 磅】
-            formatted = f"【{typo_result.font_size_name}，{typo_result.font_family}，固定值 {typo_result.point_size} 磅】"
-
-            texts.append(
-                RecognizedText(
-                    content=region.text,
-                    font=typo_result.font_family,
-                    font_size_name=typo_result.font_size_name,
-                    point_size=typo_result.point_size,
-                    formatted_typography=formatted,
-                    confidence=round(region.confidence, 4),
-                    font_confidence=typo_result.confidence,
-                )
-            )
-            if typo_result.font_family not in font_scores:
-                font_scores[typo_result.font_family] = []
-            font_scores[typo_result.font_family].append(typo_result.confidence)
-
-        fonts_summary = [
-            FontSummary(
-                font=font,
-                occurrences=len(scores),
-                avg_confidence=round(statistics.mean(scores), 4),
-            )
-            for font, scores in font_scores.items()
-        ]
+        await self._finish(request_id, key, result, failed)
+
+    async def _process_batch(self, worker_index: int, jobs: List[InferenceJob]) -> None:
+        start = time.perf_counter()
+
+        def on_stage(stage: str) -> None:
+            for job in jobs:
+                for waiting_id in [job.request_id, *self._inflight.get(job.content_key or "", [])]:
+                    self._notifier.progress(waiting_id, stage)
+
+        items = [(job.request_id, job.payload, job.book_size) for job in jobs]
+        results: List[Optional[ResultResponse]]
+        try:
+            on_stage("started")
+            results = await self._executor.run_batch(worker_index, items, on_stage)
+        except Exception as exc:  # noqa: BLE001
+            print(f"Inference failed for batch of {len(jobs)}: {exc}")
+            results = [None] * len(jobs)
 
         elapsed_ms = int((time.perf_counter() - start) * 1000)
-        return ResultResponse(
-            request_id=request_id,
-            texts=texts,
-            fonts_summary=fonts_summary,
-            elapsed_ms=elapsed_ms,
+        for job, result in zip(jobs, results):
+            if result is None:
+                await self._finish(job.request_id, job.content_key, _failed_result(job.request_id, elapsed_ms), True)
+            else:
+                await self._finish(job.request_id, job.content_key, result, False)
+
+    async def _finish(self, request_id: str, key: Optional[str], result: ResultResponse, failed: bool) -> None:
+        self._results.put(request_id, result)
+        self._notifier.complete(request_id)
+        if not failed:
+            observe_result(self._stage_latency, result)
+        if key is None:
+            return
+        self._leaders.pop(key, None)
+        for follower_id in self._inflight.pop(key, []):
+            # Followers waited on the leader's run; its stage timings are not theirs
+            self._results.put(follower_id, result.model_copy(update={"request_id": follower_id, "timings": None}))
+            self._notifier.complete(follower_id)
+        # Failures are stored for the client but never cached; clients are
+        # answered before the disk tier is written on a worker thread
+        if not failed and self._cache is not None:
+            await self._cache.put_async(key, result)
+
+    @property
+    def _engines(self) -> List[InferenceEngine]:
+        # In-process engines (thread mode only); process mode keeps them in the workers
+        return getattr(self._executor, "engines", [])
+
+    def _run_pipeline(self, request_id: str, payload: bytes, book_size: str, start: float) -> ResultResponse:
+        return self._engines[0].run(request_id, payload, book_size, start)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "execution_mode": self._settings.execution_mode,
+            "scheduler": self._scheduler.stats(),
+            "results": self._results.stats(),
+            "cache": self._cache.stats() if self._cache is not None else None,
+            # Models loaded in this process (thread mode); process workers keep their own
+            "models": get_registry().stats(),
+            "inflight": {
+                "jobs": len(self._inflight),
+                "waiting_requests": sum(len(ids) for ids in self._inflight.values()),
+                "coalesced": self._coalesced,
+                "pending_requests": self._notifier.pending_count(),
+            },
+        }
+
+    def metrics(self) -> str:
+        """``stats()`` plus the per-stage latency histogram in Prometheus text format."""
+        return render_metrics(self.stats(), self._stage_latency)
+
+    async def warm_up(self) -> None:
+        """Run the built-in sample through every worker's models once.
+
+        First calls pay for lazy initialisation (PaddleOCR predictors, paddle
+        kernels, the point-size model), so doing it here keeps that cost off
+        the first real upload. Results are discarded, not stored or cached.
+        """
+        payload = sample_cover()
+        await asyncio.gather(
+            *(
+                self._executor.run(index, f"warmup-{index}", payload, "16k")
+                for index in range(self._scheduler.worker_count)
+            )
         )
 
-    async def get_result(self, request_id: str) -> Optional[ResultResponse]:
-        return self._results.get(request_id)
+    async def shutdown(self) -> None:
+        """Stop accepting uploads and drain queued and in-flight jobs."""
+        # Batches still being read were accepted; let them reach the queue first
+        if self._feeders:
+            _, unfinished = await asyncio.wait(self._feeders, timeout=self._settings.shutdown_drain_timeout_s)
+            for feeder in unfinished:
+                feeder.cancel()
+            await asyncio.gather(*unfinished, return_exceptions=True)
+        await self._scheduler.shutdown(timeout=self._settings.shutdown_drain_timeout_s)
+        await asyncio.to_thread(self._executor.shutdown)
+
+    async def get_result(self, request_id: str, wait: float = 0.0) -> Optional[ResultResponse]:
+        """Return the result, ``None`` while not ready, or raise ``ResultExpiredError``.
+
+        With ``wait`` > 0 a pending request is long-polled for up to that many
+        seconds and returned the moment it completes.
+        """
+        result = self._results.get(request_id)
+        if result is None and wait > 0 and self._notifier.is_pending(request_id):
+            await self._notifier.wait(request_id, wait)
+            result = self._results.get(request_id)
+        return result
+
+    def is_pending(self, request_id: str) -> bool:
+        return self._notifier.is_pending(request_id)
+
+    async def stream_events(
+        self, request_id: str, heartbeat: Optional[float] = None
+    ) -> AsyncIterator[StreamEvent]:
+        """Yield ``progress`` events while pending, then one ``result`` event.
+
+        A ``heartbeat`` event is yielded after ``heartbeat`` idle seconds.
+        Raises ``ResultExpiredError`` if the result is already gone before
+        streaming starts; if it expires while the client is streaming, the
+        stream ends with an ``expired`` event instead. Yields nothing for
+        unknown request ids.
+        """
+        if not self._notifier.is_pending(request_id):
+            result = self._results.get(request_id)
+            if result is not None:
+                yield "result", result.model_dump()
+            return
+
+        queue = self._notifier.subscribe(request_id)
+        try:
+            while True:
+                try:
+                    name, data = await asyncio.wait_for(queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield "heartbeat", {}
+                    continue
+                if name == "done":
+                    break
+                yield name, data
+        finally:
+            self._notifier.unsubscribe(request_id, queue)
+        # Headers are already sent; a terminal event is all the client can get
+        try:
+            result = self._results.get(request_id)
+        except ResultExpiredError:
+            yield "expired", {"request_id": request_id}
+            return
+        if result is not None:
+            yield "result", result.model_dump()
+
+
+def _failed_result(request_id: str, elapsed_ms: int) -> ResultResponse:
+    return ResultResponse(request_id=request_id, texts=[], fonts_summary=[], elapsed_ms=elapsed_ms)
+
+
+@dataclass
+class StartupStatus:
+    """Progress of the start-up warm-up, as reported by ``/readyz``."""
+
+    ready: bool = False
+    phases_ms: Dict[str, float] = field(default_factory=dict)
+    error: Optional[str] = None
 
 
 _pipeline: Optional[InferencePipeline] = None
+_pipeline_lock = threading.Lock()
+_startup = StartupStatus()
 
 
 def get_pipeline() -> InferencePipeline:
     global _pipeline
     if _pipeline is None:
-        _pipeline = InferencePipeline()
+        # Sync dependencies run in a threadpool; only one thread may build
+        with _pipeline_lock:
+            if _pipeline is None:
+                _pipeline = InferencePipeline()
+    return _pipeline
+
+
+def current_pipeline() -> Optional[InferencePipeline]:
+    """The process-wide pipeline if it has been built; unlike ``get_pipeline``, never builds it."""
     return _pipeline
+
+
+def startup_status() -> StartupStatus:
+    return _startup
+
+
+async def startup_pipeline(warm_up: bool = True) -> StartupStatus:
+    """Build the process-wide pipeline, warm it up, then mark the service ready."""
+    try:
+        start = time.perf_counter()
+        pipeline = await asyncio.to_thread(get_pipeline)
+        _startup.phases_ms["build_pipeline"] = round((time.perf_counter() - start) * 1000, 1)
+        engines = pipeline._engines
+        if engines:
+            for name, elapsed in engines[0].load_ms.items():
+                _startup.phases_ms[f"load_{name}"] = elapsed
+
+        if warm_up:
+            start = time.perf_counter()
+            await pipeline.warm_up()
+            _startup.phases_ms["warmup"] = round((time.perf_counter() - start) * 1000, 1)
+    except Exception as exc:  # noqa: BLE001
+        _startup.error = f"{type(exc).__name__}: {exc}"
+        print(f"[Startup] Failed: {_startup.error}")
+        return _startup
+
+    _startup.ready = True
+    phases = ", ".join(f"{name}={elapsed:.0f}ms" for name, elapsed in _startup.phases_ms.items())
+    print(f"[Startup] Ready ({phases})")
+    return _startup
+
+
+async def shutdown_pipeline() -> None:
+    """Drain the process-wide pipeline, if one was ever built."""
+    if _pipeline is not None:
+        await _pipeline.shutdown()
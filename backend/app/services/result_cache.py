@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from ..schemas.requests import ResultResponse
+from .result_store import InMemoryResultStore
+
+# Files whose contents change what the pipeline returns for the same upload
+MODEL_ARTIFACTS = (
+    Path("models/custom_font_classifier/font_resnet18.pdparams"),
+    Path("models/custom_font_classifier/class_mapping.json"),
+    Path("models/custom_font_classifier/inference/font_resnet18.pdiparams"),
+    Path("models/custom_font_classifier/inference_int8/font_resnet18.pdiparams"),
+    Path("models/custom_font_classifier/onnx/font_resnet18.onnx"),
+    Path("models/point_size_model/xgboost_model.pkl"),
+    Path("models/point_size_model/point_size.onnx"),
+)
+
+
+def model_fingerprint(artifacts: Iterable[Path] = MODEL_ARTIFACTS, extra: str = "") -> str:
+    """Cheap version tag for the deployed models (library versions + file stats)."""
+    try:
+        import paddleocr
+
+        parts = [f"paddleocr={getattr(paddleocr, '__version__', '?')}"]
+    except Exception:  # noqa: BLE001
+        parts = ["paddleocr=?"]
+    for path in artifacts:
+        try:
+            stat = path.stat()
+            parts.append(f"{path.name}:{stat.st_size}:{int(stat.st_mtime)}")
+        except OSError:
+            parts.append(f"{path.name}:missing")
+    if extra:
+        parts.append(extra)
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def content_key(payload: bytes, book_size: str, model_version: str) -> str:
+    """Identity of an inference request: same key, same result."""
+    digest = hashlib.sha256(payload)
+    digest.update(b"\0" + book_size.encode("utf-8") + b"\0" + model_version.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Content-addressed cache of finished results.
+
+    Keys hash the upload bytes together with ``book_size`` and the model
+    version, so a re-upload of the same photo is answered without inference.
+    A byte-bounded memory tier sits in front of an optional JSON-on-disk tier.
+    The ``async`` variants serve the event loop: they touch the disk tier on
+    a worker thread so a slow disk never stalls other requests.
+    """
+
+    def __init__(
+        self,
+        model_version: str,
+        max_bytes: int = 32 * 1024 * 1024,
+        max_entries: int = 10_000,
+        ttl_s: float = 24 * 3600.0,
+        disk_dir: Optional[Path] = None,
+    ) -> None:
+        self.model_version = model_version
+        self._memory = InMemoryResultStore(
+            ttl_s=ttl_s, max_entries=max_entries, max_bytes=max_bytes, max_tombstones=0
+        )
+        self._disk_dir = disk_dir
+        if disk_dir is not None:
+            disk_dir.mkdir(parents=True, exist_ok=True)
+        self._memory_hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+
+    def key(self, payload: bytes, book_size: str) -> str:
+        return content_key(payload, book_size, self.model_version)
+
+    def get(self, key: str) -> Optional[ResultResponse]:
+        result = self._get_memory(key)
+        if result is not None:
+            return result
+        return self._promote(key, self._read_disk(key))
+
+    async def get_async(self, key: str) -> Optional[ResultResponse]:
+        result = self._get_memory(key)
+        if result is not None:
+            return result
+        disk = await asyncio.to_thread(self._read_disk, key) if self._disk_dir is not None else None
+        return self._promote(key, disk)
+
+    def put(self, key: str, result: ResultResponse) -> None:
+        self._memory.put(key, result)
+        self._write_disk(key, result)
+
+    async def put_async(self, key: str, result: ResultResponse) -> None:
+        self._memory.put(key, result)
+        if self._disk_dir is not None:
+            await asyncio.to_thread(self._write_disk, key, result)
+
+    def _get_memory(self, key: str) -> Optional[ResultResponse]:
+        result = self._memory.get(key)
+        if result is not None:
+            self._memory_hits += 1
+        return result
+
+    def _promote(self, key: str, result: Optional[ResultResponse]) -> Optional[ResultResponse]:
+        # Count a disk-tier lookup and keep hits in memory for next time
+        if result is None:
+            self._misses += 1
+            return None
+        self._disk_hits += 1
+        self._memory.put(key, result)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._memory_hits + self._disk_hits + self._misses
+        memory = self._memory.stats()
+        return {
+            "model_version": self.model_version,
+            "memory_hits": self._memory_hits,
+            "disk_hits": self._disk_hits,
+            "misses": self._misses,
+            "hit_rate": round((self._memory_hits + self._disk_hits) / lookups, 4) if lookups else 0.0,
+            "memory_entries": memory["entries"],
+            "memory_bytes": memory["bytes"],
+            "memory_max_bytes": memory["max_bytes"],
+            "disk_enabled": self._disk_dir is not None,
+        }
+
+    def _disk_path(self, key: str) -> Path:
+        assert self._disk_dir is not None
+        return self._disk_dir / key[:2] / f"{key}.json"
+
+    def _read_disk(self, key: str) -> Optional[ResultResponse]:
+        if self._disk_dir is None:
+            return None
+        path = self._disk_path(key)
+        if not path.exists():
+            return None
+        try:
+            return ResultResponse.model_validate_json(path.read_text(encoding="utf-8"))
+        except Exception as exc:  # noqa: BLE001
+            print(f"[ResultCache] Ignoring unreadable cache entry {path}: {exc}")
+            return None
+
+    def _write_disk(self, key: str, result: ResultResponse) -> None:
+        if self._disk_dir is None:
+            return
+        path = self._disk_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write-then-rename so concurrent readers never see a partial file
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as out:
+                out.write(result.model_dump_json())
+            os.replace(tmp, path)
+        except OSError as exc:
+            print(f"[ResultCache] Failed to write cache entry {path}: {exc}")
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from ..schemas.requests import ResultResponse
+
+
+class ResultExpiredError(LookupError):
+    """Raised when a result existed but was dropped by TTL or eviction."""
+
+
+class ResultStore(ABC):
+    """Where finished results wait for clients to pick them up."""
+
+    @abstractmethod
+    def put(self, request_id: str, result: ResultResponse) -> None:
+        ...
+
+    @abstractmethod
+    def get(self, request_id: str) -> Optional[ResultResponse]:
+        """Return the result, ``None`` if unknown, or raise ``ResultExpiredError``."""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        ...
+
+
+@dataclass
+class _Entry:
+    result: ResultResponse
+    size: int
+    expires_at: float
+
+
+class InMemoryResultStore(ResultStore):
+    """
+    LRU result store bounded by entry count and approximate bytes, with TTL.
+
+    Dropped request ids are remembered (bounded) so lookups can report
+    "expired" rather than "not ready yet".
+    """
+
+    def __init__(
+        self,
+        ttl_s: float = 3600.0,
+        max_entries: int = 1000,
+        max_bytes: int = 64 * 1024 * 1024,
+        clock: Callable[[], float] = time.monotonic,
+        max_tombstones: Optional[int] = None,
+    ) -> None:
+        self._ttl_s = ttl_s
+        self._max_entries = max(1, max_entries)
+        # Dropped ids are cheap to remember; default to a few times the live budget
+        self._max_tombstones = self._max_entries * 4 if max_tombstones is None else max_tombstones
+        self._max_bytes = max(1, max_bytes)
+        self._clock = clock
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._dropped: "OrderedDict[str, None]" = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._expired = 0
+        self._evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def put(self, request_id: str, result: ResultResponse) -> None:
+        size = len(result.model_dump_json())
+        if request_id in self._entries:
+            self._remove(request_id)
+        self._dropped.pop(request_id, None)
+        self._entries[request_id] = _Entry(result=result, size=size, expires_at=self._clock() + self._ttl_s)
+        self._bytes += size
+        self._purge_expired()
+        while len(self._entries) > self._max_entries or (self._bytes > self._max_bytes and len(self._entries) > 1):
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self._evicted += 1
+
+    def get(self, request_id: str) -> Optional[ResultResponse]:
+        entry = self._entries.get(request_id)
+        if entry is not None and entry.expires_at <= self._clock():
+            self._drop(request_id)
+            self._expired += 1
+            entry = None
+        if entry is None:
+            self._misses += 1
+            if request_id in self._dropped:
+                raise ResultExpiredError(request_id)
+            return None
+        self._entries.move_to_end(request_id)
+        self._hits += 1
+        return entry.result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self._max_entries,
+            "max_bytes": self._max_bytes,
+            "ttl_s": self._ttl_s,
+            "hits": self._hits,
+            "misses": self._misses,
+            "expired": self._expired,
+            "evicted": self._evicted,
+        }
+
+    def _purge_expired(self) -> None:
+        # Every entry gets the same TTL, so the oldest entries expire first:
+        # pop from the head and stop at the first live one instead of walking
+        # the whole store. Entries moved to the end by a read may linger past
+        # their TTL; ``get`` still checks expiry before returning them.
+        now = self._clock()
+        while self._entries:
+            oldest = next(iter(self._entries))
+            if self._entries[oldest].expires_at > now:
+                break
+            self._drop(oldest)
+            self._expired += 1
+
+    def _drop(self, request_id: str) -> None:
+        self._remove(request_id)
+        self._dropped[request_id] = None
+        while len(self._dropped) > self._max_tombstones:
+            self._dropped.popitem(last=False)
+
+    def _remove(self, request_id: str) -> None:
+        entry = self._entries.pop(request_id)
+        self._bytes -= entry.size
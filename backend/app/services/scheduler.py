@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Union
+
+
+class SchedulerError(RuntimeError):
+    """Base class for submissions the scheduler refuses."""
+
+    def __init__(self, message: str, retry_after: int) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class QueueFullError(SchedulerError):
+    """Raised when the bounded inference queue has no free slot."""
+
+
+class SchedulerClosedError(SchedulerError):
+    """Raised when a job is submitted while the scheduler is draining."""
+
+
+@dataclass
+class InferenceJob:
+    request_id: str
+    payload: bytes
+    book_size: str = "16k"
+    content_key: Optional[str] = None
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+@dataclass
+class InferenceBatch:
+    """Several uploads handled by one worker so model calls span images."""
+
+    request_id: str
+    jobs: List[InferenceJob]
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+QueuedWork = Union[InferenceJob, InferenceBatch]
+JobHandler = Callable[[int, QueuedWork], Awaitable[None]]
+
+
+class InferenceScheduler:
+    """
+    Bounded job queue drained by a fixed number of asyncio workers.
+
+    ``handler(worker_index, job)`` is awaited for every job; the worker index
+    lets callers bind each worker to its own engine instances. Submissions
+    beyond ``max_queue`` pending jobs are rejected instead of piling up.
+    """
+
+    def __init__(self, handler: JobHandler, workers: int = 1, max_queue: int = 16, window: int = 256) -> None:
+        self._handler = handler
+        self._worker_count = max(1, workers)
+        self._max_queue = max(1, max_queue)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue[QueuedWork]] = None
+        self._workers: List[asyncio.Task[None]] = []
+        self._closed = False
+
+        self._busy = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._wait_times: Deque[float] = deque(maxlen=window)
+        self._service_times: Deque[float] = deque(maxlen=window)
+
+    @property
+    def worker_count(self) -> int:
+        return self._worker_count
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def start(self) -> None:
+        """Create the queue and worker tasks on the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._workers:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self._max_queue)
+        self._workers = [
+            loop.create_task(self._worker(index), name=f"inference-worker-{index}")
+            for index in range(self._worker_count)
+        ]
+
+    def submit(self, job: QueuedWork) -> None:
+        """Queue ``job`` or raise ``QueueFullError``/``SchedulerClosedError``."""
+        if self._closed:
+            self._rejected += 1
+            raise SchedulerClosedError("Inference service is shutting down", self.retry_after())
+        self.start()
+        assert self._queue is not None
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self._rejected += 1
+            raise QueueFullError("Inference queue is full", self.retry_after()) from None
+        self._submitted += 1
+
+    async def put(self, job: QueuedWork) -> None:
+        """Queue ``job``, waiting for a free slot instead of rejecting it.
+
+        Used by producers that can absorb backpressure (batch uploads);
+        still raises ``SchedulerClosedError`` once draining has begun.
+        """
+        if self._closed:
+            self._rejected += 1
+            raise SchedulerClosedError("Inference service is shutting down", self.retry_after())
+        self.start()
+        assert self._queue is not None
+        await self._queue.put(job)
+        self._submitted += 1
+
+    def retry_after(self) -> int:
+        """Seconds a rejected client should wait, from recent service times."""
+        depth = self._queue.qsize() if self._queue else 0
+        service = _mean(self._service_times) or 1.0
+        return max(1, math.ceil(service * (depth + 1) / self._worker_count))
+
+    async def join(self) -> None:
+        """Wait until every job submitted so far has been handled."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def shutdown(self, timeout: Optional[float] = None) -> None:
+        """Stop accepting jobs, let queued and in-flight jobs finish, then stop workers."""
+        self._closed = True
+        if self._queue is not None and self._loop is asyncio.get_running_loop():
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout)
+            except asyncio.TimeoutError:
+                print(f"[InferenceScheduler] Drain timed out with {self._queue.qsize()} jobs queued")
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self._worker_count,
+            "busy_workers": self._busy,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "queue_capacity": self._max_queue,
+            "submitted": self._submitted,
+            "completed": self._completed,
+            "failed": self._failed,
+            "rejected": self._rejected,
+            "avg_wait_ms": round(_mean(self._wait_times) * 1000, 2),
+            "max_wait_ms": round(max(self._wait_times, default=0.0) * 1000, 2),
+            "avg_service_ms": round(_mean(self._service_times) * 1000, 2),
+            "closed": self._closed,
+        }
+
+    async def _worker(self, index: int) -> None:
+        assert self._queue is not None
+        queue = self._queue
+        while True:
+            job = await queue.get()
+            started = time.perf_counter()
+            self._wait_times.append(started - job.enqueued_at)
+            self._busy += 1
+            try:
+                await self._handler(index, job)
+            except Exception as exc:  # noqa: BLE001
+                self._failed += 1
+                print(f"[InferenceScheduler] Job {job.request_id} failed: {exc}")
+            finally:
+                self._busy -= 1
+                self._completed += 1
+                self._service_times.append(time.perf_counter() - started)
+                queue.task_done()
+
+
+def _mean(values: Deque[float]) -> float:
+    return sum(values) / len(values) if values else 0.0
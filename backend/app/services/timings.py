@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+from ..schemas.requests import StageTimings
+
+# Pipeline stages in execution order; each maps to ``StageTimings.<stage>_ms``
+STAGES = ("decode", "detection", "angle_cls", "recognition", "font_classification", "point_size")
+
+
+class StageTimer:
+    """Wall time per pipeline stage for one request, in milliseconds.
+
+    Stages are accumulated, so timing the same stage twice adds up. Stages
+    that never ran stay absent and come out as ``None`` in ``StageTimings``.
+    """
+
+    def __init__(self) -> None:
+        self.ms: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, (time.perf_counter() - start) * 1000)
+
+    def add(self, name: str, ms: float) -> None:
+        self.ms[name] = self.ms.get(name, 0.0) + ms
+
+    def timings(self) -> StageTimings:
+        return StageTimings(**{f"{name}_ms": round(self.ms[name], 2) for name in STAGES if name in self.ms})
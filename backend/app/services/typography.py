@@ -1,10 +1,94 @@
 from __future__ import annotations
 
+import json
+import pickle
+import threading
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from pathlib import Path
+from typing import List, Optional, Protocol, Sequence, Tuple
+
+import warnings
 
 import numpy as np
+from ..core.config import get_settings
 from .font_classifier import FontClassifier
+from .model_registry import ModelRegistry, get_registry
+from .onnx_runtime import ONNXRUNTIME_AVAILABLE, create_onnx_session
+from .timings import StageTimer
+from ..data_processing.point_size_features import POINT_SIZE_FEATURE_COLS, build_point_size_features
+
+POINT_SIZE_MODEL_PATH = Path("models/point_size_model/xgboost_model.pkl")
+# Written by scripts/export_onnx_models.py; feature columns live in the model metadata
+POINT_SIZE_ONNX_PATH = Path("models/point_size_model/point_size.onnx")
+# The point-size model is shared process-wide. The pickled model is a
+# scikit-learn RandomForestRegressor, whose predict() is not documented as safe
+# to call concurrently and already fans out over its own joblib workers, so
+# calls are serialised.
+_ML_PREDICT_LOCK = threading.Lock()
+
+
+class PointSizeRegressor(Protocol):
+    """What ``TypographyEstimator`` needs from a point-size model runtime."""
+
+    def predict(self, features: np.ndarray) -> Sequence[float]:
+        ...
+
+
+class OnnxPointSizeModel:
+    """The point-size forest served by ONNX Runtime."""
+
+    def __init__(self, path: Path, intra_op_threads: int = 1, inter_op_threads: int = 1) -> None:
+        if not path.exists():
+            raise FileNotFoundError(f"ONNX model not found at {path}; run scripts/export_onnx_models.py")
+        self.session = create_onnx_session(path, intra_op_threads, inter_op_threads)
+        self.input_name = self.session.get_inputs()[0].name
+        metadata = self.session.get_modelmeta().custom_metadata_map
+        self.feature_cols: List[str] = (
+            json.loads(metadata["feature_cols"]) if "feature_cols" in metadata else list(POINT_SIZE_FEATURE_COLS)
+        )
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        outputs = self.session.run(None, {self.input_name: np.asarray(features, dtype=np.float32)})
+        return outputs[0].reshape(-1)
+
+
+def load_point_size_model(
+    path: Path = POINT_SIZE_MODEL_PATH,
+    backend: Optional[str] = None,
+    onnx_path: Path = POINT_SIZE_ONNX_PATH,
+) -> Tuple[Optional[PointSizeRegressor], Optional[List[str]]]:
+    """Load the point-size regressor; ``(None, None)`` when unavailable.
+
+    ``backend`` defaults to ``settings.point_size_backend``: ``onnx`` serves
+    the ONNX export, ``sklearn`` the pickled forest, and ``auto`` the ONNX
+    export whenever it and onnxruntime are present.
+    """
+    settings = get_settings()
+    backend = backend or settings.point_size_backend
+    if backend == "onnx" or (backend == "auto" and ONNXRUNTIME_AVAILABLE and onnx_path.exists()):
+        try:
+            # Per-image feature matrices are tiny; one intra-op thread is plenty
+            model = OnnxPointSizeModel(onnx_path, inter_op_threads=settings.onnx_inter_op_threads)
+            print("[TypographyEstimator] ONNX point-size model loaded successfully.")
+            return model, model.feature_cols
+        except Exception as e:
+            print(f"[TypographyEstimator] Failed to load ONNX point-size model: {e}")
+            if backend == "onnx":
+                return None, None
+    try:
+        if path.exists():
+            with open(path, 'rb') as f:
+                model_data = pickle.load(f)
+            model = model_data['model']
+            # Trained with n_jobs=-1; a per-image batch is far too small to
+            # be worth spinning up a joblib thread pool on every predict.
+            if hasattr(model, "n_jobs"):
+                model.n_jobs = 1
+            print("[TypographyEstimator] ML model loaded successfully.")
+            return model, model_data['feature_cols']
+    except Exception as e:
+        print(f"[TypographyEstimator] Failed to load ML model: {e}")
+    return None, None
 
 
 @dataclass
@@ -13,6 +97,8 @@ class TypographyResult:
     font_size_name: str
     point_size: float
     confidence: float
+    # Font classifier tier that decided the family (see FontPrediction)
+    font_tier: Optional[str] = None
 
 
 class TypographyEstimator:
@@ -51,24 +137,11 @@ class TypographyEstimator:
         "32k": 5.12,
     }
 
-    def __init__(self):
-        self.font_classifier = FontClassifier()
-        
-        # Load ML model for point size prediction
-        self.ml_model = None
-        self.ml_feature_cols = None
-        try:
-            import pickle
-            from pathlib import Path
-            model_path = Path("models/point_size_model/xgboost_model.pkl")
-            if model_path.exists():
-                with open(model_path, 'rb') as f:
-                    model_data = pickle.load(f)
-                    self.ml_model = model_data['model']
-                    self.ml_feature_cols = model_data['feature_cols']
-                print("[TypographyEstimator] ML model loaded successfully.")
-        except Exception as e:
-            print(f"[TypographyEstimator] Failed to load ML model: {e}")
+    def __init__(self, registry: Optional[ModelRegistry] = None):
+        # Both models are shared by every estimator in the process
+        registry = registry or get_registry()
+        self.font_classifier = registry.get("font_classifier", FontClassifier)
+        self.ml_model, self.ml_feature_cols = registry.get("point_size_model", load_point_size_model)
 
     def estimate(
         self,
@@ -92,47 +165,92 @@ class TypographyEstimator:
         Returns:
             TypographyResult object.
         """
-        # 1. Estimate Font Family
-        font_family, confidence = self.font_classifier.predict(text, crop)
-
-        # 2. Estimate Point Size
-        # Calculate box height in pixels
-        y_coords = [p[1] for p in box]
-        x_coords = [p[0] for p in box]
-        pixel_height = (max(y_coords) - min(y_coords))
-        pixel_width = (max(x_coords) - min(x_coords))
-        
+        return self.estimate_batch(
+            texts=[text],
+            crops=[crop],
+            boxes=[box],
+            image_width=image_width,
+            book_size=book_size,
+            anchor_height=anchor_height,
+        )[0]
+
+    def estimate_batch(
+        self,
+        texts: Sequence[str],
+        crops: Sequence[np.ndarray],
+        boxes: Sequence[list[list[float]]],
+        image_width: int,
+        book_size: str = "16k",
+        anchor_height: Optional[float] = None,
+        fonts: Optional[Sequence[Tuple[str, float]]] = None,
+        timer: Optional[StageTimer] = None,
+    ) -> List[TypographyResult]:
+        """
+        Estimate typography attributes for all text regions of one image.
+
+        Font families are classified in a single batched call and point sizes
+        are predicted from one feature matrix; the remaining arguments match
+        ``estimate`` and results are returned in input order. Pass ``fonts``
+        when the classifier already ran (e.g. over a multi-image batch).
+        ``timer`` receives the font-classification and point-size times.
+        """
+        timer = timer or StageTimer()
+        # 1. Estimate Font Family (batched across all regions)
+        if fonts is None:
+            with timer.stage("font_classification"):
+                fonts = self.font_classifier.predict_batch(list(texts), list(crops))
+
+        # 2. Estimate Point Size (one feature matrix + one predict per image)
+        with timer.stage("point_size"):
+            point_sizes = self._estimate_point_sizes(texts, boxes, image_width, book_size, anchor_height)
+
+        return [
+            # Plain (font, confidence) pairs are accepted too; they carry no tier
+            self._build_result(font[0], font[1], point_size, getattr(font, "tier", None))
+            for font, point_size in zip(fonts, point_sizes)
+        ]
+
+    def _estimate_point_sizes(
+        self,
+        texts: Sequence[str],
+        boxes: Sequence[list[list[float]]],
+        image_width: int,
+        book_size: str,
+        anchor_height: Optional[float],
+    ) -> List[float]:
+        # Calculate box extents in pixels
+        pixel_heights = [max(p[1] for p in box) - min(p[1] for p in box) for box in boxes]
+        pixel_widths = [max(p[0] for p in box) - min(p[0] for p in box) for box in boxes]
+
         # Try ML model first (if available and anchor is provided)
-        if self.ml_model and anchor_height and anchor_height > 0:
+        if self.ml_model and anchor_height and anchor_height > 0 and texts:
             try:
-                # Prepare features (must match training features)
-                features = {
-                    'bbox_height': pixel_height,
-                    'bbox_width': pixel_width,
-                    'image_width': image_width,
-                    'text_length': len(text.strip()),
-                    'is_chinese': int(any('\u4e00' <= ch <= '\u9fff' for ch in text)),
-                    'is_all_caps': int(text.strip().isupper() and text.strip().isascii()),
-                    'is_title_case': int(text.strip()[0].isupper() and not text.strip().isupper() and text.strip().isascii()) if text.strip() else 0,
-                    'height_ratio_to_anchor': pixel_height / anchor_height,
-                    'relative_height': pixel_height / image_width if image_width > 0 else 0,
-                    'aspect_ratio': pixel_width / pixel_height if pixel_height > 0 else 0,
-                }
-                
-                # Create feature vector in correct order
-                import pandas as pd
-                feature_vector = pd.DataFrame([features])[self.ml_feature_cols]
-                
-                # Predict
-                point_size = float(self.ml_model.predict(feature_vector)[0])
-                
+                # Features are built by the same featurizer used for training,
+                # in the column order stored alongside the model.
+                features = build_point_size_features(
+                    texts,
+                    pixel_heights,
+                    pixel_widths,
+                    image_width,
+                    anchor_height,
+                    feature_cols=self.ml_feature_cols,
+                )
+                with _ML_PREDICT_LOCK, warnings.catch_warnings():
+                    # Model was fitted on a DataFrame; columns are already ordered by name.
+                    warnings.filterwarnings("ignore", message="X does not have valid feature names")
+                    return [float(size) for size in self.ml_model.predict(features)]
             except Exception as e:
                 print(f"[TypographyEstimator] ML prediction failed: {e}, falling back to rule-based")
-                point_size = self._fallback_point_size(text, pixel_height, image_width, book_size)
-        else:
-            # Fallback to rule-based approach
-            point_size = self._fallback_point_size(text, pixel_height, image_width, book_size)
 
+        # Fallback to rule-based approach
+        return [
+            self._fallback_point_size(text, pixel_height, image_width, book_size)
+            for text, pixel_height in zip(texts, pixel_heights)
+        ]
+
+    def _build_result(
+        self, font_family: str, confidence: float, point_size: float, font_tier: Optional[str] = None
+    ) -> TypographyResult:
         # Round to nearest 0.5
         raw_point_size = round(point_size * 2) / 2
 
@@ -149,6 +267,7 @@ class TypographyEstimator:
             font_size_name=size_name,
             point_size=final_point_size,
             confidence=confidence,
+            font_tier=font_tier,
         )
 
     def _get_closest_size(self, point_size: float) -> Tuple[str, float]:
@@ -4,3 +4,80 @@ from pathlib import Path
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+
+import asyncio
+from typing import List
+from unittest.mock import patch
+
+import pytest
+
+from app.core.config import Settings
+from app.schemas.requests import RecognizedText, ResultResponse, StageTimings
+
+
+class FakeExecutor:
+    """Executor stand-in that records each inference run instead of running models."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.runs: List[str] = []
+        self.batches: List[List[str]] = []
+
+    async def run(self, worker_index, request_id, payload, book_size, on_stage=None):
+        self.runs.append(request_id)
+        if on_stage is not None:
+            on_stage("ocr")
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return ResultResponse(
+            request_id=request_id,
+            texts=[RecognizedText(content=f"{len(payload)}:{book_size}", confidence=0.9)],
+            fonts_summary=[],
+            elapsed_ms=1,
+            timings=StageTimings(decode_ms=0.2, detection_ms=0.5, recognition_ms=0.3),
+        )
+
+    async def run_batch(self, worker_index, items, on_stage=None):
+        self.batches.append([request_id for request_id, _, _ in items])
+        return [
+            await self.run(worker_index, request_id, payload, book_size, on_stage)
+            for request_id, payload, book_size in items
+        ]
+
+    def shutdown(self) -> None:
+        return None
+
+
+class FakeUpload:
+    def __init__(self, payload: bytes) -> None:
+        self._payload = payload
+
+    async def read(self) -> bytes:
+        return self._payload
+
+
+@pytest.fixture(autouse=True)
+def fresh_model_registry():
+    """Models are cached process-wide; give every test its own (mocked) set."""
+    from app.services.model_registry import get_registry
+
+    get_registry().clear()
+    yield
+    get_registry().clear()
+
+
+@pytest.fixture
+def make_pipeline(tmp_path):
+    """Build an InferencePipeline whose models are mocked and whose executor is fake."""
+    from app.services.pipeline import InferencePipeline
+
+    def factory(executor=None, **overrides):
+        settings = Settings(**overrides)
+        with patch("app.services.engine.OCRService"), \
+                patch("app.services.typography.FontClassifier"):
+            pipeline = InferencePipeline(settings=settings)
+        pipeline._executor = executor or FakeExecutor()
+        return pipeline
+
+    return factory
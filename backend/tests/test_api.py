@@ -5,16 +5,22 @@ from typing import Optional
 
 from fastapi.testclient import TestClient
 
+from app.api import metrics as metrics_api
 from app.main import app
 from app.schemas.requests import FontSummary, RecognizedText, ResultResponse
 from app.services.pipeline import get_pipeline
+from app.services.result_store import ResultExpiredError
+from app.services.scheduler import QueueFullError, SchedulerClosedError
 
 
 class DummyPipeline:
     def __init__(self) -> None:
         self._stored: Optional[ResultResponse] = None
+        self.reject_with: Optional[Exception] = None
 
-    async def enqueue(self, file):  # type: ignore[override]
+    async def enqueue(self, file, book_size: str = "16k"):  # type: ignore[override]
+        if self.reject_with is not None:
+            raise self.reject_with
         request_id = "test-request"
         self._stored = ResultResponse(
             request_id=request_id,
@@ -26,9 +32,26 @@ class DummyPipeline:
         )
         return request_id
 
-    async def get_result(self, request_id: str) -> Optional[ResultResponse]:  # type: ignore[override]
+    async def get_result(self, request_id: str, wait: float = 0.0) -> Optional[ResultResponse]:  # type: ignore[override]
+        if request_id == "expired-request":
+            raise ResultExpiredError(request_id)
         return self._stored if self._stored and self._stored.request_id == request_id else None
 
+    def is_pending(self, request_id: str) -> bool:
+        return request_id == "pending-request"
+
+    async def stream_events(self, request_id: str, heartbeat=None):
+        yield "progress", {"stage": "ocr"}
+        yield "heartbeat", {}
+        if self._stored and self._stored.request_id == request_id:
+            yield "result", self._stored.model_dump()
+
+    def stats(self):
+        return {"scheduler": {"queue_depth": 0, "workers": 1}}
+
+    def metrics(self):
+        return "# TYPE coverocr_queue_depth gauge\ncoverocr_queue_depth 0\n"
+
 
 dummy_pipeline = DummyPipeline()
 app.dependency_overrides[get_pipeline] = lambda: dummy_pipeline
@@ -57,3 +80,140 @@ def test_upload_and_result_flow():
     assert body["request_id"] == request_id
     assert "texts" in body
     assert "fonts_summary" in body
+
+
+def test_upload_rejected_with_retry_after_when_queue_full():
+    dummy_pipeline.reject_with = QueueFullError("Inference queue is full", retry_after=7)
+    try:
+        resp = client.post(
+            "/api/v1/upload",
+            files={"file": ("demo.jpg", b"fake-image-bytes", "image/jpeg")},
+        )
+    finally:
+        dummy_pipeline.reject_with = None
+
+    assert resp.status_code == 429
+    assert resp.headers["Retry-After"] == "7"
+
+
+def test_upload_rejected_while_draining():
+    dummy_pipeline.reject_with = SchedulerClosedError("Inference service is shutting down", retry_after=3)
+    try:
+        resp = client.post(
+            "/api/v1/upload",
+            files={"file": ("demo.jpg", b"fake-image-bytes", "image/jpeg")},
+        )
+    finally:
+        dummy_pipeline.reject_with = None
+
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"] == "3"
+
+
+def test_stats_endpoint():
+    resp = client.get("/api/v1/stats")
+    assert resp.status_code == 200
+    assert resp.json()["scheduler"]["queue_depth"] == 0
+
+
+def test_metrics_endpoint_serves_prometheus_text(monkeypatch):
+    monkeypatch.setattr(metrics_api, "current_pipeline", lambda: dummy_pipeline)
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "coverocr_queue_depth 0" in resp.text
+
+
+def test_expired_result_is_gone_not_pending():
+    assert client.get("/api/v1/result/expired-request").status_code == 410
+    assert client.get("/api/v1/result/unknown-request").status_code == 404
+
+
+def test_result_events_stream_over_sse():
+    client.post(
+        "/api/v1/upload",
+        files={"file": ("demo.jpg", b"fake-image-bytes", "image/jpeg")},
+    )
+    resp = client.get("/api/v1/result/test-request/events")
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    body = resp.text
+    assert 'event: progress\ndata: {"stage": "ocr"}' in body
+    assert ": keep-alive" in body
+    assert "event: result" in body
+    assert client.get("/api/v1/result/nobody/events").status_code == 404
+    assert client.get("/api/v1/result/expired-request/events").status_code == 410
+
+
+def test_long_poll_wait_parameter_is_validated():
+    assert client.get("/api/v1/result/test-request?wait=-1").status_code == 422
+
+
+def test_recognize_returns_result_inline():
+    resp = client.post(
+        "/api/v1/recognize",
+        files={"file": ("demo.jpg", b"fake-image-bytes", "image/jpeg")},
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["request_id"] == "test-request"
+    assert body["texts"][0]["content"] == "Hello"
+
+
+def test_recognize_falls_back_to_request_id_after_deadline():
+    original = dummy_pipeline.get_result
+
+    async def never_ready(request_id: str, wait: float = 0.0):
+        assert 0 < wait <= 0.5
+        return None
+
+    dummy_pipeline.get_result = never_ready  # type: ignore[assignment]
+    try:
+        resp = client.post(
+            "/api/v1/recognize?deadline=0.5",
+            files={"file": ("demo.jpg", b"fake-image-bytes", "image/jpeg")},
+        )
+    finally:
+        dummy_pipeline.get_result = original  # type: ignore[assignment]
+
+    assert resp.status_code == 202
+    assert resp.json() == {"request_id": "test-request"}
+    assert resp.headers["Location"].endswith("/api/v1/result/test-request")
+
+
+def test_batch_upload_and_status():
+    from app.schemas.requests import BatchItem, BatchItemStatus, BatchStatusResponse, BatchUploadResponse
+
+    async def enqueue_batch(sources, book_size="16k", files=()):
+        names = [name for name, _ in sources]
+        for file in files:
+            file.close()
+        return BatchUploadResponse(
+            batch_id="batch-1",
+            items=[BatchItem(filename=name, request_id=f"req-{i}") for i, name in enumerate(names)],
+        )
+
+    def batch_status(batch_id):
+        if batch_id != "batch-1":
+            return None
+        item = BatchItemStatus(filename="a.png", request_id="req-0", status="pending")
+        return BatchStatusResponse(batch_id=batch_id, total=1, completed=0, pending=1, expired=0, items=[item])
+
+    dummy_pipeline.enqueue_batch = enqueue_batch  # type: ignore[attr-defined]
+    dummy_pipeline.batch_status = batch_status  # type: ignore[attr-defined]
+
+    resp = client.post(
+        "/api/v1/batch",
+        files=[
+            ("files", ("a.png", b"png", "image/png")),
+            ("files", ("b.jpg", b"jpg", "image/jpeg")),
+        ],
+    )
+    assert resp.status_code == 200
+    assert [item["filename"] for item in resp.json()["items"]] == ["a.png", "b.jpg"]
+
+    assert client.get("/api/v1/batch/batch-1").json()["pending"] == 1
+    assert client.get("/api/v1/batch/other").status_code == 404
+    bad = client.post("/api/v1/batch", files=[("files", ("a.gif", b"gif", "image/gif"))])
+    assert bad.status_code == 400
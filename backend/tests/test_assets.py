@@ -0,0 +1,59 @@
+import pytest
+
+from app.core.config import get_settings
+from app.services import font_classifier, ocr_service
+from app.services.assets import MissingAssetError, verify_manifest, write_manifest
+from app.services.font_classifier import PaddleClasFontClassifier
+
+
+@pytest.fixture
+def offline(monkeypatch):
+    monkeypatch.setattr(get_settings(), "offline_mode", True)
+
+
+def test_manifest_detects_missing_and_modified_files(tmp_path):
+    fonts = tmp_path / "fonts"
+    fonts.mkdir()
+    (fonts / "a.ttf").write_bytes(b"font a")
+    (fonts / "b.ttf").write_bytes(b"font b")
+    manifest = tmp_path / "manifest.json"
+
+    assert len(write_manifest([fonts], manifest)) == 2
+    assert verify_manifest(manifest) == []
+
+    (fonts / "a.ttf").write_bytes(b"tampered")
+    (fonts / "b.ttf").unlink()
+    problems = verify_manifest(manifest)
+    assert any(problem.startswith("checksum mismatch") and "a.ttf" in problem for problem in problems)
+    assert any(problem.startswith("missing") and "b.ttf" in problem for problem in problems)
+    assert verify_manifest(tmp_path / "absent.json")[0].endswith("run scripts/provision_assets.py")
+
+
+def test_offline_mode_skips_missing_fonts_without_downloading(offline, tmp_path, monkeypatch):
+    monkeypatch.setattr(font_classifier, "FONT_BASE_DIR", tmp_path)
+    (tmp_path / font_classifier.FONT_RESOURCES[0].filename).write_bytes(b"local font")
+
+    def no_network(*args, **kwargs):
+        raise AssertionError("offline mode must not download")
+
+    monkeypatch.setattr(font_classifier, "download_file", no_network)
+    classifier = PaddleClasFontClassifier.__new__(PaddleClasFontClassifier)
+
+    fonts = classifier._prepare_fonts()
+    assert [spec.filename for spec in fonts] == [font_classifier.FONT_RESOURCES[0].filename]
+
+
+def test_offline_mode_fails_fast_without_provisioned_ocr_models(offline, tmp_path, monkeypatch):
+    monkeypatch.setattr(ocr_service, "OCR_MODEL_ROOT", tmp_path)
+    with pytest.raises(MissingAssetError, match="provision_assets"):
+        ocr_service.OCRService._model_dirs()
+
+
+def test_provisioned_ocr_models_are_used_when_present(tmp_path, monkeypatch):
+    for name in ("det", "rec", "cls"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "inference.pdmodel").write_bytes(b"")
+        (tmp_path / name / "inference.pdiparams").write_bytes(b"")
+    monkeypatch.setattr(ocr_service, "OCR_MODEL_ROOT", tmp_path)
+
+    assert ocr_service.OCRService._model_dirs()["det_model_dir"] == str(tmp_path / "det")
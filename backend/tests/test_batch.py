@@ -0,0 +1,244 @@
+import asyncio
+import io
+import zipfile
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+import pytest
+from starlette.datastructures import Headers, UploadFile
+
+from app.services.batch import InvalidBatchError, collect_sources, detach_files, read_sources
+from app.services.engine import InferenceEngine
+from app.services.image_context import ImageContext
+from app.services.ocr_service import OCRTextRegion
+from conftest import FakeExecutor
+
+
+def _png(width: int, height: int) -> bytes:
+    ok, buf = cv2.imencode(".png", np.zeros((height, width, 3), dtype=np.uint8))
+    assert ok
+    return buf.tobytes()
+
+
+def _upload(name: str, payload: bytes, content_type: str) -> UploadFile:
+    return UploadFile(
+        io.BytesIO(payload),
+        size=len(payload),
+        filename=name,
+        headers=Headers({"content-type": content_type}),
+    )
+
+
+def _items(*payloads: bytes):
+    return [(f"cover-{index}.png", _loader(payload)) for index, payload in enumerate(payloads)]
+
+
+def _loader(payload: bytes):
+    async def load():
+        return payload
+
+    return load
+
+
+async def _drain(pipeline):
+    # Wait for the background feeders, then for everything they queued
+    await asyncio.gather(*pipeline._feeders)
+    await pipeline._scheduler.join()
+
+
+def test_batch_is_chunked_across_images(make_pipeline):
+    executor = FakeExecutor()
+    pipeline = make_pipeline(executor=executor, batch_chunk_size=2, result_cache_enabled=False)
+
+    async def scenario():
+        response = await pipeline.enqueue_batch(_items(b"a", b"bb", b"ccc", b"dddd", b"eeeee"))
+        await _drain(pipeline)
+        return response
+
+    response = asyncio.run(scenario())
+
+    assert [item.filename for item in response.items] == [f"cover-{i}.png" for i in range(5)]
+    assert [len(batch) for batch in executor.batches] == [2, 2, 1]
+    status = pipeline.batch_status(response.batch_id)
+    assert status is not None
+    assert (status.total, status.completed, status.pending) == (5, 5, 0)
+    assert all(item.status == "done" for item in status.items)
+    assert pipeline.batch_status("nope") is None
+
+
+def test_batch_reuses_cache_and_coalesces_duplicates(make_pipeline):
+    executor = FakeExecutor()
+    pipeline = make_pipeline(executor=executor, batch_chunk_size=8)
+
+    async def scenario():
+        first = await pipeline.enqueue_batch(_items(b"same", b"same", b"other"))
+        await _drain(pipeline)
+        second = await pipeline.enqueue_batch(_items(b"same"))
+        await _drain(pipeline)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    # The duplicate attached to the first copy; the re-upload hit the cache
+    assert executor.batches == [[first.items[0].request_id, first.items[2].request_id]]
+    duplicate = asyncio.run(pipeline.get_result(first.items[1].request_id))
+    assert duplicate is not None and duplicate.texts[0].content == "4:16k"
+    assert pipeline.batch_status(second.batch_id).completed == 1
+
+
+def test_batch_is_registered_before_it_is_fed(make_pipeline):
+    executor = FakeExecutor(delay=0.05)
+    pipeline = make_pipeline(executor=executor, batch_chunk_size=1, inference_queue_size=1, result_cache_enabled=False)
+    closed = []
+
+    class File(io.BytesIO):
+        def close(self):
+            closed.append(True)
+            super().close()
+
+    async def scenario():
+        response = await pipeline.enqueue_batch(_items(b"a", b"bb", b"ccc"), files=[File()])
+        # Returned before a single image ran, with every item already visible
+        early = pipeline.batch_status(response.batch_id), list(executor.runs)
+        await _drain(pipeline)
+        return response, early, pipeline.batch_status(response.batch_id)
+
+    response, (early, runs_at_return), late = asyncio.run(scenario())
+
+    assert runs_at_return == []
+    assert (early.total, early.pending, early.completed) == (3, 3, 0)
+    assert (late.completed, late.pending) == (3, 0)
+    assert closed == [True]
+
+
+def test_batch_items_fail_when_the_feed_breaks(make_pipeline):
+    pipeline = make_pipeline(batch_chunk_size=8, result_cache_enabled=False)
+
+    async def broken():
+        raise OSError("truncated zip member")
+
+    async def scenario():
+        response = await pipeline.enqueue_batch([("a.png", _loader(b"a")), ("b.png", broken)])
+        await _drain(pipeline)
+        return response
+
+    response = asyncio.run(scenario())
+
+    status = pipeline.batch_status(response.batch_id)
+    assert (status.completed, status.pending) == (2, 0)
+    failed = asyncio.run(pipeline.get_result(response.items[1].request_id))
+    assert failed.texts == [] and failed.timings is None
+
+
+def test_detached_upload_files_outlive_the_request():
+    files = [_upload("single.png", b"png-bytes", "image/png")]
+    sources = collect_sources(files, max_items=10, max_item_bytes=1024)
+    owned = detach_files(files)
+
+    # What FastAPI does once the handler has returned
+    asyncio.run(files[0].close())
+
+    async def read_all():
+        return [item async for item in read_sources(sources)]
+
+    assert asyncio.run(read_all()) == [("single.png", b"png-bytes")]
+    assert not owned[0].closed
+
+
+def test_zip_members_are_read_lazily_and_filtered():
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("shelf/a.png", _png(10, 10))
+        zf.writestr("shelf/b.JPG", b"jpeg-bytes")
+        zf.writestr("shelf/notes.txt", b"skip me")
+        zf.writestr("__MACOSX/shelf/._a.png", b"resource fork")
+    files = [
+        _upload("shelf.zip", archive.getvalue(), "application/zip"),
+        _upload("single.png", b"png-bytes", "image/png"),
+    ]
+
+    sources = collect_sources(files, max_items=10, max_item_bytes=1024 * 1024)
+    assert [name for name, _ in sources] == ["shelf/a.png", "shelf/b.JPG", "single.png"]
+
+    async def read_all():
+        return [item async for item in read_sources(sources)]
+
+    items = asyncio.run(read_all())
+    assert items[1] == ("shelf/b.JPG", b"jpeg-bytes")
+    assert items[2] == ("single.png", b"png-bytes")
+
+
+@pytest.mark.parametrize(
+    "files, message",
+    [
+        ([_upload("a.gif", b"x", "image/gif")], "Unsupported"),
+        ([_upload(f"{i}.png", b"x", "image/png") for i in range(3)], "exceeds 2 images"),
+        ([_upload("big.png", b"x" * 11, "image/png")], "exceeds 10 bytes"),
+        ([_upload("bad.zip", b"not a zip", "application/zip")], "not a valid zip"),
+        ([], "no images"),
+    ],
+)
+def test_invalid_batches_are_rejected_up_front(files, message):
+    with pytest.raises(InvalidBatchError, match=message):
+        collect_sources(files, max_items=2, max_item_bytes=10)
+
+
+def test_engine_classifies_fonts_once_per_batch():
+    box = [[0.0, 0.0], [100.0, 0.0], [100.0, 20.0], [0.0, 20.0]]
+    crop = np.zeros((20, 100, 3), dtype=np.uint8)
+
+    with patch("app.services.engine.OCRService") as MockOCRService, \
+            patch("app.services.typography.FontClassifier") as MockFontClassifier:
+        MockOCRService.return_value.parse.side_effect = lambda context, timer=None: [
+            OCRTextRegion(text=f"w{context.width}", confidence=0.9, box=box, crop=crop)
+            for _ in range(context.width // 100)
+        ]
+        classifier = MockFontClassifier.return_value
+        classifier.predict_batch.side_effect = lambda texts, crops: [("宋体", 0.8)] * len(texts)
+
+        engine = InferenceEngine()
+        results = engine.run_batch(
+            [("a", _png(200, 50), "16k"), ("bad", b"not an image", "16k"), ("b", _png(300, 50), "a4")],
+            start=0.0,
+        )
+
+    assert classifier.predict_batch.call_count == 1
+    assert len(classifier.predict_batch.call_args.args[0]) == 5
+    assert results[1] is None
+    assert [text.content for text in results[0].texts] == ["w200"] * 2
+    assert [text.content for text in results[2].texts] == ["w300"] * 3
+    assert results[2].request_id == "b"
+    # The shared classifier call is split 2:3 by region count
+    font_ms = [results[0].timings.font_classification_ms, results[2].timings.font_classification_ms]
+    assert font_ms[0] <= font_ms[1]
+
+
+def test_engine_decodes_and_ocrs_one_image_at_a_time():
+    box = [[0.0, 0.0], [100.0, 0.0], [100.0, 20.0], [0.0, 20.0]]
+    events, decoded = [], []
+    from_bytes = ImageContext.from_bytes
+
+    def decode(payload):
+        events.append("decode")
+        decoded.append(from_bytes(payload))
+        return decoded[-1]
+
+    def parse(context, timer=None):
+        events.append("ocr")
+        return [OCRTextRegion(text="t", confidence=0.9, box=box, crop=context.image[:20, :100])]
+
+    with patch("app.services.engine.OCRService") as MockOCRService, \
+            patch("app.services.typography.FontClassifier") as MockFontClassifier:
+        MockOCRService.return_value.parse.side_effect = parse
+        classifier = MockFontClassifier.return_value
+        classifier.predict_batch.side_effect = lambda texts, crops: [("宋体", 0.8)] * len(texts)
+        engine = InferenceEngine()
+        with patch("app.services.engine.ImageContext.from_bytes", side_effect=decode):
+            results = engine.run_batch([("a", _png(200, 50), "16k"), ("b", _png(300, 50), "16k")], start=0.0)
+
+    assert events == ["decode", "ocr", "decode", "ocr"]
+    assert all(result is not None for result in results)
+    # Regions kept for the shared classifier call no longer pin the decoded images
+    crops = classifier.predict_batch.call_args.args[1]
+    assert not any(np.shares_memory(crop, context.image) for crop in crops for context in decoded)
@@ -0,0 +1,51 @@
+import cv2
+import numpy as np
+import paddle.vision.transforms as T
+
+from app.services.crop_preprocessor import CropPreprocessor
+
+
+def _crops():
+    rng = np.random.default_rng(3)
+    return [rng.integers(0, 256, size=(18 + 9 * i, 50 + 23 * i, 3), dtype=np.uint8) for i in range(5)]
+
+
+def test_matches_the_training_transforms():
+    transform = T.Compose([
+        T.Resize((224, 224)),
+        T.ToTensor(),
+        T.Normalize(mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225]),
+    ])
+    crops = _crops()
+    expected = np.stack([transform(cv2.cvtColor(crop, cv2.COLOR_BGR2RGB)).numpy() for crop in crops])
+
+    batch = CropPreprocessor()(crops)
+
+    assert batch.shape == (5, 3, 224, 224)
+    assert batch.dtype == np.float32
+    np.testing.assert_allclose(batch, expected, atol=1e-5)
+
+
+def test_matches_per_crop_area_resize_and_reuses_its_buffer():
+    mean = np.array([0.485, 0.456, 0.406], dtype=np.float32).reshape((3, 1, 1))
+    std = np.array([0.229, 0.224, 0.225], dtype=np.float32).reshape((3, 1, 1))
+    crops = _crops()
+    crops[1] = cv2.cvtColor(crops[1], cv2.COLOR_BGR2GRAY)
+
+    expected = []
+    for crop in crops:
+        if crop.ndim == 2:
+            crop = cv2.cvtColor(crop, cv2.COLOR_GRAY2BGR)
+        resized = cv2.resize(crop, (224, 224), interpolation=cv2.INTER_AREA)
+        rgb = cv2.cvtColor(resized, cv2.COLOR_BGR2RGB).astype(np.float32) / 255.0
+        expected.append((rgb.transpose(2, 0, 1) - mean) / std)
+
+    preprocessor = CropPreprocessor(interpolation=cv2.INTER_AREA)
+    first = preprocessor(crops)
+    np.testing.assert_allclose(first, np.stack(expected), atol=1e-5)
+
+    # Smaller batches are written into the same preallocated buffer
+    second = preprocessor(crops[:2])
+    assert second.shape[0] == 2
+    assert np.shares_memory(first, second)
+    np.testing.assert_allclose(second, np.stack(expected[:2]), atol=1e-5)
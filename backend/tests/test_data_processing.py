@@ -4,6 +4,7 @@ import pytest
 from app.data_processing.cleaner import DataCleaner
 from app.data_processing.encoder import DataEncoder
 from app.data_processing.normalizer import DataNormalizer
+from app.data_processing.point_size_features import POINT_SIZE_FEATURE_COLS, build_point_size_features
 
 
 class TestDataProcessing:
@@ -61,3 +62,25 @@ class TestDataProcessing:
         assert "cat_C" in encoded.columns
         assert encoded.iloc[0]["cat_A"] == 1
         assert encoded.iloc[1]["cat_B"] == 1
+
+    def test_point_size_features_match_training_definition(self):
+        texts = ["人工智能与机器学习", "ARTIFICIAL", "Second Edition", ""]
+        heights = [60.0, 30.0, 20.0, 0.0]
+        widths = [600.0, 300.0, 280.0, 50.0]
+
+        matrix = build_point_size_features(texts, heights, widths, image_width=1200, anchor_height=60.0)
+        rows = pd.DataFrame(matrix, columns=list(POINT_SIZE_FEATURE_COLS))
+
+        assert matrix.shape == (4, len(POINT_SIZE_FEATURE_COLS))
+        assert rows["is_chinese"].tolist() == [1, 0, 0, 0]
+        assert rows["is_all_caps"].tolist() == [0, 1, 0, 0]
+        assert rows["is_title_case"].tolist() == [0, 0, 1, 0]
+        assert rows["text_length"].tolist() == [9, 10, 14, 0]
+        assert rows["height_ratio_to_anchor"].tolist() == [1.0, 0.5, 20.0 / 60.0, 0.0]
+        assert rows["relative_height"].tolist() == [0.05, 0.025, 20.0 / 1200, 0.0]
+        assert rows["aspect_ratio"].tolist() == [10.0, 10.0, 14.0, 0.0]
+
+    def test_point_size_features_follow_requested_column_order(self):
+        cols = ["aspect_ratio", "bbox_height"]
+        matrix = build_point_size_features(["ab"], [10.0], [40.0], 100, 20.0, feature_cols=cols)
+        assert matrix.tolist() == [[4.0, 10.0]]
@@ -0,0 +1,99 @@
+import asyncio
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+from app.schemas.requests import FontSummary, RecognizedText, ResultResponse
+from app.services.execution import ProcessExecutor, ThreadExecutor
+from app.services.image_context import ImageContext
+
+
+class ShapeEngine:
+    """Stand-in engine that decodes the payload and reports where it ran."""
+
+    def run(self, request_id, payload, book_size, start, on_stage=None):
+        context = ImageContext.from_bytes(payload)
+        return ResultResponse(
+            request_id=request_id,
+            texts=[
+                RecognizedText(
+                    content=f"{context.width}x{context.height}@{os.getpid()}",
+                    font=book_size,
+                    confidence=1.0,
+                )
+            ],
+            fonts_summary=[FontSummary(font=book_size, occurrences=1, avg_confidence=1.0)],
+            elapsed_ms=0,
+        )
+
+    def run_batch(self, items, start, on_stage=None):
+        results = []
+        for request_id, payload, book_size in items:
+            try:
+                results.append(self.run(request_id, payload, book_size, start))
+            except ValueError:
+                results.append(None)
+        return results
+
+
+def _png(width: int, height: int) -> bytes:
+    ok, buf = cv2.imencode(".png", np.zeros((height, width, 3), dtype=np.uint8))
+    assert ok
+    return buf.tobytes()
+
+
+def test_thread_executor_uses_the_worker_engine():
+    executor = ThreadExecutor(workers=2, engine_factory=ShapeEngine)
+    result = asyncio.run(executor.run(1, "req-t", _png(30, 20), "a4"))
+
+    assert len(executor.engines) == 2
+    assert result.texts[0].content == f"30x20@{os.getpid()}"
+
+
+def test_process_executor_round_trips_through_shared_memory():
+    executor = ProcessExecutor(processes=1, engine_factory=ShapeEngine)
+
+    async def scenario():
+        return await asyncio.gather(
+            executor.run(0, "req-a", _png(64, 32), "16k"),
+            executor.run(0, "req-b", _png(10, 90), "32k"),
+        )
+
+    try:
+        first, second = asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+
+    assert isinstance(first, ResultResponse)
+    width_height, pid = first.texts[0].content.split("@")
+    assert width_height == "64x32"
+    assert int(pid) != os.getpid()
+    assert first.texts[0].font_size_name is None
+    assert second.request_id == "req-b"
+    assert second.texts[0].content.startswith("10x90@")
+    assert second.fonts_summary[0].font == "32k"
+
+
+def test_process_executor_reports_worker_errors():
+    executor = ProcessExecutor(processes=1, engine_factory=ShapeEngine)
+    try:
+        with pytest.raises(RuntimeError, match="ValueError"):
+            asyncio.run(executor.run(0, "req-bad", b"not an image", "16k"))
+    finally:
+        executor.shutdown()
+
+
+def test_process_executor_runs_a_batch_from_one_segment():
+    executor = ProcessExecutor(processes=1, engine_factory=ShapeEngine)
+    items = [("req-a", _png(64, 32), "16k"), ("req-bad", b"broken", "16k"), ("req-b", _png(10, 90), "a4")]
+    try:
+        results = asyncio.run(executor.run_batch(0, items))
+    finally:
+        executor.shutdown()
+
+    assert results[0].texts[0].content.startswith("64x32@")
+    assert results[1] is None
+    assert results[2].request_id == "req-b"
+    assert results[2].texts[0].content.startswith("10x90@")
@@ -0,0 +1,305 @@
+import json
+import math
+import threading
+
+import cv2
+import numpy as np
+import paddle
+import pytest
+from paddle.vision.models import resnet18
+
+from app.core.config import Settings
+from app.services.crop_preprocessor import CropPreprocessor
+from app.services.font_classifier import (
+    CustomResNetFontClassifier,
+    FontClassifier,
+    HeuristicFontClassifier,
+    PaddleClasFeatureExtractor,
+    StaticResNetFontClassifier,
+    _ExportedResNetClassifier,
+    export_resnet_inference_model,
+    load_resnet_classifier,
+)
+
+CLASSES = ["Helvetica", "宋体", "黑体"]
+
+
+@pytest.fixture(scope="module")
+def custom_model_dir(tmp_path_factory):
+    model_dir = tmp_path_factory.mktemp("custom_font_classifier")
+    paddle.seed(0)
+    model = resnet18(pretrained=False, num_classes=len(CLASSES))
+    paddle.save(model.state_dict(), str(model_dir / "font_resnet18.pdparams"))
+    (model_dir / "class_mapping.json").write_text(json.dumps(CLASSES, ensure_ascii=False), encoding="utf-8")
+    return model_dir
+
+
+def _random_crops(count: int):
+    rng = np.random.default_rng(7)
+    return [
+        rng.integers(0, 256, size=(20 + 7 * i, 60 + 11 * i, 3), dtype=np.uint8)
+        for i in range(count)
+    ]
+
+
+def test_predict_batch_matches_single_predictions(custom_model_dir):
+    classifier = CustomResNetFontClassifier(custom_model_dir, max_batch_size=2)
+    crops = _random_crops(5)
+    crops.insert(2, np.zeros((0, 0, 3), dtype=np.uint8))
+    texts = [f"text-{i}" for i in range(len(crops))]
+
+    batched = classifier.predict_batch(texts, crops)
+    single = [classifier.predict(text, crop) for text, crop in zip(texts, crops)]
+
+    assert batched[2] is None
+    for got, expected in zip(batched, single):
+        if expected is None:
+            assert got is None
+            continue
+        assert got[0] == expected[0]
+        assert got[1] == pytest.approx(expected[1], abs=1e-4)
+
+
+def test_predict_batch_respects_max_batch_size(custom_model_dir):
+    classifier = CustomResNetFontClassifier(custom_model_dir, max_batch_size=2)
+    batch_sizes = []
+    forward = classifier.model.forward
+
+    def spy_forward(batch):
+        batch_sizes.append(batch.shape[0])
+        return forward(batch)
+
+    classifier.model.forward = spy_forward
+    results = classifier.predict_batch(["a"] * 5, _random_crops(5))
+
+    assert batch_sizes == [2, 2, 1]
+    assert all(label in CLASSES for label, _ in results)
+
+
+def test_facade_batch_falls_back_per_region():
+    facade = FontClassifier.__new__(FontClassifier)
+    facade._custom = None
+    facade._advanced = None
+    facade._fallback = HeuristicFontClassifier()
+    facade._lock = threading.RLock()
+    facade.configure_cascade(False)
+    crops = _random_crops(3)
+    texts = ["宋体标题", "Title", ""]
+
+    batched = facade.predict_batch(texts, crops)
+    assert [(p.font, p.confidence) for p in batched] == [
+        facade.predict(text, crop) for text, crop in zip(texts, crops)
+    ]
+    assert {p.tier for p in batched} == {"heuristic"}
+
+
+@pytest.fixture(scope="module")
+def exported_model_dir(custom_model_dir):
+    export_resnet_inference_model(custom_model_dir)
+    return custom_model_dir
+
+
+def test_static_predictor_matches_dygraph(exported_model_dir):
+    dygraph = CustomResNetFontClassifier(exported_model_dir, max_batch_size=4)
+    static = StaticResNetFontClassifier(exported_model_dir, max_batch_size=4, threads=1)
+    crops = _random_crops(6)
+    crops.insert(1, None)
+    texts = [""] * len(crops)
+
+    expected = dygraph.predict_batch(texts, crops)
+    got = static.predict_batch(texts, crops)
+
+    assert got[1] is None
+    for (label, score), (expected_label, expected_score) in zip(
+        [r for r in got if r], [r for r in expected if r]
+    ):
+        assert label == expected_label
+        assert score == pytest.approx(expected_score, abs=1e-3)
+
+
+def test_backend_selection_falls_back_to_dygraph(custom_model_dir, exported_model_dir, tmp_path):
+    assert isinstance(load_resnet_classifier(exported_model_dir, 8), StaticResNetFontClassifier)
+    assert isinstance(load_resnet_classifier(exported_model_dir, 8, backend="dygraph"), CustomResNetFontClassifier)
+
+    # A model directory without an export serves dygraph, unless inference is forced
+    bare = tmp_path / "bare"
+    bare.mkdir()
+    for name in ("font_resnet18.pdparams", "class_mapping.json"):
+        (bare / name).write_bytes((custom_model_dir / name).read_bytes())
+    assert isinstance(load_resnet_classifier(bare, 8), CustomResNetFontClassifier)
+    with pytest.raises(FileNotFoundError):
+        load_resnet_classifier(bare, 8, backend="inference")
+
+
+def test_int8_precision_falls_back_to_the_fp32_export(exported_model_dir, capsys):
+    # No quantized export: auto serves FP32, forcing inference surfaces the gap
+    classifier = load_resnet_classifier(exported_model_dir, 8, precision="int8")
+    assert isinstance(classifier, StaticResNetFontClassifier)
+    assert classifier.precision == "fp32"
+    assert "No int8 inference model; serving fp32 instead" in capsys.readouterr().out
+    with pytest.raises(FileNotFoundError, match="quantize_font_classifier"):
+        load_resnet_classifier(exported_model_dir, 8, backend="inference", precision="int8")
+
+
+class _FakePredictor:
+    """Stands in for the PaddleClas predictor and its I/O handles."""
+
+    def __init__(self):
+        self.batch = None
+
+    def copy_from_cpu(self, batch):
+        self.batch = batch.copy()
+
+    def run(self):
+        pass
+
+    def copy_to_cpu(self):
+        # One non-zero embedding per input, derived from its mean
+        return np.stack([np.full(4, 1.0 + float(item.mean())) for item in self.batch])
+
+
+def test_paddleclas_extractor_survives_a_degenerate_crop():
+    extractor = PaddleClasFeatureExtractor.__new__(PaddleClasFeatureExtractor)
+    fake = _FakePredictor()
+    extractor.input_handle = extractor.output_handle = extractor.predictor = fake
+    extractor._preprocessor = CropPreprocessor()
+    crops = _random_crops(3)
+    # A flattened region: non-empty, but not an image the preprocessor can resize
+    crops.insert(1, np.zeros(12, dtype=np.uint8))
+
+    embeddings = extractor.extract_batch(crops)
+
+    assert embeddings[1] is None
+    assert all(emb is not None for i, emb in enumerate(embeddings) if i != 1)
+    assert all(np.linalg.norm(emb) == pytest.approx(1.0) for emb in embeddings if emb is not None)
+
+
+def test_exported_runtimes_must_implement_run():
+    class Incomplete(_ExportedResNetClassifier):
+        pass
+
+    with pytest.raises(TypeError, match="_run"):
+        Incomplete()
+
+
+def test_onnx_backend_requires_an_onnx_export(exported_model_dir):
+    with pytest.raises((FileNotFoundError, RuntimeError)):
+        load_resnet_classifier(exported_model_dir, 8, backend="onnx")
+
+
+class _ScriptedHeuristic:
+    def __init__(self, confidences):
+        self.confidences = confidences
+
+    def predict(self, text, crop):
+        return "黑体", self.confidences[text]
+
+    def predict_batch(self, texts, crops):
+        return [self.predict(text, crop) for text, crop in zip(texts, crops)]
+
+
+class _RecordingResNet:
+    def __init__(self):
+        self.seen = []
+
+    def predict_batch(self, texts, crops):
+        self.seen.append(list(texts))
+        return [("宋体", 0.99) if text != "fails" else None for text in texts]
+
+
+def test_cascade_escalates_only_unsure_or_large_regions():
+    facade = FontClassifier.__new__(FontClassifier)
+    facade._custom = _RecordingResNet()
+    facade._advanced = None
+    facade._fallback = _ScriptedHeuristic({"sure": 0.9, "unsure": 0.5, "title": 0.9, "fails": 0.4})
+    facade._lock = threading.RLock()
+    facade.configure_cascade(True, threshold=0.7, escalate_height=100)
+
+    small = np.zeros((30, 80, 3), dtype=np.uint8)
+    large = np.zeros((120, 400, 3), dtype=np.uint8)
+    texts = ["sure", "unsure", "title", "fails"]
+    results = facade.predict_batch(texts, [small, small, large, small])
+
+    assert facade._custom.seen == [["unsure", "title", "fails"]]
+    assert [p.tier for p in results] == ["heuristic", "resnet", "resnet", "heuristic"]
+    # A region the expensive tier could not handle keeps its screening result
+    assert results[3] == ("黑体", 0.4, "heuristic")
+    stats = facade.stats()
+    assert stats["tiers"] == {"heuristic": 2, "resnet": 2, "paddleclas": 0}
+    assert stats["escalated"] == 3
+    assert stats["tier_share"]["resnet"] == 0.5
+
+
+
+def test_default_cascade_threshold_keeps_confident_heuristic_rules():
+    facade = FontClassifier.__new__(FontClassifier)
+    facade._custom = _RecordingResNet()
+    facade._advanced = None
+    # The heuristic's own rule confidences: bold sans, italic serif, Helvetica, fallback
+    facade._fallback = _ScriptedHeuristic({"bold": 0.72, "italic": 0.66, "latin": 0.6, "fallback": 0.55})
+    facade._lock = threading.RLock()
+    facade.configure_cascade(True, threshold=Settings().font_cascade_threshold, escalate_height=0)
+
+    crop = np.zeros((30, 80, 3), dtype=np.uint8)
+    results = facade.predict_batch(["bold", "italic", "latin", "fallback"], [crop] * 4)
+
+    assert facade._custom.seen == [["fallback"]]
+    assert [p.tier for p in results] == ["heuristic", "heuristic", "heuristic", "resnet"]
+
+def _legacy_heuristic_features(crop):
+    # The pre-rewrite implementation: full resolution, CV_64F gradients, every ink pixel fitted
+    gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+    gray = cv2.GaussianBlur(gray, (3, 3), 0)
+    _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    fill_ratio = float(np.count_nonzero(binary < 128)) / max(binary.size, 1)
+    edges = cv2.Canny(gray, 80, 160)
+    edge_ratio = float(np.count_nonzero(edges)) / max(edges.size, 1)
+    sobel_x = cv2.Sobel(gray, cv2.CV_64F, 1, 0, ksize=3)
+    sobel_y = cv2.Sobel(gray, cv2.CV_64F, 0, 1, ksize=3)
+    serif_score = float(np.mean(np.abs(sobel_x)) + 1e-6) / float(np.mean(np.abs(sobel_y)) + 1e-6)
+    coords = np.column_stack(np.where(binary < 128))
+    vx, vy, _, _ = cv2.fitLine(coords.astype(np.float32), cv2.DIST_L2, 0, 0.01, 0.01).ravel()
+    italic_angle = math.degrees(math.atan2(float(vx), float(vy)))
+    return {"fill_ratio": fill_ratio, "edge_ratio": edge_ratio, "serif_score": serif_score, "italic_angle": italic_angle}
+
+
+def _text_crops():
+    fonts = [cv2.FONT_HERSHEY_SIMPLEX, cv2.FONT_HERSHEY_COMPLEX, cv2.FONT_HERSHEY_TRIPLEX, cv2.FONT_HERSHEY_DUPLEX]
+    crops = []
+    for font in fonts:
+        for italic in (0, cv2.FONT_ITALIC):
+            for scale, thickness in ((1.2, 1), (2.5, 4), (9.0, 14)):
+                (width, height), base = cv2.getTextSize("Cover Title", font | italic, scale, thickness)
+                crop = np.full((height + base + 20, width + 20, 3), 255, dtype=np.uint8)
+                cv2.putText(crop, "Cover Title", (10, height + 10), font | italic, scale, (0, 0, 0), thickness)
+                crops.append(crop)
+    return crops
+
+
+def test_heuristic_features_match_the_full_resolution_reference():
+    heuristic = HeuristicFontClassifier()
+    crops = _text_crops()
+    assert max(crop.shape[0] * crop.shape[1] for crop in crops) > heuristic.FEATURE_MAX_PIXELS
+
+    agree = 0
+    for crop in crops:
+        expected = _legacy_heuristic_features(crop)
+        got = heuristic._extract_basic_features(crop)
+        downscaled = crop.shape[0] * crop.shape[1] > heuristic.FEATURE_MAX_PIXELS
+        tolerance = 0.05 if downscaled else 1e-6
+        for key in ("fill_ratio", "edge_ratio"):
+            assert got[key] == pytest.approx(expected[key], abs=tolerance)
+        assert got["serif_score"] == pytest.approx(expected["serif_score"], rel=0.05 if downscaled else 1e-4)
+        for text in ("Cover Title", "封面标题"):
+            agree += heuristic._decide(text, got) == heuristic._decide(text, expected)
+    assert agree / (2 * len(crops)) >= 0.9
+
+
+def test_heuristic_batch_matches_single_predictions():
+    heuristic = HeuristicFontClassifier()
+    crops = _text_crops()[:6]
+    texts = ["Cover", "", "封面", "TITLE", "Cover", "封面标题"]
+    crops[4] = crops[0]  # shared crop: features computed once
+
+    assert heuristic.predict_batch(texts, crops) == [heuristic.predict(t, c) for t, c in zip(texts, crops)]
+    assert heuristic.predict_batch(texts, crops)[1] == ("未知字体", 0.0)
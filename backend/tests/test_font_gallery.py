@@ -0,0 +1,122 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from app.core.config import get_settings
+from app.services.font_classifier import GALLERY_TEXTS, FontResource, PaddleClasFontClassifier
+from app.services.font_gallery import FontGallery, gallery_cache_key, load_gallery
+
+
+class CountingExtractor:
+    """Deterministic embeddings; records how many images it was asked to embed."""
+
+    def __init__(self) -> None:
+        self.calls: list[int] = []
+
+    def extract_batch(self, images, batch_size: int = 16):
+        self.calls.append(len(images))
+        vectors = []
+        for image in images:
+            vector = np.array([image.mean(), image.std(), 1.0], dtype=np.float32)
+            vectors.append(vector / np.linalg.norm(vector))
+        return vectors
+
+
+@pytest.fixture
+def fonts(tmp_path):
+    specs = []
+    for name in ("黑体", "宋体"):
+        # Not real fonts: rendering falls back to PIL's default face
+        path = tmp_path / f"{name}.ttf"
+        path.write_bytes(name.encode("utf-8") * 8)
+        specs.append(FontResource(key=name, display_name=name, filename=path.name, url="", description="", path=path))
+    return specs
+
+
+@pytest.fixture
+def gallery_dir(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "gallery"
+    monkeypatch.setattr(get_settings(), "font_gallery_cache_dir", str(cache_dir))
+    return cache_dir
+
+
+def _classifier() -> PaddleClasFontClassifier:
+    classifier = PaddleClasFontClassifier.__new__(PaddleClasFontClassifier)
+    classifier.extractor = CountingExtractor()
+    return classifier
+
+
+def test_cold_gallery_is_embedded_in_one_batch_and_saved(fonts, gallery_dir):
+    classifier = _classifier()
+    gallery = classifier._build_gallery(fonts)
+
+    assert classifier.extractor.calls == [len(fonts) * len(GALLERY_TEXTS)]
+    assert gallery.labels == ["黑体", "宋体"]
+    assert np.bincount(gallery.label_index).tolist() == [4, 4]
+    assert len(list(gallery_dir.glob("*.npy"))) == 1
+
+
+def test_warm_gallery_is_memory_mapped_without_extraction(fonts, gallery_dir):
+    cold = _classifier()._build_gallery(fonts)
+
+    warm_classifier = _classifier()
+    warm = warm_classifier._build_gallery(fonts)
+
+    assert warm_classifier.extractor.calls == []
+    assert isinstance(warm.matrix, np.memmap)
+    assert warm.labels == cold.labels
+    np.testing.assert_allclose(warm.matrix, cold.matrix)
+
+
+def test_cache_key_tracks_font_bytes_texts_and_model(fonts):
+    pairs = [(spec.display_name, spec.path) for spec in fonts]
+    key = gallery_cache_key(pairs, GALLERY_TEXTS, "PPLCNetV2_base")
+
+    assert key == gallery_cache_key(pairs, GALLERY_TEXTS, "PPLCNetV2_base")
+    assert key != gallery_cache_key(pairs, GALLERY_TEXTS[:-1], "PPLCNetV2_base")
+    assert key != gallery_cache_key(pairs, GALLERY_TEXTS, "PPLCNetV2_small")
+    Path(fonts[0].path).write_bytes(b"a different font")
+    assert key != gallery_cache_key(pairs, GALLERY_TEXTS, "PPLCNetV2_base")
+
+
+def test_inconsistent_cache_entry_is_ignored(tmp_path):
+    np.save(tmp_path / "k.npy", np.zeros((3, 4), dtype=np.float32))
+    (tmp_path / "k.json").write_text('["a", "b"]', encoding="utf-8")
+    assert load_gallery(tmp_path, "k") is None
+
+
+def _unit(*values: float) -> np.ndarray:
+    vector = np.array(values, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def test_search_scores_a_batch_with_best_prototype_per_label():
+    # Rows of "b" are scattered on purpose; the gallery regroups them
+    gallery = FontGallery(
+        ["a", "b", "a", "b"],
+        np.stack([_unit(1, 0, 0), _unit(0, 1, 0), _unit(0.9, 0.1, 0), _unit(0, 0.6, 0.8)]),
+    )
+    queries = np.stack([_unit(1, 0, 0), _unit(0, 0.5, 0.9)])
+
+    top = gallery.search(queries, k=2)
+
+    assert [label for label, _ in top[0]] == ["a", "b"]
+    assert top[0][0][1] == pytest.approx(1.0)
+    assert top[1][0][0] == "b"
+    assert top[1][0][1] == pytest.approx(float(_unit(0, 0.5, 0.9) @ _unit(0, 0.6, 0.8)))
+    assert len(gallery.search(queries, k=10)[0]) == 2
+
+
+def test_classifier_predicts_a_batch_with_one_extraction(fonts, gallery_dir):
+    classifier = _classifier()
+    classifier.gallery = classifier._build_gallery(fonts)
+    classifier.extractor.calls.clear()
+    crops = [np.full((32, 96, 3), 255, dtype=np.uint8), None, np.zeros((32, 96, 3), dtype=np.uint8)]
+
+    results = classifier.predict_batch(["a", "b", "c"], crops)
+
+    assert classifier.extractor.calls == [2]
+    assert results[1] is None
+    assert all(label in ("黑体", "宋体") and 0.0 <= score <= 1.0 for label, score in (results[0], results[2]))
+    assert [len(top) for top in classifier.predict_topk(crops, k=2)] == [2, 0, 2]
@@ -0,0 +1,62 @@
+from app.schemas.requests import ResultResponse, StageTimings
+from app.services.metrics import Histogram, observe_result, render_metrics
+from app.services.timings import StageTimer
+
+
+def test_stage_timer_reports_only_stages_that_ran():
+    timer = StageTimer()
+    timer.add("detection", 12.345)
+    timer.add("detection", 1.0)
+    with timer.stage("decode"):
+        pass
+
+    timings = timer.timings()
+    assert timings.detection_ms == 13.35
+    assert timings.decode_ms is not None
+    assert timings.angle_cls_ms is None
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("demo_seconds", "Demo.", label="stage", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        histogram.observe("ocr", value)
+
+    lines = histogram.render()
+    assert 'demo_seconds_bucket{stage="ocr",le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{stage="ocr",le="1"} 3' in lines
+    assert 'demo_seconds_bucket{stage="ocr",le="+Inf"} 4' in lines
+    assert 'demo_seconds_sum{stage="ocr"} 4.05' in lines
+    assert 'demo_seconds_count{stage="ocr"} 4' in lines
+
+
+def test_render_metrics_exposes_pipeline_stats():
+    histogram = Histogram("coverocr_stage_duration_seconds", "Stages.", label="stage")
+    result = ResultResponse(
+        request_id="r",
+        texts=[],
+        fonts_summary=[],
+        elapsed_ms=250,
+        timings=StageTimings(decode_ms=20.0, detection_ms=120.0, recognition_ms=80.0),
+    )
+    observe_result(histogram, result)
+    stats = {
+        "scheduler": {"queue_depth": 3, "workers": 2, "busy_workers": 2, "submitted": 10, "completed": 7},
+        "cache": {"memory_hits": 4, "disk_hits": 1, "misses": 5, "hit_rate": 0.5},
+        "models": {"ocr": {"load_ms": 1500.0, "rss_delta_bytes": None}},
+        "inflight": {"jobs": 2, "waiting_requests": 1, "coalesced": 6, "pending_requests": 5},
+    }
+
+    text = render_metrics(stats, histogram)
+    lines = text.splitlines()
+    assert 'coverocr_stage_duration_seconds_count{stage="detection"} 1' in lines
+    assert 'coverocr_stage_duration_seconds_count{stage="total"} 1' in lines
+    # Stages that did not run are not observed
+    assert 'stage="angle_cls"' not in text
+    assert "coverocr_queue_depth 3" in lines
+    assert 'coverocr_scheduler_jobs_total{outcome="completed"} 7' in lines
+    assert "coverocr_inflight_jobs 2" in lines
+    assert 'coverocr_result_cache_lookups_total{result="disk_hit"} 1' in lines
+    assert "coverocr_result_cache_hit_ratio 0.5" in lines
+    assert 'coverocr_model_load_seconds{model="ocr"} 1.5' in lines
+    assert "# TYPE coverocr_queue_depth gauge" in lines
+    assert text.endswith("\n")
@@ -0,0 +1,45 @@
+import threading
+import time
+from unittest.mock import patch
+
+from app.services.engine import InferenceEngine
+from app.services.model_registry import ModelRegistry
+
+
+def test_concurrent_first_requests_load_once():
+    registry = ModelRegistry()
+    loads = []
+
+    def loader():
+        loads.append(threading.get_ident())
+        time.sleep(0.05)
+        return object()
+
+    handles = []
+    threads = [threading.Thread(target=lambda: handles.append(registry.get("ocr", loader))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(loads) == 1
+    assert all(handle is handles[0] for handle in handles)
+    stats = registry.stats()["ocr"]
+    assert stats["load_ms"] >= 50
+    assert "rss_delta_bytes" in stats
+
+
+def test_engines_share_every_model():
+    registry = ModelRegistry()
+    with patch("app.services.engine.OCRService") as MockOCRService, \
+            patch("app.services.typography.FontClassifier") as MockFontClassifier, \
+            patch("app.services.typography.load_point_size_model", return_value=(None, None)) as load_model:
+        first = InferenceEngine(registry)
+        second = InferenceEngine(registry)
+
+    assert MockOCRService.call_count == 1
+    assert MockFontClassifier.call_count == 1
+    assert load_model.call_count == 1
+    assert first.ocr_service is second.ocr_service
+    assert first.typography_estimator.font_classifier is second.typography_estimator.font_classifier
+    assert set(registry.stats()) == {"ocr", "font_classifier", "point_size_model"}
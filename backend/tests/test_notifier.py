@@ -0,0 +1,120 @@
+import asyncio
+import time
+
+import pytest
+
+from app.services.result_store import ResultExpiredError
+from conftest import FakeExecutor, FakeUpload
+
+
+def test_long_poll_returns_as_soon_as_result_is_stored(make_pipeline):
+    pipeline = make_pipeline(executor=FakeExecutor(delay=0.05), result_cache_enabled=False)
+
+    async def scenario():
+        request_id = await pipeline.enqueue(FakeUpload(b"cover"), "16k")
+        assert await pipeline.get_result(request_id) is None
+        started = time.perf_counter()
+        result = await pipeline.get_result(request_id, wait=5)
+        return request_id, result, time.perf_counter() - started
+
+    request_id, result, waited = asyncio.run(scenario())
+
+    assert result.request_id == request_id
+    assert waited < 1
+    assert not pipeline.is_pending(request_id)
+
+
+def test_long_poll_times_out_while_pending(make_pipeline):
+    pipeline = make_pipeline(executor=FakeExecutor(delay=0.5), result_cache_enabled=False)
+
+    async def scenario():
+        request_id = await pipeline.enqueue(FakeUpload(b"cover"), "16k")
+        result = await pipeline.get_result(request_id, wait=0.05)
+        pending = pipeline.is_pending(request_id)
+        await pipeline._scheduler.join()
+        return result, pending
+
+    result, pending = asyncio.run(scenario())
+    assert result is None
+    assert pending
+
+
+def test_stream_events_reports_progress_then_result(make_pipeline):
+    pipeline = make_pipeline(executor=FakeExecutor(delay=0.02), result_cache_enabled=False)
+
+    async def scenario():
+        leader = await pipeline.enqueue(FakeUpload(b"cover"), "16k")
+        follower = await pipeline.enqueue(FakeUpload(b"cover"), "16k")
+        leader_events, follower_events = await asyncio.gather(
+            _collect(pipeline.stream_events(leader)),
+            _collect(pipeline.stream_events(follower)),
+        )
+        return leader, follower, leader_events, follower_events
+
+    leader, follower, leader_events, follower_events = asyncio.run(scenario())
+
+    # Subscribers that join mid-run start from the current stage
+    assert leader_events[:-1] == [("progress", {"stage": "ocr"})]
+    assert leader_events[-1][0] == "result"
+    assert leader_events[-1][1]["request_id"] == leader
+    # Coalesced requests see the shared job's progress under their own id
+    assert follower_events[:-1] == [("progress", {"stage": "ocr"})]
+    assert follower_events[-1][1]["request_id"] == follower
+
+
+def test_subscriber_sees_every_stage_from_the_start(make_pipeline):
+    pipeline = make_pipeline(executor=FakeExecutor(delay=0.02), result_cache_enabled=False)
+
+    async def scenario():
+        request_id = await pipeline.enqueue(FakeUpload(b"cover"), "16k")
+        events = pipeline.stream_events(request_id)
+        first = await events.__anext__()
+        return [first] + await _collect(events)
+
+    events = asyncio.run(scenario())
+    assert [data.get("stage") for name, data in events if name == "progress"] == ["started", "ocr"]
+    assert events[-1][0] == "result"
+
+
+def test_stream_events_for_finished_request_yields_result_only(make_pipeline):
+    pipeline = make_pipeline(result_cache_enabled=False)
+
+    async def scenario():
+        request_id = await pipeline.enqueue(FakeUpload(b"cover"), "16k")
+        await pipeline._scheduler.join()
+        return await _collect(pipeline.stream_events(request_id))
+
+    events = asyncio.run(scenario())
+    assert [name for name, _ in events] == ["result"]
+
+
+def test_stream_events_sends_heartbeats_while_idle(make_pipeline):
+    pipeline = make_pipeline(executor=FakeExecutor(delay=0.2), result_cache_enabled=False)
+
+    async def scenario():
+        request_id = await pipeline.enqueue(FakeUpload(b"cover"), "16k")
+        return await _collect(pipeline.stream_events(request_id, heartbeat=0.05))
+
+    names = [name for name, _ in asyncio.run(scenario())]
+    assert "heartbeat" in names
+    assert names[-1] == "result"
+
+
+def test_result_expiring_mid_stream_ends_with_an_expired_event(make_pipeline):
+    # A zero TTL drops the result as soon as it is stored
+    pipeline = make_pipeline(executor=FakeExecutor(delay=0.02), result_cache_enabled=False, result_ttl_s=0)
+
+    async def scenario():
+        request_id = await pipeline.enqueue(FakeUpload(b"cover"), "16k")
+        return request_id, await _collect(pipeline.stream_events(request_id))
+
+    request_id, events = asyncio.run(scenario())
+    assert events[-1] == ("expired", {"request_id": request_id})
+    assert "result" not in [name for name, _ in events]
+    # Once gone before streaming starts, the up-front check raises instead
+    with pytest.raises(ResultExpiredError):
+        asyncio.run(_collect(pipeline.stream_events(request_id)))
+
+
+async def _collect(events):
+    return [event async for event in events]
@@ -1,12 +1,26 @@
 import pytest
 from unittest.mock import MagicMock, patch
+import cv2
 import numpy as np
 from app.services.pipeline import InferencePipeline
-from app.services.ocr_service import OCRTextRegion
+from app.services.ocr_service import OCRService, OCRTextRegion
+
+
+def _ocr_output(*lines):
+    """What PaddleOCR's TextSystem returns for ``(box, (text, score))`` lines."""
+    boxes = [np.array(box, dtype=np.float32) for box, _ in lines]
+    return boxes, [rec for _, rec in lines], {"det": 0.02, "cls": 0.005, "rec": 0.03}
+
+
+def _encode_png(image: np.ndarray) -> bytes:
+    ok, buf = cv2.imencode(".png", image)
+    assert ok
+    return buf.tobytes()
+
 
 def test_pipeline_v2_integration():
     # Mock OCRService
-    with patch("app.services.pipeline.OCRService") as MockOCRService:
+    with patch("app.services.engine.OCRService") as MockOCRService:
         mock_ocr_instance = MockOCRService.return_value
         # Return one dummy region
         dummy_crop = np.zeros((100, 100, 3), dtype=np.uint8)
@@ -26,34 +40,174 @@ def test_pipeline_v2_integration():
         # We need to patch where TypographyEstimator imports FontClassifier
         with patch("app.services.typography.FontClassifier") as MockFontClassifier:
             mock_font_instance = MockFontClassifier.return_value
-            mock_font_instance.predict.return_value = ("宋体", 0.95)
+            mock_font_instance.predict_batch.side_effect = lambda texts, crops: [("宋体", 0.95)] * len(texts)
 
             # Initialize pipeline
             pipeline = InferencePipeline()
             
-            # Mock _decode_image to return a dummy image for width calculation
-            mock_ocr_instance._decode_image.return_value = np.zeros((1000, 1000, 3), dtype=np.uint8)
+            # A real 1000x1000 upload so the shared decode yields the image width
+            payload = _encode_png(np.zeros((1000, 1000, 3), dtype=np.uint8))
 
             # Run pipeline (private method _run_pipeline for direct testing)
             # We can't easily call _process because it's async and background.
             # But we can call _run_pipeline directly.
             
-            result = pipeline._run_pipeline("req-123", b"dummy_bytes", "16k", 0.0)
+            result = pipeline._run_pipeline("req-123", payload, "16k", 0.0)
             
             assert len(result.texts) == 1
             text_result = result.texts[0]
             
             assert text_result.content == "Test Text"
             assert text_result.font == "宋体"
-            # Calculation with dynamic DPI:
-            # Image Width = 1000px. Book Size = 16k (7.28 inch).
-            # DPI = 1000 / 7.28 = 137.36
-            # Box Height = 100px.
-            # Char Height = 100 * 0.8 = 80px.
-            # Point Size = 80 * (72 / 137.36) = 80 * 0.524 = 41.93
-            # Round to nearest 0.5 => 42.0
-            # 42.0 corresponds to "初号" in mapping.
-            
-            assert text_result.point_size == 42.0
-            assert text_result.font_size_name == "初号"
-            assert text_result.formatted_typography == "【初号，宋体，固定值 42.0 磅】"
+            # Rule-based fallback (no anchor in this image):
+            # Image Width = 1000px. Book Size = 16k (7.28 inch). Box Height = 100px.
+            # "Test Text" is title case => k_factor = 35.0
+            # Point Size = 35.0 * (100 / 1000) * 7.28 = 25.48
+            # Round to nearest 0.5 => 25.5, snapped to "一号" (26.0)
+
+            assert text_result.point_size == 26.0
+            assert text_result.font_size_name == "一号"
+            assert text_result.formatted_typography == "【一号，宋体，固定值 26 磅】"
+
+
+def test_pipeline_decodes_upload_once():
+    image = np.full((400, 600, 3), 255, dtype=np.uint8)
+    payload = _encode_png(image)
+    box = [[10.0, 20.0], [210.0, 20.0], [210.0, 80.0], [10.0, 80.0]]
+
+    with patch("app.services.ocr_service.PaddleOCR") as MockPaddleOCR, \
+            patch("app.services.typography.FontClassifier") as MockFontClassifier:
+        MockPaddleOCR.return_value.return_value = _ocr_output((box, ("Cover", 0.98)))
+        MockFontClassifier.return_value.predict_batch.side_effect = lambda texts, crops: [("黑体", 0.9)] * len(texts)
+
+        pipeline = InferencePipeline()
+        parsed_images = []
+        ocr_service = pipeline._engines[0].ocr_service
+        original_parse = ocr_service.parse
+
+        def spy_parse(image, **kwargs):
+            regions = original_parse(image, **kwargs)
+            parsed_images.append((image, regions))
+            return regions
+
+        ocr_service.parse = spy_parse
+
+        with patch("app.services.image_context.cv2.imdecode", wraps=cv2.imdecode) as spy_decode:
+            result = pipeline._run_pipeline("req-decode", payload, "16k", 0.0)
+
+    assert spy_decode.call_count == 1
+    assert len(result.texts) == 1
+
+    context, regions = parsed_images[0]
+    assert context.width == 600
+    # Crops handed to the font classifier are views into the shared decode
+    assert np.shares_memory(regions[0].crop, context.image)
+
+    # Per-stage breakdown: OCR stages come from PaddleOCR's own timings
+    timings = result.timings
+    assert (timings.detection_ms, timings.angle_cls_ms, timings.recognition_ms) == (20.0, 5.0, 30.0)
+    assert timings.decode_ms is not None
+    assert timings.font_classification_ms is not None
+    assert timings.point_size_ms is not None
+
+
+def test_ocr_service_accepts_decoded_ndarray():
+    image = np.zeros((50, 80, 3), dtype=np.uint8)
+    box = [[5.0, 5.0], [40.0, 5.0], [40.0, 25.0], [5.0, 25.0]]
+
+    with patch("app.services.ocr_service.PaddleOCR") as MockPaddleOCR:
+        MockPaddleOCR.return_value.return_value = _ocr_output((box, (" hi ", 0.5)))
+        service = OCRService()
+        with patch("app.services.image_context.cv2.imdecode") as spy_decode:
+            regions = service.parse(image)
+
+    spy_decode.assert_not_called()
+    assert regions[0].text == "hi"
+    assert np.shares_memory(regions[0].crop, image)
+
+
+def test_ocr_runs_on_a_working_copy_and_maps_boxes_back():
+    image = np.zeros((3000, 4000, 3), dtype=np.uint8)
+    working_box = [[100.0, 50.0], [300.0, 50.0], [300.0, 90.0], [100.0, 90.0]]
+
+    with patch("app.services.ocr_service.PaddleOCR") as MockPaddleOCR:
+        MockPaddleOCR.return_value.return_value = _ocr_output((working_box, ("Title", 0.9)))
+        service = OCRService()
+        regions = service.parse(image, max_side=1000)
+
+    seen = MockPaddleOCR.return_value.call_args[0][0]
+    assert seen.shape == (750, 1000, 3)
+    # Boxes and crops are back in full-resolution coordinates
+    assert regions[0].box == [[400.0, 200.0], [1200.0, 200.0], [1200.0, 360.0], [400.0, 360.0]]
+    assert regions[0].crop.shape == (164, 804, 3)
+    assert np.shares_memory(regions[0].crop, image)
+
+    with patch("app.services.ocr_service.PaddleOCR") as MockPaddleOCR:
+        MockPaddleOCR.return_value.return_value = _ocr_output((working_box, ("Title", 0.9)))
+        regions = OCRService().parse(image, max_side=0)
+    assert MockPaddleOCR.return_value.call_args[0][0] is image
+    assert regions[0].box == working_box
+
+
+def _jpeg_with_orientation(image: np.ndarray, orientation=None) -> bytes:
+    import io
+
+    from PIL import Image
+
+    pil = Image.fromarray(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+    exif = pil.getexif()
+    if orientation is not None:
+        exif[0x0112] = orientation
+    buf = io.BytesIO()
+    pil.save(buf, "JPEG", exif=exif, quality=100)
+    return buf.getvalue()
+
+
+@pytest.mark.parametrize("orientation", range(1, 9))
+def test_decode_applies_exif_orientation_like_pillow(orientation):
+    import io
+
+    from PIL import Image, ImageOps
+
+    from app.services.image_context import ImageContext
+
+    image = np.zeros((40, 60, 3), dtype=np.uint8)
+    image[:10, :20] = 255  # marks the top-left corner
+    payload = _jpeg_with_orientation(image, orientation)
+
+    context = ImageContext.from_bytes(payload)
+    expected = cv2.cvtColor(np.asarray(ImageOps.exif_transpose(Image.open(io.BytesIO(payload)))), cv2.COLOR_RGB2BGR)
+
+    assert context.orientation == orientation
+    assert context.image.shape == expected.shape
+    assert np.abs(context.image.astype(int) - expected.astype(int)).max() <= 2
+
+
+def test_angle_classifier_is_skipped_for_exif_oriented_uploads():
+    box = [[5.0, 5.0], [40.0, 5.0], [40.0, 25.0], [5.0, 25.0]]
+    image = np.zeros((50, 80, 3), dtype=np.uint8)
+
+    with patch("app.services.ocr_service.PaddleOCR") as MockPaddleOCR:
+        run = MockPaddleOCR.return_value
+        run.return_value = _ocr_output((box, ("Cover", 0.9)))
+        service = OCRService(angle_cls="auto")
+
+        service.parse(_jpeg_with_orientation(image, 6))
+        assert run.call_args.kwargs["cls"] is False
+        # No EXIF orientation: nothing vouches for the image being upright
+        service.parse(_jpeg_with_orientation(image))
+        assert run.call_args.kwargs["cls"] is True
+        service.parse(image, cls=False)
+        assert run.call_args.kwargs["cls"] is False
+
+    stats = service.stats()
+    assert (stats["calls"], stats["cls_runs"], stats["cls_skipped"]) == (3, 1, 2)
+    assert stats["avg_cls_ms"] == 5.0
+    assert MockPaddleOCR.call_args.kwargs["use_angle_cls"] is True
+
+    with patch("app.services.ocr_service.PaddleOCR") as MockPaddleOCR:
+        MockPaddleOCR.return_value.return_value = _ocr_output()
+        never = OCRService(angle_cls="never")
+        assert never.parse(image) == []
+    assert MockPaddleOCR.call_args.kwargs["use_angle_cls"] is False
+    assert MockPaddleOCR.return_value.call_args.kwargs["cls"] is False
@@ -0,0 +1,149 @@
+import asyncio
+import threading
+
+from app.schemas.requests import RecognizedText, ResultResponse
+from app.services.result_cache import ResultCache, model_fingerprint
+from conftest import FakeExecutor, FakeUpload
+
+
+def _result(request_id: str) -> ResultResponse:
+    return ResultResponse(
+        request_id=request_id,
+        texts=[RecognizedText(content="人工智能", confidence=0.9)],
+        fonts_summary=[],
+        elapsed_ms=800,
+    )
+
+
+def test_key_depends_on_bytes_book_size_and_model_version():
+    cache = ResultCache(model_version="v1")
+    base = cache.key(b"image", "16k")
+
+    assert cache.key(b"image", "16k") == base
+    assert cache.key(b"image!", "16k") != base
+    assert cache.key(b"image", "a4") != base
+    assert ResultCache(model_version="v2").key(b"image", "16k") != base
+
+
+def test_model_fingerprint_tracks_artifacts(tmp_path):
+    artifact = tmp_path / "model.pkl"
+    missing = model_fingerprint([artifact])
+    artifact.write_bytes(b"weights")
+
+    assert model_fingerprint([artifact]) != missing
+    assert model_fingerprint([artifact], extra="2024-06") != model_fingerprint([artifact])
+
+
+def test_memory_tier_hits_and_misses():
+    cache = ResultCache(model_version="v1")
+    key = cache.key(b"image", "16k")
+
+    assert cache.get(key) is None
+    cache.put(key, _result("first"))
+    assert cache.get(key).request_id == "first"
+
+    stats = cache.stats()
+    assert stats["memory_hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_disk_tier_survives_a_new_cache(tmp_path):
+    key = ResultCache(model_version="v1").key(b"image", "16k")
+    ResultCache(model_version="v1", disk_dir=tmp_path).put(key, _result("first"))
+
+    fresh = ResultCache(model_version="v1", disk_dir=tmp_path)
+    assert fresh.get(key).texts[0].content == "人工智能"
+    assert fresh.get(key) is not None
+    assert fresh.stats()["disk_hits"] == 1
+    assert fresh.stats()["memory_hits"] == 1
+
+
+def test_async_disk_tier_runs_off_the_event_loop(tmp_path, monkeypatch):
+    key = ResultCache(model_version="v1").key(b"image", "16k")
+    threads = []
+
+    async def scenario():
+        loop_thread = threading.get_ident()
+        writer = ResultCache(model_version="v1", disk_dir=tmp_path)
+        reader = ResultCache(model_version="v1", disk_dir=tmp_path)
+        for cache, name in ((writer, "_write_disk"), (reader, "_read_disk")):
+            original = getattr(cache, name)
+
+            def spy(*args, _original=original):
+                threads.append(threading.get_ident() != loop_thread)
+                return _original(*args)
+
+            monkeypatch.setattr(cache, name, spy)
+        await writer.put_async(key, _result("first"))
+        return await reader.get_async(key), await reader.get_async(key), reader.stats()
+
+    first, second, stats = asyncio.run(scenario())
+
+    assert first.request_id == "first" and second.request_id == "first"
+    # One write and one read, both on worker threads; the second read is a memory hit
+    assert threads == [True, True]
+    assert (stats["disk_hits"], stats["memory_hits"]) == (1, 1)
+
+
+def test_pipeline_serves_repeated_upload_from_cache(make_pipeline):
+    executor = FakeExecutor()
+    pipeline = make_pipeline(executor=executor)
+
+    async def scenario():
+        first = await pipeline.enqueue(FakeUpload(b"cover"), "16k")
+        await pipeline._scheduler.join()
+        second = await pipeline.enqueue(FakeUpload(b"cover"), "16k")
+        return first, second, await pipeline.get_result(first), await pipeline.get_result(second)
+
+    first_id, second_id, first, second = asyncio.run(scenario())
+
+    assert executor.runs == [first_id]
+    assert second.request_id == second_id
+    assert second.texts == first.texts
+    assert pipeline.stats()["cache"]["memory_hits"] == 1
+    # The cache hit ran no stages, so it must not report the original run's
+    assert first.timings is not None
+    assert second.timings is None
+
+
+def test_pipeline_cache_can_be_disabled(make_pipeline):
+    pipeline = make_pipeline(result_cache_enabled=False)
+    assert pipeline.stats()["cache"] is None
+
+
+def test_identical_inflight_uploads_share_one_inference(make_pipeline):
+    executor = FakeExecutor(delay=0.05)
+    pipeline = make_pipeline(executor=executor, result_cache_enabled=False)
+
+    async def scenario():
+        ids = [await pipeline.enqueue(FakeUpload(b"same-cover"), "16k") for _ in range(4)]
+        other = await pipeline.enqueue(FakeUpload(b"same-cover"), "a4")
+        inflight = pipeline.stats()["inflight"]
+        await pipeline._scheduler.join()
+        results = [await pipeline.get_result(request_id) for request_id in ids]
+        return ids, other, inflight, results
+
+    ids, other, inflight, results = asyncio.run(scenario())
+
+    assert len(set(ids)) == 4
+    assert executor.runs == [ids[0], other]
+    assert inflight == {"jobs": 2, "waiting_requests": 3, "coalesced": 3, "pending_requests": 5}
+    assert [result.request_id for result in results] == ids
+    assert all(result.texts == results[0].texts for result in results)
+    assert results[0].timings is not None
+    assert all(result.timings is None for result in results[1:])
+    assert pipeline.stats()["inflight"]["jobs"] == 0
+
+
+def test_coalescing_can_be_disabled(make_pipeline):
+    executor = FakeExecutor(delay=0.01)
+    pipeline = make_pipeline(executor=executor, result_cache_enabled=False, coalesce_inflight=False)
+
+    async def scenario():
+        for _ in range(3):
+            await pipeline.enqueue(FakeUpload(b"same-cover"), "16k")
+        await pipeline._scheduler.join()
+
+    asyncio.run(scenario())
+    assert len(executor.runs) == 3
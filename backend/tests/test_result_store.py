@@ -0,0 +1,108 @@
+import pytest
+
+from app.schemas.requests import RecognizedText, ResultResponse
+from app.services.result_store import InMemoryResultStore, ResultExpiredError
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _result(request_id: str, text: str = "Hello") -> ResultResponse:
+    return ResultResponse(
+        request_id=request_id,
+        texts=[RecognizedText(content=text, confidence=0.9)],
+        fonts_summary=[],
+        elapsed_ms=5,
+    )
+
+
+def test_unknown_id_is_not_ready_yet():
+    store = InMemoryResultStore()
+    assert store.get("missing") is None
+    assert store.stats()["misses"] == 1
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    store = InMemoryResultStore(ttl_s=10, clock=clock)
+    store.put("a", _result("a"))
+
+    clock.now = 9.9
+    assert store.get("a").request_id == "a"
+
+    clock.now = 10.0
+    with pytest.raises(ResultExpiredError):
+        store.get("a")
+    assert store.stats()["expired"] == 1
+    assert len(store) == 0
+
+
+def test_lru_eviction_by_entry_count_keeps_recently_read():
+    store = InMemoryResultStore(max_entries=2)
+    store.put("a", _result("a"))
+    store.put("b", _result("b"))
+    store.get("a")
+    store.put("c", _result("c"))
+
+    assert store.get("a") is not None
+    assert store.get("c") is not None
+    with pytest.raises(ResultExpiredError):
+        store.get("b")
+    assert store.stats()["evicted"] == 1
+
+
+def test_eviction_by_byte_budget():
+    size = len(_result("a", "x" * 100).model_dump_json())
+    store = InMemoryResultStore(max_bytes=size * 2 + 10)
+    for key in ("a", "b", "c"):
+        store.put(key, _result(key, "x" * 100))
+
+    stats = store.stats()
+    assert stats["entries"] == 2
+    assert stats["bytes"] <= size * 2 + 10
+    with pytest.raises(ResultExpiredError):
+        store.get("a")
+
+
+def test_rewriting_an_entry_does_not_double_count_bytes():
+    store = InMemoryResultStore()
+    store.put("a", _result("a"))
+    first = store.stats()["bytes"]
+    store.put("a", _result("a"))
+    assert store.stats()["bytes"] == first
+
+
+def test_put_purges_expired_head_without_walking_live_entries(monkeypatch):
+    import app.services.result_store as result_store
+
+    reads = []
+
+    class CountingEntry(result_store._Entry):
+        def __getattribute__(self, name):
+            if name == "expires_at":
+                reads.append(self)
+            return object.__getattribute__(self, name)
+
+    monkeypatch.setattr(result_store, "_Entry", CountingEntry)
+    clock = FakeClock()
+    store = InMemoryResultStore(ttl_s=10, max_entries=10_000, max_bytes=1 << 30, clock=clock)
+    result = _result("shared")
+    for i in range(3):
+        store.put(f"old-{i}", result)
+    clock.now = 5.0
+    for i in range(5_000):
+        store.put(f"live-{i}", result)
+
+    clock.now = 12.0
+    reads.clear()
+    store.put("new", result)
+
+    # Three expired entries dropped, then one look at the first live entry
+    assert len(reads) == 4
+    assert store.stats()["expired"] == 3
+    assert len(store) == 5_001
@@ -0,0 +1,119 @@
+import asyncio
+
+import pytest
+
+from app.services.scheduler import (
+    InferenceJob,
+    InferenceScheduler,
+    QueueFullError,
+    SchedulerClosedError,
+)
+
+
+def test_workers_are_bounded_and_bound_to_their_index():
+    async def scenario():
+        running = 0
+        peak = 0
+        seen = []
+        release = asyncio.Event()
+
+        async def handler(worker_index, job):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            seen.append((worker_index, job.request_id))
+            await release.wait()
+            running -= 1
+
+        scheduler = InferenceScheduler(handler, workers=2, max_queue=10)
+        for i in range(6):
+            scheduler.submit(InferenceJob(request_id=f"job-{i}", payload=b""))
+        await asyncio.sleep(0.01)
+
+        busy = scheduler.stats()
+        release.set()
+        await scheduler.shutdown(timeout=1)
+        return peak, seen, busy, scheduler.stats()
+
+    peak, seen, busy, final = asyncio.run(scenario())
+
+    assert peak == 2
+    assert busy["busy_workers"] == 2
+    assert busy["queue_depth"] == 4
+    assert {index for index, _ in seen} == {0, 1}
+    assert sorted(job for _, job in seen) == [f"job-{i}" for i in range(6)]
+    assert final["completed"] == 6
+    assert final["queue_depth"] == 0
+
+
+def test_submit_rejects_when_queue_full():
+    async def scenario():
+        release = asyncio.Event()
+
+        async def handler(worker_index, job):
+            await release.wait()
+
+        scheduler = InferenceScheduler(handler, workers=1, max_queue=2)
+        scheduler.submit(InferenceJob(request_id="running", payload=b""))
+        await asyncio.sleep(0)
+        scheduler.submit(InferenceJob(request_id="queued-1", payload=b""))
+        scheduler.submit(InferenceJob(request_id="queued-2", payload=b""))
+        with pytest.raises(QueueFullError) as excinfo:
+            scheduler.submit(InferenceJob(request_id="overflow", payload=b""))
+
+        stats = scheduler.stats()
+        release.set()
+        await scheduler.shutdown(timeout=1)
+        return excinfo.value, stats
+
+    error, stats = asyncio.run(scenario())
+
+    assert error.retry_after >= 1
+    assert stats["rejected"] == 1
+    assert stats["queue_depth"] == 2
+
+
+def test_shutdown_drains_in_flight_jobs_and_refuses_new_ones():
+    async def scenario():
+        finished = []
+
+        async def handler(worker_index, job):
+            await asyncio.sleep(0.01)
+            finished.append(job.request_id)
+
+        scheduler = InferenceScheduler(handler, workers=1, max_queue=5)
+        for i in range(3):
+            scheduler.submit(InferenceJob(request_id=f"job-{i}", payload=b""))
+        await scheduler.shutdown(timeout=1)
+
+        with pytest.raises(SchedulerClosedError):
+            scheduler.submit(InferenceJob(request_id="late", payload=b""))
+        return finished, scheduler.stats()
+
+    finished, stats = asyncio.run(scenario())
+
+    assert finished == ["job-0", "job-1", "job-2"]
+    assert stats["closed"] is True
+    assert stats["avg_wait_ms"] > 0
+
+
+def test_failed_jobs_do_not_kill_workers():
+    async def scenario():
+        handled = []
+
+        async def handler(worker_index, job):
+            if job.request_id == "boom":
+                raise RuntimeError("model crashed")
+            handled.append(job.request_id)
+
+        scheduler = InferenceScheduler(handler, workers=1, max_queue=5)
+        scheduler.submit(InferenceJob(request_id="boom", payload=b""))
+        scheduler.submit(InferenceJob(request_id="ok", payload=b""))
+        await scheduler.shutdown(timeout=1)
+        return handled, scheduler.stats()
+
+    handled, stats = asyncio.run(scenario())
+
+    assert handled == ["ok"]
+    assert stats["failed"] == 1
+    assert stats["completed"] == 2
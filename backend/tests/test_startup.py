@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.services.pipeline as pipeline_module
+from app.main import app
+from app.services.image_context import ImageContext
+from app.services.pipeline import StartupStatus, startup_pipeline
+from app.services.warmup import sample_cover
+from conftest import FakeExecutor
+
+
+@pytest.fixture
+def fresh_startup(monkeypatch):
+    status = StartupStatus()
+    monkeypatch.setattr(pipeline_module, "_startup", status)
+    return status
+
+
+def test_sample_cover_is_a_decodable_image():
+    context = ImageContext.from_bytes(sample_cover())
+    assert (context.width, context.height) == (360, 480)
+
+
+def test_startup_warms_every_worker_then_reports_ready(make_pipeline, monkeypatch, fresh_startup):
+    executor = FakeExecutor()
+    pipeline = make_pipeline(executor=executor, inference_workers=2)
+    monkeypatch.setattr(pipeline_module, "_pipeline", pipeline)
+
+    client = TestClient(app)
+    assert client.get("/readyz").status_code == 503
+
+    status = asyncio.run(startup_pipeline())
+
+    assert status.ready and status.error is None
+    assert set(status.phases_ms) >= {"build_pipeline", "warmup"}
+    assert executor.runs == ["warmup-0", "warmup-1"]
+    # Warm-up output is thrown away, never stored or cached
+    assert pipeline.stats()["results"]["entries"] == 0
+
+    resp = client.get("/readyz")
+    assert resp.status_code == 200
+    assert resp.json()["status"] == "ready"
+    assert client.get("/healthz").json() == {"status": "ok"}
+
+
+def test_failed_warm_up_keeps_the_service_unready(make_pipeline, monkeypatch, fresh_startup):
+    class BrokenExecutor(FakeExecutor):
+        async def run(self, *args, **kwargs):
+            raise RuntimeError("model files missing")
+
+    monkeypatch.setattr(pipeline_module, "_pipeline", make_pipeline(executor=BrokenExecutor()))
+
+    status = asyncio.run(startup_pipeline())
+
+    assert not status.ready
+    assert "model files missing" in status.error
+    body = TestClient(app).get("/readyz").json()
+    assert body["status"] == "failed"
+
+
+def test_metrics_before_startup_report_progress_without_building(monkeypatch, fresh_startup):
+    monkeypatch.setattr(pipeline_module, "_pipeline", None)
+    fresh_startup.phases_ms["build_pipeline"] = 1500.0
+
+    resp = TestClient(app).get("/metrics")
+
+    assert resp.status_code == 200
+    assert "coverocr_ready 0" in resp.text
+    assert 'coverocr_startup_phase_seconds{phase="build_pipeline"} 1.5' in resp.text
+    assert "coverocr_queue_depth" not in resp.text
+    assert pipeline_module._pipeline is None
@@ -0,0 +1,90 @@
+import pickle
+from unittest.mock import patch
+
+import numpy as np
+
+from app.data_processing.point_size_features import POINT_SIZE_FEATURE_COLS
+from app.services.typography import TypographyEstimator, load_point_size_model
+
+
+class RecordingModel:
+    def __init__(self) -> None:
+        self.calls = []
+
+    def predict(self, features):
+        self.calls.append(np.array(features))
+        return np.full(len(features), 12.2)
+
+
+def _box(x0, y0, x1, y1):
+    return [[x0, y0], [x1, y0], [x1, y1], [x0, y1]]
+
+
+def test_estimate_batch_predicts_point_size_once_per_image():
+    with patch("app.services.typography.FontClassifier") as MockFontClassifier:
+        MockFontClassifier.return_value.predict_batch.side_effect = lambda texts, crops: [("宋体", 0.8)] * len(texts)
+        estimator = TypographyEstimator()
+
+    model = RecordingModel()
+    estimator.ml_model = model
+    estimator.ml_feature_cols = list(reversed(POINT_SIZE_FEATURE_COLS))
+
+    texts = ["人工智能与机器学习", "Second Edition", "ISBN 978"]
+    boxes = [_box(0, 0, 600, 60), _box(0, 100, 280, 120), _box(0, 200, 150, 215)]
+    crops = [np.zeros((10, 10, 3), dtype=np.uint8)] * len(texts)
+
+    results = estimator.estimate_batch(texts, crops, boxes, image_width=1200, anchor_height=60.0)
+
+    assert len(model.calls) == 1
+    features = model.calls[0]
+    assert features.shape == (3, len(POINT_SIZE_FEATURE_COLS))
+    # Columns follow the order stored with the model, not the featurizer default
+    assert features[:, 0].tolist() == [10.0, 14.0, 10.0]  # aspect_ratio
+    assert features[:, -1].tolist() == [60.0, 20.0, 15.0]  # bbox_height
+    assert [r.point_size for r in results] == [12, 12, 12]
+    assert [r.font_size_name for r in results] == ["小四"] * 3
+
+
+def test_estimate_without_anchor_uses_rule_based_sizes():
+    with patch("app.services.typography.FontClassifier") as MockFontClassifier:
+        MockFontClassifier.return_value.predict_batch.side_effect = lambda texts, crops: [("黑体", 0.7)] * len(texts)
+        estimator = TypographyEstimator()
+
+    estimator.ml_model = RecordingModel()
+    result = estimator.estimate("Test Text", np.zeros((5, 5, 3), dtype=np.uint8), _box(0, 0, 100, 100), 1000)
+
+    assert estimator.ml_model.calls == []
+    assert result.point_size == 26
+    assert result.font_family == "黑体"
+
+
+def test_point_size_backend_prefers_onnx_only_when_exported(tmp_path):
+    from sklearn.linear_model import LinearRegression
+
+    cols = list(POINT_SIZE_FEATURE_COLS)
+    forest = LinearRegression().fit(np.eye(len(cols)), np.arange(len(cols), dtype=float))
+    pickle_path = tmp_path / "model.pkl"
+    pickle_path.write_bytes(pickle.dumps({"model": forest, "feature_cols": cols}))
+    missing = tmp_path / "point_size.onnx"
+
+    # auto without an ONNX export serves the pickled model
+    model, feature_cols = load_point_size_model(pickle_path, backend="auto", onnx_path=missing)
+    assert isinstance(model, LinearRegression)
+    assert feature_cols == cols
+    # Forcing onnx never silently swaps runtimes; the estimator falls back to rules
+    assert load_point_size_model(pickle_path, backend="onnx", onnx_path=missing) == (None, None)
+
+
+def test_estimate_batch_carries_the_font_tier():
+    from app.services.font_classifier import FontPrediction
+
+    with patch("app.services.typography.FontClassifier"):
+        estimator = TypographyEstimator()
+    estimator.ml_model = None
+
+    crops = [np.zeros((10, 10, 3), dtype=np.uint8)] * 2
+    boxes = [_box(0, 0, 100, 20)] * 2
+    fonts = [FontPrediction("宋体", 0.9, "resnet"), ("黑体", 0.6)]
+    results = estimator.estimate_batch(["a", "b"], crops, boxes, image_width=1000, fonts=fonts)
+
+    assert [(r.font_family, r.font_tier) for r in results] == [("宋体", "resnet"), ("黑体", None)]
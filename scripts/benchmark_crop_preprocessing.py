@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: batched CropPreprocessor vs the former per-crop preprocessing.
+
+The per-crop references are what the font backends used before: the ResNet18
+ran cvtColor + paddle.vision.transforms (Resize, ToTensor, Normalize) on each
+crop and stacked the tensors; PaddleClas resized, converted and normalized each
+crop into its own float array. Reports the median ms per batch and the largest
+output difference.
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+import paddle
+import paddle.vision.transforms as T
+
+from backend.app.services.crop_preprocessor import CropPreprocessor
+
+_MEAN = np.array([0.485, 0.456, 0.406], dtype=np.float32).reshape((3, 1, 1))
+_STD = np.array([0.229, 0.224, 0.225], dtype=np.float32).reshape((3, 1, 1))
+_TRANSFORM = T.Compose([
+    T.Resize((224, 224)),
+    T.ToTensor(),
+    T.Normalize(mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225]),
+])
+
+
+def per_crop_resnet(crops):
+    return paddle.stack([_TRANSFORM(cv2.cvtColor(crop, cv2.COLOR_BGR2RGB)) for crop in crops]).numpy()
+
+
+def per_crop_paddleclas(crops):
+    tensors = []
+    for crop in crops:
+        resized = cv2.resize(crop, (224, 224), interpolation=cv2.INTER_AREA)
+        rgb = cv2.cvtColor(resized, cv2.COLOR_BGR2RGB).astype(np.float32) / 255.0
+        tensors.append(((rgb.transpose(2, 0, 1) - _MEAN) / _STD)[np.newaxis, :])
+    return np.concatenate(tensors)
+
+
+def median_ms(fn, crops, repeats):
+    fn(crops)
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(crops)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--crops", type=int, nargs="+", default=[1, 8, 32], help="batch sizes to time")
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    # Text-line shaped crops of a full-resolution cover photo
+    pool = [
+        rng.integers(0, 256, size=(int(rng.integers(40, 160)), int(rng.integers(200, 1600)), 3), dtype=np.uint8)
+        for _ in range(max(args.crops))
+    ]
+    cases = [
+        ("resnet18", per_crop_resnet, CropPreprocessor()),
+        ("paddleclas", per_crop_paddleclas, CropPreprocessor(interpolation=cv2.INTER_AREA)),
+    ]
+    print(f"{'model':<11} {'crops':>5}  {'per-crop ms':>11}  {'batched ms':>10}  {'speedup':>7}  {'max diff':>8}")
+    for name, reference, batched in cases:
+        for count in args.crops:
+            crops = pool[:count]
+            diff = float(np.max(np.abs(reference(crops) - batched(crops))))
+            before = median_ms(reference, crops, args.repeats)
+            after = median_ms(batched, crops, args.repeats)
+            print(f"{name:<11} {count:>5}  {before:11.2f}  {after:10.2f}  {before / after:6.1f}x  {diff:8.1e}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Compare CPU runtimes for the font classifier and the point-size regressor.
+
+Times every available backend (Paddle dygraph, Paddle Inference, ONNX Runtime
+for the ResNet18; sklearn and ONNX Runtime for point size) on the same random
+inputs and reports latency plus agreement with the reference backend, so a
+deployment can pick COVEROCR_FONT_BACKEND / COVEROCR_POINT_SIZE_BACKEND.
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from backend.app.data_processing.point_size_features import POINT_SIZE_FEATURE_COLS
+from backend.app.services.font_classifier import load_resnet_classifier
+from backend.app.services.typography import load_point_size_model
+
+
+def time_call(fn, repeats):
+    fn()  # warm-up: kernel selection, allocator growth
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def bench_font(args):
+    rng = np.random.default_rng(0)
+    crops = [rng.integers(0, 256, size=(48, 160, 3), dtype=np.uint8) for _ in range(args.batch_size)]
+    texts = [""] * len(crops)
+    reference = None
+    print(f"Font classifier, batch of {len(crops)} crops, {args.threads} intra-op threads")
+    for backend in ("dygraph", "inference", "onnx"):
+        try:
+            classifier = load_resnet_classifier(
+                args.font_model_dir, args.batch_size, backend=backend,
+                threads=args.threads, inter_op_threads=args.inter_op_threads,
+            )
+        except Exception as exc:  # noqa: BLE001
+            print(f"  {backend:<10} unavailable: {exc}")
+            continue
+        labels = [r[0] if r else None for r in classifier.predict_batch(texts, crops)]
+        reference = reference or labels
+        agree = sum(a == b for a, b in zip(reference, labels))
+        ms = time_call(lambda: classifier.predict_batch(texts, crops), args.repeats)
+        print(f"  {backend:<10} {ms:8.1f} ms/batch  {ms / len(crops):6.2f} ms/crop  agreement {agree}/{len(crops)}")
+
+
+def bench_point_size(args):
+    rng = np.random.default_rng(0)
+    features = rng.uniform(0, 500, size=(args.regions, len(POINT_SIZE_FEATURE_COLS)))
+    reference = None
+    print(f"Point-size regressor, {args.regions} regions")
+    for backend in ("sklearn", "onnx"):
+        model, _ = load_point_size_model(args.point_size_model, backend=backend, onnx_path=args.point_size_onnx)
+        if model is None:
+            print(f"  {backend:<10} unavailable")
+            continue
+        predictions = np.asarray(model.predict(features), dtype=np.float64)
+        reference = predictions if reference is None else reference
+        ms = time_call(lambda: model.predict(features), args.repeats)
+        drift = float(np.max(np.abs(predictions - reference)))
+        print(f"  {backend:<10} {ms:8.2f} ms/image  max diff {drift:.3f} pt")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--font-model-dir", type=Path, default=REPO_ROOT / "models/custom_font_classifier")
+    parser.add_argument("--point-size-model", type=Path, default=REPO_ROOT / "models/point_size_model/xgboost_model.pkl")
+    parser.add_argument("--point-size-onnx", type=Path, default=REPO_ROOT / "models/point_size_model/point_size.onnx")
+    parser.add_argument("--batch-size", type=int, default=16, help="crops per font batch")
+    parser.add_argument("--regions", type=int, default=20, help="text regions per image for point size")
+    parser.add_argument("--threads", type=int, default=2, help="intra-op threads")
+    parser.add_argument("--inter-op-threads", type=int, default=1)
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args()
+
+    bench_font(args)
+    bench_point_size(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
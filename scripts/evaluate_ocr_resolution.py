@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Sweep the OCR working resolution (COVEROCR_OCR_MAX_SIDE) over the labeled covers.
+
+For every max side, runs detection + recognition on data/aiphoto and reports
+mean OCR latency per image, how many annotated lines are found with the exact
+text, and how well the remapped boxes overlap the full-resolution labels.
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from backend.app.services.image_context import ImageContext
+from backend.app.services.ocr_service import OCRService
+
+
+def normalize(text):
+    return "".join(text.split())
+
+
+def box_iou(a, b):
+    """IoU of two axis-aligned [x_min, y_min, x_max, y_max] boxes."""
+    ix = max(0.0, min(a[2], b[2]) - max(a[0], b[0]))
+    iy = max(0.0, min(a[3], b[3]) - max(a[1], b[1]))
+    inter = ix * iy
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def score_image(regions, annotations):
+    """(exact text matches, IoUs of the best-overlapping region per label)."""
+    predicted = []
+    for region in regions:
+        pts = np.asarray(region.box, dtype=np.float64)
+        predicted.append((normalize(region.text), [pts[:, 0].min(), pts[:, 1].min(), pts[:, 0].max(), pts[:, 1].max()]))
+
+    matches, ious = 0, []
+    for ann in annotations:
+        best = max(((box_iou(ann["bbox"], box), text) for text, box in predicted), default=(0.0, ""))
+        ious.append(best[0])
+        if best[0] >= 0.5 and best[1] == normalize(ann["text"]):
+            matches += 1
+    return matches, ious
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dataset", type=Path, default=REPO_ROOT / "data/annotations/auto_bbox_with_fonts.json")
+    parser.add_argument("--images", type=Path, default=REPO_ROOT / "data/aiphoto")
+    parser.add_argument("--sides", type=int, nargs="+", default=[0, 2560, 2048, 1600, 1280, 960],
+                        help="max sides to compare (0 = full resolution)")
+    parser.add_argument("--limit", type=int, default=0, help="evaluate only the first N images")
+    args = parser.parse_args()
+
+    with open(args.dataset, "r", encoding="utf-8") as f:
+        entries = json.load(f)["images"]
+    covers = []
+    for entry in entries[: args.limit or None]:
+        path = args.images / Path(entry["image_path"]).name
+        image = cv2.imread(str(path))
+        if image is None:
+            print(f"Warning: Could not read image {path}")
+            continue
+        annotations = [ann for ann in entry["annotations"] if ann.get("text", "").strip()]
+        covers.append((image, annotations))
+    total = sum(len(annotations) for _, annotations in covers)
+    if not covers:
+        print("No valid samples found.")
+        return 1
+
+    service = OCRService()
+    service.parse(covers[0][0])  # warm-up
+    print(f"{len(covers)} images, {total} annotated lines")
+    print(f"{'max side':>8}  {'ms/image':>9}  {'text recall':>11}  {'mean IoU':>8}")
+    for side in args.sides:
+        latencies, matched, ious = [], 0, []
+        for image, annotations in covers:
+            # A fresh context per run so the downscale is part of the timing
+            context = ImageContext(image=image)
+            start = time.perf_counter()
+            regions = service.parse(context, max_side=side)
+            latencies.append((time.perf_counter() - start) * 1000)
+            found, overlaps = score_image(regions, annotations)
+            matched += found
+            ious.extend(overlaps)
+        label = "full" if side <= 0 else str(side)
+        print(f"{label:>8}  {statistics.mean(latencies):9.0f}  {matched / total:11.2%}  {statistics.mean(ious):8.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
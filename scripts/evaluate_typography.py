@@ -1,9 +1,15 @@
 #!/usr/bin/env python3
 """
 Evaluate typography estimation accuracy against a labeled dataset.
+
+--compare-int8 evaluates the FP32 and INT8 font classifiers side by side and
+exits non-zero when INT8 loses more font accuracy than --max-font-accuracy-drop,
+so it can gate a COVEROCR_FONT_PRECISION=int8 rollout.
 """
+import argparse
 import json
 import sys
+import time
 from pathlib import Path
 import cv2
 import numpy as np
@@ -12,6 +18,9 @@ REPO_ROOT = Path(__file__).resolve().parents[1]
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
+from backend.app.core.config import get_settings
+from backend.app.services.font_classifier import StaticResNetFontClassifier
+from backend.app.services.model_registry import ModelRegistry
 from backend.app.services.typography import TypographyEstimator
 
 def load_dataset(json_path):
@@ -28,14 +37,38 @@ def crop_image(image, bbox):
     y_max = max(0, min(y_max, h))
     return image[y_min:y_max, x_min:x_max]
 
-def evaluate(dataset_path, images_dir):
+def build_estimator(precision, backend=None):
+    """A TypographyEstimator whose font classifier serves ``precision``."""
+    settings = get_settings()
+    settings.font_precision = precision
+    if backend:
+        settings.font_backend = backend
+    # Fresh registry so each precision loads its own models
+    return TypographyEstimator(registry=ModelRegistry())
+
+def require_static_resnet(estimator, precision):
+    """Exit unless the estimator serves the exported ResNet18 at ``precision``.
+
+    The facade quietly falls back (dygraph, PaddleClas, heuristics) when a
+    model fails to load, which would make an FP32/INT8 comparison meaningless.
+    """
+    resnet = estimator.font_classifier.resnet
+    if not isinstance(resnet, StaticResNetFontClassifier) or resnet.precision != precision:
+        served = f"{type(resnet).__name__} ({getattr(resnet, 'precision', 'fp32')})" if resnet else "no ResNet18"
+        raise SystemExit(
+            f"FAIL: expected the {precision} inference model but loaded {served}; "
+            "run scripts/export_font_classifier.py / scripts/quantize_font_classifier.py first"
+        )
+
+def evaluate(dataset_path, images_dir, estimator=None, verbose=True):
     data = load_dataset(dataset_path)
-    estimator = TypographyEstimator()
+    estimator = estimator or TypographyEstimator()
     
     total_samples = 0
     correct_font = 0
     correct_size_name = 0
     point_size_errors = []
+    latencies = []
     
     print(f"Loading dataset from {dataset_path}...")
     
@@ -96,6 +129,7 @@ def evaluate(dataset_path, images_dir):
                 [float(bbox[0]), float(bbox[3])]
             ]
             
+            started = time.perf_counter()
             result = estimator.estimate(
                 text=text,
                 crop=crop,
@@ -104,6 +138,7 @@ def evaluate(dataset_path, images_dir):
                 book_size=book_size,
                 anchor_height=anchor_height
             )
+            latencies.append(time.perf_counter() - started)
             
             total_samples += 1
             
@@ -114,10 +149,8 @@ def evaluate(dataset_path, images_dir):
             
             if pred_font == gt_font_norm:
                 correct_font += 1
-            else:
-                # Optional: print mismatch for debugging
+            elif verbose:
                 print(f"Mismatch: Pred='{pred_font}' vs GT='{gt_font_norm}'")
-                pass
             
             # Check Size Name
             if result.font_size_name == gt_size_name:
@@ -129,16 +162,59 @@ def evaluate(dataset_path, images_dir):
 
     if total_samples == 0:
         print("No valid samples found.")
-        return
+        return None
 
+    metrics = {
+        "samples": total_samples,
+        "font_accuracy": correct_font / total_samples,
+        "size_name_accuracy": correct_size_name / total_samples,
+        "point_size_mae": sum(point_size_errors) / total_samples,
+        # The first crops include model loading and kernel warm-up
+        "mean_latency_ms": 1000 * float(np.mean(latencies[1:] or latencies)),
+    }
     print("-" * 40)
     print(f"Total Samples: {total_samples}")
-    print(f"Font Family Accuracy: {correct_font / total_samples:.2%}")
-    print(f"Size Name Accuracy:   {correct_size_name / total_samples:.2%}")
-    print(f"Point Size MAE:       {sum(point_size_errors) / total_samples:.2f} pt")
+    print(f"Font Family Accuracy: {metrics['font_accuracy']:.2%}")
+    print(f"Size Name Accuracy:   {metrics['size_name_accuracy']:.2%}")
+    print(f"Point Size MAE:       {metrics['point_size_mae']:.2f} pt")
+    print(f"Mean Latency:         {metrics['mean_latency_ms']:.1f} ms/region")
     print("-" * 40)
+    return metrics
+
+def compare_int8(dataset_path, images_dir, max_drop):
+    """Evaluate FP32 against INT8; returns the process exit code."""
+    results = {}
+    for precision in ("fp32", "int8"):
+        print(f"== {precision.upper()} ==")
+        # Force the static-inference backend so a missing export fails instead of falling back
+        estimator = build_estimator(precision, backend="inference")
+        require_static_resnet(estimator, precision)
+        results[precision] = evaluate(dataset_path, images_dir, estimator, verbose=False)
+    fp32, int8 = results["fp32"], results["int8"]
+    if fp32 is None or int8 is None:
+        return 1
+
+    drop = fp32["font_accuracy"] - int8["font_accuracy"]
+    speedup = fp32["mean_latency_ms"] / int8["mean_latency_ms"] if int8["mean_latency_ms"] else 0.0
+    print(f"Font accuracy: FP32 {fp32['font_accuracy']:.2%} -> INT8 {int8['font_accuracy']:.2%} (drop {drop:+.2%})")
+    print(f"Latency:       FP32 {fp32['mean_latency_ms']:.1f} ms -> INT8 {int8['mean_latency_ms']:.1f} ms ({speedup:.2f}x)")
+    if drop > max_drop:
+        print(f"FAIL: INT8 font accuracy drop exceeds {max_drop:.2%}; keep COVEROCR_FONT_PRECISION=fp32")
+        return 1
+    print(f"PASS: INT8 is within the {max_drop:.2%} accuracy margin")
+    return 0
 
 if __name__ == "__main__":
-    dataset_file = REPO_ROOT / "data/annotations/auto_bbox_with_fonts.json"
-    images_folder = REPO_ROOT / "data/aiphoto"
-    evaluate(dataset_file, images_folder)
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dataset", type=Path, default=REPO_ROOT / "data/annotations/auto_bbox_with_fonts.json")
+    parser.add_argument("--images", type=Path, default=REPO_ROOT / "data/aiphoto")
+    parser.add_argument("--precision", choices=["fp32", "int8"], help="font classifier precision (default: settings)")
+    parser.add_argument("--compare-int8", action="store_true", help="evaluate FP32 vs INT8 and apply the accuracy gate")
+    parser.add_argument("--max-font-accuracy-drop", type=float, default=0.01,
+                        help="largest tolerated FP32 -> INT8 font accuracy loss (fraction, default 0.01)")
+    args = parser.parse_args()
+
+    if args.compare_int8:
+        sys.exit(compare_int8(args.dataset, args.images, args.max_font_accuracy_drop))
+    estimator = build_estimator(args.precision) if args.precision else None
+    evaluate(args.dataset, args.images, estimator)
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Export the font classifier and the point-size regressor to ONNX.
+
+Writes models/custom_font_classifier/onnx/font_resnet18.onnx (needs
+paddle2onnx) and models/point_size_model/point_size.onnx (needs skl2onnx).
+The backend serves them through ONNX Runtime with COVEROCR_FONT_BACKEND=onnx
+and COVEROCR_POINT_SIZE_BACKEND=auto|onnx; compare runtimes with
+scripts/benchmark_runtimes.py.
+"""
+import argparse
+import json
+import pickle
+import sys
+from pathlib import Path
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from backend.app.services.font_classifier import (
+    CustomResNetFontClassifier,
+    OnnxResNetFontClassifier,
+    export_resnet_onnx_model,
+)
+from backend.app.services.onnx_runtime import ONNXRUNTIME_AVAILABLE
+from backend.app.services.typography import OnnxPointSizeModel
+
+
+def export_point_size_model(pickle_path: Path, output: Path, opset_version: int) -> Path:
+    """Convert the pickled forest; feature columns go into the model metadata."""
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import FloatTensorType
+
+    with open(pickle_path, "rb") as f:
+        model_data = pickle.load(f)
+    feature_cols = list(model_data["feature_cols"])
+    onnx_model = convert_sklearn(
+        model_data["model"],
+        initial_types=[("features", FloatTensorType([None, len(feature_cols)]))],
+        target_opset=opset_version,
+    )
+    entry = onnx_model.metadata_props.add()
+    entry.key = "feature_cols"
+    entry.value = json.dumps(feature_cols)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_bytes(onnx_model.SerializeToString())
+    return output
+
+
+def check_font_model(model_dir: Path, count: int) -> int:
+    rng = np.random.default_rng(0)
+    crops = [rng.integers(0, 256, size=(48, 160, 3), dtype=np.uint8) for _ in range(count)]
+    texts = [""] * count
+    expected = CustomResNetFontClassifier(model_dir).predict_batch(texts, crops)
+    got = OnnxResNetFontClassifier(model_dir).predict_batch(texts, crops)
+    mismatches = sum(1 for a, b in zip(expected, got) if a is None or b is None or a[0] != b[0])
+    print(f"Font labels differing from dygraph: {mismatches}/{count}")
+    return mismatches
+
+
+def check_point_size_model(pickle_path: Path, onnx_path: Path, count: int) -> float:
+    with open(pickle_path, "rb") as f:
+        model_data = pickle.load(f)
+    rng = np.random.default_rng(0)
+    features = rng.uniform(0, 500, size=(count, len(model_data["feature_cols"])))
+    expected = model_data["model"].predict(features)
+    got = OnnxPointSizeModel(onnx_path).predict(features)
+    max_diff = float(np.max(np.abs(expected - got)))
+    print(f"Point-size max abs diff vs sklearn: {max_diff:.3f} pt")
+    return max_diff
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--font-model-dir", type=Path, default=REPO_ROOT / "models/custom_font_classifier")
+    parser.add_argument("--point-size-model", type=Path, default=REPO_ROOT / "models/point_size_model/xgboost_model.pkl")
+    parser.add_argument("--point-size-output", type=Path, default=REPO_ROOT / "models/point_size_model/point_size.onnx")
+    parser.add_argument("--skip-font", action="store_true")
+    parser.add_argument("--skip-point-size", action="store_true")
+    parser.add_argument("--opset", type=int, default=13)
+    parser.add_argument("--check", type=int, default=16, help="samples to compare against the source model (0 skips)")
+    args = parser.parse_args()
+
+    failed = False
+    if not args.skip_font:
+        path = export_resnet_onnx_model(args.font_model_dir, opset_version=args.opset)
+        print(f"Exported font classifier to {path}")
+        if args.check > 0 and ONNXRUNTIME_AVAILABLE:
+            failed |= check_font_model(args.font_model_dir, args.check) > 0
+    if not args.skip_point_size:
+        path = export_point_size_model(args.point_size_model, args.point_size_output, args.opset)
+        print(f"Exported point-size model to {path}")
+        if args.check > 0 and ONNXRUNTIME_AVAILABLE:
+            # The forest runs in float32 under ONNX; sub-0.1pt drift is rounding noise
+            failed |= check_point_size_model(args.point_size_model, path, args.check) > 0.1
+    if args.check > 0 and not ONNXRUNTIME_AVAILABLE:
+        print("onnxruntime is not installed; skipped the output checks")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Fetch every model and font the backend needs into models/ and checksum them.
+
+Run once while online (e.g. in the image build); pods then start with
+COVEROCR_OFFLINE_MODE=true and never touch the network.
+
+    python scripts/provision_assets.py            # download + write manifest
+    python scripts/provision_assets.py --verify   # check files against manifest
+"""
+import argparse
+import os
+import shutil
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from backend.app.services.assets import (
+    ASSET_MANIFEST,
+    OCR_MODEL_ROOT,
+    PADDLECLAS_MODEL_ROOT,
+    download_file,
+    has_inference_model,
+    ocr_model_dirs,
+    verify_manifest,
+    write_manifest,
+)
+from backend.app.services.font_classifier import FONT_BASE_DIR, FONT_RESOURCES, MODEL_NAME
+
+
+def provision_fonts():
+    ok = True
+    for spec in FONT_RESOURCES:
+        path = FONT_BASE_DIR / spec.filename
+        if path.exists():
+            print(f"  font {spec.filename}: present")
+            continue
+        print(f"  font {spec.filename}: downloading")
+        ok = download_file(spec.url, path, timeout=120) and ok
+    return ok
+
+
+def provision_ocr():
+    from paddleocr import PaddleOCR
+
+    dirs = ocr_model_dirs(OCR_MODEL_ROOT)
+    if all(has_inference_model(path) for path in dirs.values()):
+        print(f"  paddleocr: present in {OCR_MODEL_ROOT}")
+        return True
+    # PaddleOCR downloads the default ch models into the directories it is given
+    PaddleOCR(lang="ch", use_angle_cls=True, show_log=False, **{k: str(v) for k, v in dirs.items()})
+    return all(has_inference_model(path) for path in dirs.values())
+
+
+def provision_paddleclas():
+    target = PADDLECLAS_MODEL_ROOT / MODEL_NAME
+    if has_inference_model(target):
+        print(f"  paddleclas {MODEL_NAME}: present")
+        return True
+    try:
+        from paddleclas.paddleclas import check_model_file
+    except Exception:  # noqa: BLE001
+        print("  paddleclas not installed; skipping gallery model (heuristics will be used)")
+        return True
+    source = Path(check_model_file("imn", MODEL_NAME))
+    shutil.copytree(source, target, dirs_exist_ok=True)
+    return has_inference_model(target)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--verify", action="store_true", help="only verify files against the manifest")
+    args = parser.parse_args()
+
+    # Asset paths are relative to the repository root, as at runtime
+    os.chdir(REPO_ROOT)
+
+    if not args.verify:
+        print("Provisioning assets...")
+        results = {
+            "fonts": provision_fonts(),
+            "paddleocr": provision_ocr(),
+            "paddleclas": provision_paddleclas(),
+        }
+        failed = [name for name, ok in results.items() if not ok]
+        if failed:
+            print(f"Failed to provision: {', '.join(failed)}")
+            return 1
+        roots = [path for path in (FONT_BASE_DIR, OCR_MODEL_ROOT, PADDLECLAS_MODEL_ROOT) if path.exists()]
+        entries = write_manifest(roots)
+        print(f"Wrote {len(entries)} checksums to {ASSET_MANIFEST}")
+
+    problems = verify_manifest()
+    for problem in problems:
+        print(f"  {problem}")
+    print("Assets OK" if not problems else f"{len(problems)} asset problem(s)")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
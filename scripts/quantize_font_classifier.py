@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Post-training INT8 quantization of the ResNet18 font classifier.
+
+Calibrates activation ranges on crops from data/font_train and writes
+models/custom_font_classifier/inference_int8/font_resnet18.*, which the
+backend serves with oneDNN INT8 kernels when COVEROCR_FONT_PRECISION=int8.
+Gate the rollout with scripts/evaluate_typography.py --compare-int8.
+"""
+import os
+
+# Static-graph PTQ needs the legacy program format; must be set before paddle is imported
+os.environ.setdefault("FLAGS_enable_pir_api", "0")
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+import paddle
+from paddle.static.quantization import PostTrainingQuantization
+
+from backend.app.services.crop_preprocessor import CropPreprocessor
+from backend.app.services.font_classifier import RESNET_INT8_PREFIX, export_resnet_inference_model
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".bmp"}
+
+
+def calibration_crops(data_dir: Path, limit: int, seed: int = 0):
+    """Up to ``limit`` crops sampled evenly across the class directories."""
+    per_class = []
+    for class_dir in sorted(p for p in data_dir.iterdir() if p.is_dir()):
+        files = sorted(p for p in class_dir.iterdir() if p.suffix.lower() in IMAGE_SUFFIXES)
+        random.Random(seed).shuffle(files)
+        per_class.append(files)
+    if not per_class:
+        raise SystemExit(f"No class directories under {data_dir}")
+
+    # Round-robin so a small --samples still covers every font
+    paths = []
+    for i in range(max(len(files) for files in per_class)):
+        paths.extend(files[i] for files in per_class if i < len(files))
+    crops = []
+    for path in paths:
+        if len(crops) >= limit:
+            break
+        image = cv2.imdecode(np.fromfile(str(path), dtype=np.uint8), cv2.IMREAD_COLOR)
+        if image is not None:
+            crops.append(image)
+    return crops
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model-dir", type=Path, default=REPO_ROOT / "models/custom_font_classifier")
+    parser.add_argument("--data-dir", type=Path, default=REPO_ROOT / "data/font_train")
+    parser.add_argument("--samples", type=int, default=128, help="calibration crops")
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--algo", default="hist", choices=["hist", "abs_max", "avg", "mse", "KL"])
+    args = parser.parse_args()
+
+    crops = calibration_crops(args.data_dir, args.samples)
+    # Same preprocessing the served model sees
+    tensors = CropPreprocessor()(crops).copy()
+    print(f"Calibrating on {len(crops)} crops from {args.data_dir} ({args.algo})")
+
+    def batches():
+        for start in range(0, len(tensors), args.batch_size):
+            yield {"x": tensors[start:start + args.batch_size]}
+
+    output = args.model_dir / RESNET_INT8_PREFIX
+    with tempfile.TemporaryDirectory() as tmp:
+        fp32_prefix = export_resnet_inference_model(args.model_dir, prefix=Path(tmp) / "font_resnet18")
+        paddle.enable_static()
+        start = time.perf_counter()
+        ptq = PostTrainingQuantization(
+            executor=paddle.static.Executor(paddle.CPUPlace()),
+            model_dir=tmp,
+            model_filename=f"{fp32_prefix.name}.pdmodel",
+            params_filename=f"{fp32_prefix.name}.pdiparams",
+            data_loader=batches,
+            batch_nums=-(-len(tensors) // args.batch_size),
+            algo=args.algo,
+            quantizable_op_type=["conv2d", "depthwise_conv2d", "mul", "matmul", "matmul_v2"],
+            onnx_format=False,
+        )
+        ptq.quantize()
+        output.parent.mkdir(parents=True, exist_ok=True)
+        ptq.save_quantized_model(
+            str(output.parent),
+            model_filename=f"{output.name}.pdmodel",
+            params_filename=f"{output.name}.pdiparams",
+        )
+    print(f"Wrote INT8 model to {output}.* in {time.perf_counter() - start:.0f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
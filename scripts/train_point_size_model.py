@@ -17,6 +17,11 @@ REPO_ROOT = Path(__file__).resolve().parents[1]
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
+from backend.app.data_processing.point_size_features import (
+    POINT_SIZE_FEATURE_COLS,
+    build_point_size_features,
+)
+
 def load_template(template_path):
     """Load the ground truth template."""
     with open(template_path, 'r', encoding='utf-8') as f:
@@ -70,6 +75,7 @@ def build_training_data(template, ocr_data):
         images_with_anchor += 1
             
         # Process each annotation
+        texts, heights, widths, targets = [], [], [], []
         for ann in img_entry['annotations']:
             total_annotations += 1
             ocr_text = ann.get('text', '').strip()
@@ -82,33 +88,26 @@ def build_training_data(template, ocr_data):
                 continue  # Skip if no template match
             
             matched_annotations += 1
-                
-            # Extract features
-            bbox_height = bbox[3] - bbox[1]
-            bbox_width = bbox[2] - bbox[0]
-            
-            # Core features
-            features = {
-                'bbox_height': bbox_height,
-                'bbox_width': bbox_width,
-                'image_width': image_width,
-                'text_length': len(ocr_text),
-                'is_chinese': int(any('\u4e00' <= ch <= '\u9fff' for ch in ocr_text)),
-                'is_all_caps': int(ocr_text.isupper() and ocr_text.isascii()),
-                'is_title_case': int(ocr_text[0].isupper() and not ocr_text.isupper() and ocr_text.isascii()) if ocr_text else 0,
-                
-                # Anchor-based features (KEY!)
-                'height_ratio_to_anchor': bbox_height / anchor_height,
-                'relative_height': bbox_height / image_width,
-                'aspect_ratio': bbox_width / bbox_height if bbox_height > 0 else 0,
-            }
             
             # Target
             target = matched_template.get('point_size', 0)
             
             if target > 0:
-                features['point_size'] = target
-                samples.append(features)
+                texts.append(ocr_text)
+                heights.append(bbox[3] - bbox[1])
+                widths.append(bbox[2] - bbox[0])
+                targets.append(target)
+        
+        if not texts:
+            continue
+        
+        # Extract features with the featurizer shared with the serving path
+        # (anchor-based features are the KEY ones)
+        features = build_point_size_features(texts, heights, widths, image_width, anchor_height)
+        for row, target in zip(features, targets):
+            sample = dict(zip(POINT_SIZE_FEATURE_COLS, row))
+            sample['point_size'] = target
+            samples.append(sample)
     
     print(f"Images with anchor: {images_with_anchor}")
     print(f"Total annotations processed: {total_annotations}")
@@ -121,7 +120,7 @@ def train_model(df):
     """Train XGBoost model."""
     
     # Separate features and target
-    feature_cols = [col for col in df.columns if col != 'point_size']
+    feature_cols = list(POINT_SIZE_FEATURE_COLS)
     X = df[feature_cols]
     y = df['point_size']
     